@@ -1,2 +1,10 @@
 # Backtest modules
 from algo_trader.backtest.simulator import BacktestSimulator, BacktestResult, SimulatedTrade
+from algo_trader.backtest.optimizer import StrategyOptimizer, param_range
+from algo_trader.backtest.walk_forward import WalkForwardAnalyzer, WalkForwardResult
+from algo_trader.backtest.portfolio import PortfolioSimulator, PricePanel, strategy_signals
+from algo_trader.backtest.streaming import run_streaming_backtest, iter_parquet_chunks
+from algo_trader.backtest.result_cache import BacktestResultCache
+from algo_trader.backtest.monte_carlo import run_monte_carlo, MonteCarloResult
+from algo_trader.backtest.intrabar import IntrabarData
+from algo_trader.backtest.replay import MarketReplay, ReplayStats, SimulatedClock
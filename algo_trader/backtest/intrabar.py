@@ -0,0 +1,116 @@
+"""
+Intrabar Data
+Finer bars or ticks used to resolve SL/target ordering inside a backtest bar
+"""
+import hashlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from algo_trader.data.backfill import Backfill
+
+
+def _with_datetime_index(df: pd.DataFrame) -> pd.DataFrame:
+    if 'datetime' in df.columns:
+        df = df.set_index('datetime')
+    df.index = pd.DatetimeIndex(df.index)
+    return df.sort_index()
+
+
+def intrabar_path(bars: pd.DataFrame) -> Tuple[np.ndarray, List]:
+    """
+    Price path through finer data, with the time of each price
+
+    Ticks (a 'price' column) are used as they are. For bars, each one is
+    walked open -> low -> high -> close when it closed up, and open ->
+    high -> low -> close otherwise.
+    """
+    times = list(bars.index)
+    if 'price' in bars.columns:
+        return bars['price'].to_numpy(dtype=float), times
+
+    o, h, l, c = (bars[col].to_numpy(dtype=float) for col in ('open', 'high', 'low', 'close'))
+    up = c >= o
+    path = np.column_stack([o, np.where(up, l, h), np.where(up, h, l), c]).ravel()
+    return path, [t for t in times for _ in range(4)]
+
+
+class IntrabarData:
+    """
+    On-demand finer data for BacktestSimulator.set_intrabar_data
+
+    Frames can be added up front with add_symbol(); otherwise a symbol's
+    history at `interval` is loaded from the HistoricalDataManager cache
+    the first time one of its bars needs resolving (backfilled from a
+    registered broker if nothing is cached). Only real market data is
+    used: without it, ambiguous bars keep the simulator's default order.
+    """
+
+    def __init__(self, data_manager=None, interval: str = "1minute", exchange: str = "NSE"):
+        self.data_manager = data_manager
+        self.interval = interval
+        self.exchange = exchange
+        self._frames: Dict[str, Optional[pd.DataFrame]] = {}
+        self._added = set()  # Symbols given with add_symbol (the rest come from the cache)
+
+    def add_symbol(self, symbol: str, data: pd.DataFrame):
+        """Use `data` (1-minute bars, or ticks with a 'price' column) for symbol"""
+        self._frames[symbol] = _with_datetime_index(data.copy())
+        self._added.add(symbol)
+
+    def fingerprint(self, symbols: Iterable[str] = ()) -> str:
+        """
+        Hash of the finer data served for `symbols` and the added frames (a result cache key part)
+
+        Cache-backed symbols are identified by the stored series (rows, span
+        and last write), so a later backfill changes the fingerprint.
+        """
+        from algo_trader.backtest.result_cache import data_fingerprint
+
+        digest = hashlib.blake2b(f"{self.interval}|{self.exchange}".encode(), digest_size=16)
+        for symbol in sorted(self._added | set(symbols)):
+            digest.update(symbol.encode())
+            if symbol in self._added:
+                state = data_fingerprint(self._frames[symbol])
+            elif symbol in self._frames and self._frames[symbol] is None:
+                state = 'none'  # Loaded already and found nothing: bars keep the default order
+            elif self.data_manager is not None:
+                store = self.data_manager.store
+                state = repr((store.get_info(self.exchange, symbol, self.interval),
+                              store.get_meta(self.exchange, symbol, self.interval).get('cached_at')))
+            else:
+                state = 'none'
+            digest.update(state.encode())
+        return digest.hexdigest()
+
+    def get_bars(self, symbol: str, start: datetime, end: datetime) -> Optional[pd.DataFrame]:
+        """Finer bars/ticks in [start, end)"""
+        if symbol not in self._frames:
+            self._frames[symbol] = self._load(symbol, start)
+
+        frame = self._frames[symbol]
+        if frame is None:
+            return None
+        lo = frame.index.searchsorted(pd.Timestamp(start), side='left')
+        hi = frame.index.searchsorted(pd.Timestamp(end), side='left')
+        return frame.iloc[lo:hi]
+
+    def _load(self, symbol: str, start: datetime) -> Optional[pd.DataFrame]:
+        if self.data_manager is None:
+            return None
+
+        df = self.data_manager.load_cached(symbol, self.exchange, self.interval)
+        if df is None and self.data_manager.brokers:
+            # Broker and cache only: get_historical_data falls back to synthetic sample bars
+            first_day = pd.Timestamp(start).tz_localize(None).normalize().to_pydatetime()
+            Backfill(self.data_manager).run([symbol], self.exchange, self.interval, start=first_day)
+            df = self.data_manager.load_cached(symbol, self.exchange, self.interval)
+
+        if df is None or len(df) == 0:
+            logger.warning(f"No {self.interval} data for {symbol} - ambiguous bars use the default order")
+            return None
+
+        logger.info(f"Loaded {len(df)} {self.interval} bars of {symbol} for intrabar fills")
+        return _with_datetime_index(df)
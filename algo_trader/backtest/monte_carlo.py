@@ -0,0 +1,149 @@
+"""
+Monte Carlo Analysis
+Trade-resampling robustness report for backtest results
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence, Union
+from dataclasses import dataclass, field
+from loguru import logger
+
+from algo_trader.backtest.simulator import BacktestResult, TradeLog
+
+
+METHODS = ('bootstrap', 'shuffle')
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Random draws generated per batch (paths x trades), bounds peak memory
+BATCH_ELEMENTS = 4_000_000
+
+
+@dataclass
+class MonteCarloResult:
+    """Distribution of outcomes over resampled trade sequences"""
+    method: str
+    n_paths: int
+    n_trades: int
+    initial_capital: float
+    slippage_percent: float
+    percentiles: Sequence[float]
+    return_percentiles: Dict[float, float] = field(default_factory=dict)        # % of capital
+    drawdown_percentiles: Dict[float, float] = field(default_factory=dict)      # % of capital
+    final_equity_percentiles: Dict[float, float] = field(default_factory=dict)
+    probability_of_loss: float = 0.0       # % of paths ending below initial capital
+    probability_of_ruin: float = 0.0       # % of paths whose drawdown reaches ruin_percent
+    ruin_percent: float = 50.0
+
+    def summary(self) -> pd.DataFrame:
+        """One row per percentile: return %, max drawdown %, final equity"""
+        return pd.DataFrame({
+            'percentile': list(self.percentiles),
+            'return_percent': [self.return_percentiles[p] for p in self.percentiles],
+            'max_drawdown_percent': [self.drawdown_percentiles[p] for p in self.percentiles],
+            'final_equity': [self.final_equity_percentiles[p] for p in self.percentiles],
+        })
+
+
+def _trade_arrays(trades: Union[BacktestResult, TradeLog]) -> tuple:
+    """(pnl, entry value) per closed trade"""
+    log = trades
+    if isinstance(trades, BacktestResult):
+        log = trades.trade_log if trades.trade_log is not None else TradeLog.from_trades(trades.trades)
+    pnl = np.asarray(log['pnl'], dtype=float)
+    value = np.asarray(log['entry_price'], dtype=float) * np.asarray(log['quantity'], dtype=float)
+    return pnl, value
+
+
+def _path_stats(pnl_paths: np.ndarray, initial_capital: float) -> tuple:
+    """Final equity and max drawdown of each path (rows are paths)"""
+    equity = initial_capital + np.cumsum(pnl_paths, axis=1)
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), initial_capital)
+    max_drawdown = (peaks - equity).max(axis=1)
+    return equity[:, -1], np.maximum(max_drawdown, 0.0)
+
+
+def run_monte_carlo(trades: Union[BacktestResult, TradeLog], n_paths: int = 10000,
+                    method: str = "bootstrap", slippage_percent: float = 0.0,
+                    initial_capital: Optional[float] = None,
+                    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                    ruin_percent: float = 50.0, seed: Optional[int] = None) -> Optional[MonteCarloResult]:
+    """
+    Resample the trade P&L of a backtest into many equity paths
+
+    Args:
+        trades: BacktestResult (or its TradeLog)
+        n_paths: Number of simulated paths
+        method: 'bootstrap' (draw trades with replacement) or 'shuffle'
+                (same trades in random order - only drawdown varies)
+        slippage_percent: Extra round-trip cost per trade, drawn uniformly
+                          from 0 to twice this % of the trade's entry value
+        initial_capital: Starting equity (default: the result's)
+        percentiles: Percentiles to report
+        ruin_percent: Drawdown (% of capital) counted as ruin
+        seed: Random seed
+
+    Returns:
+        MonteCarloResult, or None when there are no trades
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown Monte Carlo method: {method}")
+    if n_paths < 1:
+        raise ValueError("n_paths must be positive")
+
+    if initial_capital is None:
+        if not isinstance(trades, BacktestResult):
+            raise ValueError("initial_capital is required for a TradeLog")
+        initial_capital = trades.initial_capital
+
+    pnl, value = _trade_arrays(trades)
+    n_trades = len(pnl)
+    if n_trades == 0:
+        return None
+
+    rng = np.random.default_rng(seed)
+    final_equity = np.empty(n_paths)
+    max_drawdown = np.empty(n_paths)
+
+    # Paths are simulated in batches so the draw matrix stays bounded
+    batch = max(1, BATCH_ELEMENTS // n_trades)
+    for start in range(0, n_paths, batch):
+        rows = min(batch, n_paths - start)
+
+        if method == "bootstrap":
+            picks = rng.integers(0, n_trades, size=(rows, n_trades))
+        else:
+            picks = rng.random((rows, n_trades)).argsort(axis=1)
+
+        paths = pnl[picks]
+        if slippage_percent > 0:
+            paths -= value[picks] * rng.uniform(0, 2 * slippage_percent / 100, size=(rows, n_trades))
+
+        final_equity[start:start + rows], max_drawdown[start:start + rows] = _path_stats(paths, initial_capital)
+
+    returns = (final_equity - initial_capital) / initial_capital * 100
+    drawdowns = max_drawdown / initial_capital * 100
+    percentiles = tuple(percentiles)
+
+    def at(values: np.ndarray) -> Dict[float, float]:
+        return dict(zip(percentiles, np.percentile(values, percentiles).tolist()))
+
+    result = MonteCarloResult(
+        method=method,
+        n_paths=n_paths,
+        n_trades=n_trades,
+        initial_capital=initial_capital,
+        slippage_percent=slippage_percent,
+        percentiles=percentiles,
+        return_percentiles=at(returns),
+        drawdown_percentiles=at(drawdowns),
+        final_equity_percentiles=at(final_equity),
+        probability_of_loss=float((final_equity < initial_capital).mean() * 100),
+        probability_of_ruin=float((drawdowns >= ruin_percent).mean() * 100),
+        ruin_percent=ruin_percent
+    )
+
+    logger.debug(f"Monte Carlo ({method}, {n_paths} paths, {n_trades} trades): "
+                 f"median return {result.return_percentiles.get(50, float('nan')):.2f}%, "
+                 f"P(loss) {result.probability_of_loss:.1f}%")
+    return result
@@ -0,0 +1,243 @@
+"""
+Strategy Optimizer
+Grid and random parameter sweeps over Pine Script inputs across CPU cores
+"""
+import os
+import math
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Callable, Sequence
+from loguru import logger
+
+from algo_trader.strategies.pine_parser import PineScriptParser, ParsedStrategy
+from algo_trader.strategies.pine_interpreter import PineScriptInterpreter
+from algo_trader.strategies.pine_compiler import compile_strategy
+
+
+# Ranking objective -> True when larger is better
+OBJECTIVES = {
+    'sharpe_ratio': True,
+    'profit_factor': True,
+    'total_return': True,
+    'win_rate': True,
+    'max_drawdown': False,
+}
+
+# Backtest metrics kept for each parameter set
+METRIC_COLUMNS = ('sharpe_ratio', 'profit_factor', 'max_drawdown', 'total_return',
+                  'total_trades', 'win_rate', 'final_capital')
+
+# Indicator results each worker keeps across parameter sets
+WORKER_CACHE_ENTRIES = 256
+
+
+def param_range(start: float, stop: float, step: float = 1) -> List[float]:
+    """Inclusive range of parameter values (ints when all bounds are ints)"""
+    if step <= 0:
+        raise ValueError("step must be positive")
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    values = [start + i * step for i in range(max(count, 0))]
+    if all(isinstance(v, int) for v in (start, stop, step)):
+        return [int(v) for v in values]
+    return [round(v, 10) for v in values]
+
+
+def get_strategy_inputs(strategy: ParsedStrategy) -> Dict[str, Any]:
+    """Numeric inputs of a parsed strategy with their default values"""
+    plan = compile_strategy(strategy)
+    inputs = {}
+    for name, slot in plan.input_slots.items():
+        default = plan.constants.get(slot)
+        if isinstance(default, (int, float)) and not isinstance(default, bool):
+            inputs[name] = default
+    return inputs
+
+
+def grid_size(param_ranges: Dict[str, Sequence]) -> int:
+    """Number of combinations in a parameter grid"""
+    return math.prod(len(values) for values in param_ranges.values())
+
+
+def _combination(param_ranges: Dict[str, Sequence], index: int) -> Dict[str, Any]:
+    """index-th grid combination (last parameter varies fastest)"""
+    params = {}
+    for name, values in reversed(list(param_ranges.items())):
+        index, i = divmod(index, len(values))
+        params[name] = values[i]
+    return dict(reversed(list(params.items())))
+
+
+def grid_search_space(param_ranges: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """Every combination of the parameter values"""
+    return [_combination(param_ranges, i) for i in range(grid_size(param_ranges))]
+
+
+def random_search_space(param_ranges: Dict[str, Sequence], n_samples: int,
+                        seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """n_samples distinct combinations drawn uniformly from the grid"""
+    size = grid_size(param_ranges)
+    rng = np.random.default_rng(seed)
+
+    if n_samples >= size:
+        indices = range(size)
+    elif size <= 10 * n_samples:
+        indices = rng.choice(size, n_samples, replace=False)
+    else:
+        # Sparse sample of a large grid: draw until enough distinct indices
+        chosen = set()
+        while len(chosen) < n_samples:
+            chosen.update(int(i) for i in rng.integers(0, size, n_samples - len(chosen)))
+        indices = list(chosen)
+
+    # Grid order keeps neighbouring parameter sets (and their indicators) together
+    return [_combination(param_ranges, int(i)) for i in sorted(indices)]
+
+
+class _SweepWorker:
+    """Backtests parameter sets against one loaded copy of the market data"""
+
+    def __init__(self, pine_script: str, data: pd.DataFrame, initial_capital: float):
+        self.initial_capital = initial_capital
+        self.interpreter = PineScriptInterpreter(PineScriptParser().parse(pine_script))
+        self.interpreter.indicator_cache.max_entries = WORKER_CACHE_ENTRIES
+        self.interpreter.load_data(data)
+
+    def run(self, param_sets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        rows = []
+        for params in param_sets:
+            row = dict(params)
+            try:
+                for name, value in params.items():
+                    self.interpreter.set_input(name, value)
+                metrics = self.interpreter.run_backtest(self.initial_capital)
+            except Exception as e:
+                logger.error(f"Backtest failed for {params}: {e}")
+                metrics = {}
+            for column in METRIC_COLUMNS:
+                row[column] = metrics.get(column, np.nan)
+            rows.append(row)
+        return rows
+
+
+# Per-process worker, created once by the pool initializer
+_worker: Optional[_SweepWorker] = None
+
+
+def _init_worker(pine_script: str, data: pd.DataFrame, initial_capital: float):
+    global _worker
+    _worker = _SweepWorker(pine_script, data, initial_capital)
+
+
+def _run_chunk(param_sets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return _worker.run(param_sets)
+
+
+class StrategyOptimizer:
+    """
+    Parameter sweep optimizer for Pine Script strategies
+
+    Each worker process parses the strategy and loads the market data
+    once, then backtests chunks of parameter sets; indicators unaffected
+    by a parameter are reused between sets through the interpreter's
+    indicator cache.
+    """
+
+    def __init__(self, pine_script: str, data: pd.DataFrame,
+                 initial_capital: float = 100000.0, max_workers: Optional[int] = None):
+        self.pine_script = pine_script
+        self.data = data.set_index('datetime') if 'datetime' in data.columns else data
+        self.initial_capital = initial_capital
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        self.strategy = PineScriptParser().parse(pine_script)
+        if not self.strategy:
+            raise ValueError("Failed to parse strategy")
+
+    def get_inputs(self) -> Dict[str, Any]:
+        """Optimizable inputs and their defaults"""
+        return get_strategy_inputs(self.strategy)
+
+    def optimize(self, param_ranges: Dict[str, Sequence], method: str = "grid",
+                 n_samples: int = 100, objective: str = "sharpe_ratio",
+                 seed: Optional[int] = None,
+                 progress_callback: Callable[[int, int], None] = None) -> pd.DataFrame:
+        """
+        Backtest every parameter set and rank the results
+
+        Args:
+            param_ranges: Input name -> values to try (see param_range())
+            method: 'grid' (all combinations) or 'random' (n_samples of them)
+            n_samples: Number of combinations for random search
+            objective: Ranking metric, one of OBJECTIVES
+            seed: Random search seed
+            progress_callback: Called with (completed, total) parameter sets
+
+        Returns:
+            DataFrame with one row per parameter set, best first
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}")
+
+        inputs = self.get_inputs()
+        unknown = [name for name in param_ranges if name not in inputs]
+        if unknown:
+            raise ValueError(f"Unknown strategy inputs: {', '.join(unknown)}")
+
+        param_ranges = {name: list(values) for name, values in param_ranges.items()}
+        if any(len(values) == 0 for values in param_ranges.values()):
+            raise ValueError("Every parameter needs at least one value")
+
+        if method == "grid":
+            param_sets = grid_search_space(param_ranges)
+        elif method == "random":
+            param_sets = random_search_space(param_ranges, n_samples, seed)
+        else:
+            raise ValueError(f"Unknown search method: {method}")
+
+        total = len(param_sets)
+        workers = min(self.max_workers, total)
+        logger.info(f"Optimizing {len(param_ranges)} inputs over {total} parameter sets "
+                    f"({method} search, {workers} workers)")
+
+        if workers <= 1:
+            rows = self._run_local(param_sets, progress_callback)
+        else:
+            rows = self._run_pool(param_sets, workers, progress_callback)
+
+        results = pd.DataFrame(rows, columns=list(param_ranges) + list(METRIC_COLUMNS))
+        results = results.sort_values(objective, ascending=not OBJECTIVES[objective],
+                                      na_position='last', kind='mergesort').reset_index(drop=True)
+        results.insert(0, 'rank', range(1, len(results) + 1))
+
+        logger.info(f"Optimization complete: best {objective} = {results[objective].iloc[0]}")
+        return results
+
+    def _run_local(self, param_sets: List[Dict], progress_callback: Callable = None) -> List[Dict]:
+        worker = _SweepWorker(self.pine_script, self.data, self.initial_capital)
+        rows = []
+        for params in param_sets:
+            rows.extend(worker.run([params]))
+            if progress_callback:
+                progress_callback(len(rows), len(param_sets))
+        return rows
+
+    def _run_pool(self, param_sets: List[Dict], workers: int,
+                  progress_callback: Callable = None) -> List[Dict]:
+        # Contiguous chunks so each worker sweeps neighbouring parameter sets
+        chunk_size = max(1, math.ceil(len(param_sets) / (workers * 4)))
+        chunks = [param_sets[i:i + chunk_size] for i in range(0, len(param_sets), chunk_size)]
+
+        results: List[Optional[List[Dict]]] = [None] * len(chunks)
+        completed = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.pine_script, self.data, self.initial_capital)) as pool:
+            futures = {pool.submit(_run_chunk, chunk): i for i, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                completed += len(chunks[i])
+                if progress_callback:
+                    progress_callback(completed, len(param_sets))
+
+        return [row for chunk in results for row in chunk]
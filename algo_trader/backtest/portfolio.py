@@ -0,0 +1,362 @@
+"""
+Portfolio Backtester
+Steps many symbols together on one timestamp index with a shared capital pool
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+from dataclasses import dataclass, field
+from loguru import logger
+
+from algo_trader.backtest.simulator import BacktestSimulator, BacktestResult, EquityCurve, TradeType
+
+
+# Signal -> code in the (bars x symbols) signal matrix
+SIGNAL_CODES = {'BUY': 1, 'SELL': -1, 'EXIT': 2}
+
+
+@dataclass
+class PricePanel:
+    """
+    OHLC prices of many symbols aligned on one timestamp index
+
+    Price matrices are (bars x symbols); NaN where a symbol has no bar at
+    that time. `rows[symbol]` maps each row of the symbol's own frame to
+    its position on the common index.
+    """
+    index: pd.DatetimeIndex
+    symbols: List[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    rows: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> 'PricePanel':
+        """Align per-symbol OHLC frames (datetime column or index) on the union of their timestamps"""
+        if not frames:
+            raise ValueError("No symbols to backtest")
+
+        times = {}
+        for symbol, df in frames.items():
+            stamps = df['datetime'] if 'datetime' in df.columns else df.index
+            times[symbol] = pd.DatetimeIndex(stamps)
+            if not times[symbol].is_unique:
+                raise ValueError(f"Duplicate timestamps for {symbol}")
+
+        index = times[next(iter(times))]
+        for stamps in list(times.values())[1:]:
+            index = index.union(stamps)
+        index = index.sort_values()
+
+        symbols = list(frames)
+        shape = (len(index), len(symbols))
+        prices = {column: np.full(shape, np.nan) for column in ('open', 'high', 'low', 'close')}
+        rows = {}
+        for j, symbol in enumerate(symbols):
+            rows[symbol] = index.get_indexer(times[symbol])
+            for column, matrix in prices.items():
+                matrix[rows[symbol], j] = frames[symbol][column].to_numpy(dtype=float)
+
+        return cls(index=index, symbols=symbols, rows=rows, **prices)
+
+    def encode_signals(self, signals: Union[pd.DataFrame, Dict[str, object]]) -> np.ndarray:
+        """
+        (bars x symbols) int8 matrix of SIGNAL_CODES (0 = no signal)
+
+        Accepts a DataFrame indexed by time with one column per symbol, or
+        a dict of per-symbol signals: Series indexed by time, or arrays
+        aligned with that symbol's frame.
+        """
+        codes = np.zeros((len(self.index), len(self.symbols)), dtype=np.int8)
+
+        if isinstance(signals, pd.DataFrame):
+            signals = {symbol: signals[symbol] for symbol in signals.columns}
+
+        for symbol, values in signals.items():
+            if symbol not in self.rows:
+                raise ValueError(f"Signals for unknown symbol: {symbol}")
+            j = self.symbols.index(symbol)
+
+            if isinstance(values, pd.Series) and isinstance(values.index, pd.DatetimeIndex):
+                rows = self.index.get_indexer(values.index)
+                if (rows < 0).any():
+                    raise ValueError(f"Signals for {symbol} have timestamps outside the panel")
+                values = values.to_numpy(dtype=object)
+            else:
+                values = np.asarray(values, dtype=object)
+                rows = self.rows[symbol]
+                if len(values) != len(rows):
+                    raise ValueError(f"Signals for {symbol} must have one entry per bar")
+
+            for signal, code in SIGNAL_CODES.items():
+                codes[rows[values == signal], j] = code
+
+        return codes
+
+
+def strategy_signals(pine_script: str, frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.Series]:
+    """Per-symbol signals of a Pine Script strategy, each computed over the full history at once"""
+    from algo_trader.strategies.pine_parser import PineScriptParser
+    from algo_trader.strategies.pine_interpreter import PineScriptInterpreter
+
+    strategy = PineScriptParser().parse(pine_script)
+    if not strategy:
+        raise ValueError("Failed to parse strategy")
+
+    signals = {}
+    for symbol, df in frames.items():
+        interpreter = PineScriptInterpreter(strategy)
+        interpreter.load_data(df.set_index('datetime') if 'datetime' in df.columns else df)
+        signals[symbol] = interpreter.generate_signals()
+    return signals
+
+
+class PortfolioSimulator(BacktestSimulator):
+    """
+    Multi-symbol backtest with one capital pool
+
+    All symbols are stepped together bar by bar; risk checks, signal
+    handling, sizing and equity are array operations across symbols, and
+    Python only runs for the trades actually opened or closed. Fills,
+    slippage, commission and SL/target/trailing SL follow BacktestSimulator.
+
+    Sizing limits:
+    - position_size_percent: capital per new position, as % of available capital
+    - max_positions: open positions at any time (None = unlimited)
+    - max_exposure_percent: entry value of open positions, as % of equity
+    """
+
+    def __init__(self, initial_capital: float = 100000.0, position_size_percent: float = 10.0,
+                 max_positions: Optional[int] = None, max_exposure_percent: float = 100.0):
+        super().__init__(initial_capital)
+        self.position_size_percent = position_size_percent
+        self.max_positions = max_positions
+        self.max_exposure_percent = max_exposure_percent
+
+    def run_portfolio_backtest(self, data: Union[PricePanel, Dict[str, pd.DataFrame]],
+                               signals: Union[np.ndarray, pd.DataFrame, Dict[str, object]],
+                               strategy_name: str = "Strategy") -> BacktestResult:
+        """
+        Run a portfolio backtest
+
+        Args:
+            data: PricePanel, or dict of symbol -> DataFrame with datetime, open, high, low, close
+            signals: Encoded signal matrix, or anything PricePanel.encode_signals accepts
+            strategy_name: Name of the strategy
+
+        Returns:
+            BacktestResult over all symbols (symbol "PORTFOLIO")
+        """
+        panel = data if isinstance(data, PricePanel) else PricePanel.from_frames(data)
+        codes = signals if isinstance(signals, np.ndarray) else panel.encode_signals(signals)
+        if codes.shape != panel.close.shape:
+            raise ValueError("Signal matrix must be (bars x symbols)")
+
+        self._running = True
+        self._paused = False
+
+        self._reset_state()
+
+        n_bars, n_symbols = panel.close.shape
+        if n_bars == 0:
+            raise ValueError("No data to backtest")
+
+        times = panel.index.tolist()
+        symbols = panel.symbols
+        logger.info(f"Starting portfolio backtest: {n_symbols} symbols from {times[0]} to {times[-1]} "
+                    f"({n_bars} bars)")
+
+        # Position state per symbol: side 1 long / -1 short / 0 flat
+        side = np.zeros(n_symbols, dtype=np.int8)
+        quantity = np.zeros(n_symbols)
+        entry = np.zeros(n_symbols)
+        high_since = np.zeros(n_symbols)
+        low_since = np.zeros(n_symbols)
+        last_close = np.full(n_symbols, np.nan)
+
+        equity_column = np.zeros(n_bars)
+        open_column = np.zeros(n_bars, dtype=np.int64)
+        exposure_column = np.zeros(n_bars)
+
+        risk_checks = self.stop_loss_percent > 0 or self.target_percent > 0 or self.trailing_sl_percent > 0
+
+        def close_positions(positions: np.ndarray, prices: np.ndarray, when, reasons):
+            for j in positions:
+                trade = self.open_trades[symbols[j]]
+                trade.high_since_entry = float(high_since[j])
+                trade.low_since_entry = float(low_since[j])
+                reason = reasons if isinstance(reasons, str) else reasons[j]
+                self._close_trade(symbols[j], float(prices[j]), when, reason)
+            side[positions] = 0
+
+        for t in range(n_bars):
+            if not self._running:
+                break
+
+            when = times[t]
+            close = panel.close[t]
+            valid = ~np.isnan(close)
+            last_close = np.where(valid, close, last_close)
+
+            # Risk conditions, checked with high, low then close like the bar loop
+            alive = (side != 0) & valid
+            if alive.any():
+                for prices in (panel.high[t], panel.low[t], close):
+                    high_since = np.where(alive, np.fmax(high_since, prices), high_since)
+                    low_since = np.where(alive, np.fmin(low_since, prices), low_since)
+                    if not risk_checks:
+                        continue
+
+                    hits = self._risk_hits(alive, side, entry, prices, high_since, low_since)
+                    if hits is None:
+                        continue
+
+                    hit, reasons = hits
+                    close_positions(np.flatnonzero(hit), prices, when, reasons)
+                    alive &= ~hit
+
+            # Signals
+            code = np.where(valid, codes[t], 0)
+            if code.any():
+                exits = ((side == 1) & ((code == -1) | (code == 2))) | \
+                        ((side == -1) & ((code == 1) | (code == 2)))
+                if exits.any():
+                    reversing = exits & (code != 2)
+                    close_positions(np.flatnonzero(reversing), close, when, "Reverse Signal")
+                    close_positions(np.flatnonzero(exits & ~reversing), close, when, "Exit Signal")
+
+                entries = (side == 0) & ((code == 1) | (code == -1))
+                if entries.any():
+                    self._open_positions(np.flatnonzero(entries), code, close, when, symbols,
+                                         side, quantity, entry, high_since, low_since, last_close)
+
+            # Equity: cash plus entry value and unrealized P&L of open positions
+            held = side != 0
+            position_value = np.where(held, entry * quantity + side * (last_close - entry) * quantity, 0.0)
+            equity_column[t] = self.available_capital + position_value.sum()
+            open_column[t] = held.sum()
+            exposure_column[t] = (entry * quantity)[held].sum()
+
+            self._notify_progress(t, n_bars, when, float('nan'))
+
+        bars = t + 1 if self._running else t
+        self.equity_curve = EquityCurve({
+            'datetime': panel.index[:bars],
+            'equity': equity_column[:bars],
+            'open_trades': open_column[:bars],
+            'exposure': exposure_column[:bars],
+        })
+
+        # Close any remaining open trades at each symbol's last price
+        for symbol in list(self.open_trades.keys()):
+            j = symbols.index(symbol)
+            trade = self.open_trades[symbol]
+            trade.high_since_entry = float(high_since[j])
+            trade.low_since_entry = float(low_since[j])
+            last_bar = panel.rows[symbol][-1]
+            self._close_trade(symbol, float(last_close[j]), times[last_bar], "End of Backtest")
+        self._flush_trade_events()
+
+        result = self._calculate_results("PORTFOLIO", strategy_name, times[0], times[-1])
+
+        self._running = False
+        logger.info(f"Portfolio backtest complete: {result.total_trades} trades across "
+                    f"{n_symbols} symbols, P&L: ₹{result.total_pnl:.2f}")
+
+        return result
+
+    def _risk_hits(self, alive: np.ndarray, side: np.ndarray, entry: np.ndarray, prices: np.ndarray,
+                   high_since: np.ndarray, low_since: np.ndarray):
+        """Positions hitting SL / target / trailing SL at `prices`, with exit reasons"""
+        long = side == 1
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pnl_percent = np.where(long, (prices - entry) / entry, (entry - prices) / entry) * 100
+
+        sl = alive & (pnl_percent <= -self.stop_loss_percent) if self.stop_loss_percent > 0 else None
+        target = alive & (pnl_percent >= self.target_percent) if self.target_percent > 0 else None
+        trail = None
+        if self.trailing_sl_percent > 0:
+            long_trail = long & (prices <= high_since * (1 - self.trailing_sl_percent / 100)) & (prices > entry)
+            short_trail = ~long & (prices >= low_since * (1 + self.trailing_sl_percent / 100)) & (prices < entry)
+            trail = alive & (long_trail | short_trail)
+
+        hit = np.zeros(len(side), dtype=bool)
+        for mask in (sl, target, trail):
+            if mask is not None:
+                hit |= mask
+        if not hit.any():
+            return None
+
+        # Same priority as _check_risk_conditions: SL, then target, then trailing SL
+        reasons = {}
+        for j in np.flatnonzero(hit):
+            if sl is not None and sl[j]:
+                reasons[j] = "Stop Loss"
+            elif target is not None and target[j]:
+                reasons[j] = "Target"
+            elif long[j]:
+                reasons[j] = f"Trailing SL (High: ₹{high_since[j]:.2f})"
+            else:
+                reasons[j] = f"Trailing SL (Low: ₹{low_since[j]:.2f})"
+        return hit, reasons
+
+    def _open_positions(self, candidates: np.ndarray, code: np.ndarray, close: np.ndarray, when,
+                        symbols: List[str], side: np.ndarray, quantity: np.ndarray, entry: np.ndarray,
+                        high_since: np.ndarray, low_since: np.ndarray, last_close: np.ndarray):
+        """Open new positions in symbol order within the capital and sizing limits"""
+        held = side != 0
+        if self.max_positions is not None:
+            candidates = candidates[:max(0, self.max_positions - int(held.sum()))]
+        if len(candidates) == 0:
+            return
+
+        available = self.available_capital
+        price = close[candidates]
+        is_buy = code[candidates] == 1
+        slippage = price * (self.slippage_percent / 100)
+        exec_price = np.where(is_buy, price + slippage, price - slippage)
+
+        qty = np.maximum(1, np.floor(available * (self.position_size_percent / 100) / price))
+        cost = exec_price * qty
+        required = np.cumsum(cost + self.commission_per_trade)
+
+        open_value = (entry * quantity)[held].sum()
+        position_value = np.where(held, entry * quantity + side * (last_close - entry) * quantity, 0.0).sum()
+        exposure_limit = (available + position_value) * (self.max_exposure_percent / 100)
+
+        # Later candidates are dropped once cash or exposure runs out
+        fits = (required <= available) & (open_value + np.cumsum(cost) <= exposure_limit)
+        allowed = np.flatnonzero(fits)
+        if len(allowed) < len(candidates) and not self.silent:
+            logger.debug(f"Skipped {len(candidates) - len(allowed)} entries at {when}: capital/exposure limit")
+
+        for k in allowed:
+            j = candidates[k]
+            trade_type = TradeType.LONG if is_buy[k] else TradeType.SHORT
+            trade = self._open_trade(symbols[j], trade_type, float(price[k]), when, quantity=int(qty[k]))
+            if trade is None:
+                continue
+            side[j] = 1 if is_buy[k] else -1
+            quantity[j] = trade.quantity
+            entry[j] = trade.entry_price
+            high_since[j] = trade.entry_price
+            low_since[j] = trade.entry_price
+
+    def symbol_summary(self) -> pd.DataFrame:
+        """Trades, wins and P&L per symbol for the last run"""
+        if not self.trades:
+            return pd.DataFrame(columns=['symbol', 'trades', 'winning_trades', 'total_pnl'])
+
+        trades = pd.DataFrame({
+            'symbol': [t.symbol for t in self.trades],
+            'pnl': [t.pnl for t in self.trades],
+        })
+        summary = trades.groupby('symbol', sort=False)['pnl'].agg(
+            trades='count', winning_trades=lambda p: int((p > 0).sum()), total_pnl='sum'
+        )
+        return summary.reset_index().sort_values('total_pnl', ascending=False, ignore_index=True)
@@ -0,0 +1,494 @@
+"""
+Market Replay
+Drives the live trading stack from recorded candles or ticks on a simulated clock
+
+The live components read the time through a `now` attribute (datetime.now by
+default); the replay points it at its SimulatedClock while it runs.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from algo_trader.core.strategy_engine import SignalType
+
+SPEEDS = {'1x': 1.0, '10x': 10.0, 'max': None}
+
+# Components whose `now` hook follows the simulated clock
+COMPONENTS = ('strategy_engine', 'risk_manager', 'alert_manager', 'paper_trader')
+
+
+def parse_speed(speed: Union[str, float, None]) -> Optional[float]:
+    """Replay speed multiple, or None for as fast as possible ('max', None, 0)"""
+    if isinstance(speed, str):
+        key = speed.strip().lower()
+        if key in SPEEDS:
+            return SPEEDS[key]
+        speed = float(key.rstrip('x'))
+    if not speed:
+        return None
+    if speed < 0:
+        raise ValueError("Replay speed must be positive")
+    return float(speed)
+
+
+class SimulatedClock:
+    """Market time of a replay, read by components through their `now` hook"""
+
+    def __init__(self, start: datetime = None):
+        self._now = start or datetime.now()
+
+    def now(self) -> datetime:
+        return self._now
+
+    def set(self, when: datetime):
+        self._now = when
+
+
+@dataclass
+class ReplayStats:
+    """Throughput of a replay run"""
+    events: int = 0      # Candles or ticks delivered
+    candles: int = 0     # Closed candles passed to the strategy engine
+    symbols: int = 0
+    signals: int = 0
+    orders: int = 0
+    alerts: int = 0
+    start: datetime = None
+    end: datetime = None
+    wall_seconds: float = 0.0
+    component_seconds: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def simulated_seconds(self) -> float:
+        if self.start is None or self.end is None:
+            return 0.0
+        return (self.end - self.start).total_seconds()
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Simulated time per wall-clock time"""
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            'events': self.events,
+            'candles': self.candles,
+            'symbols': self.symbols,
+            'signals': self.signals,
+            'orders': self.orders,
+            'alerts': self.alerts,
+            'wall_seconds': round(self.wall_seconds, 3),
+            'simulated_seconds': self.simulated_seconds,
+            'events_per_second': round(self.events_per_second, 1),
+            'speedup': round(self.speedup, 1),
+            **{f'{name}_seconds': round(seconds, 3) for name, seconds in self.component_seconds.items()},
+        }
+
+
+class _PaperBroker:
+    """Broker interface for RiskManager square-offs, filled by the paper trader at the replayed price"""
+
+    def __init__(self, replay: 'MarketReplay'):
+        self.replay = replay
+
+    def place_order(self, symbol: str, exchange: str, side: str, quantity: int,
+                    order_type: str = "MARKET", product: str = "MIS", **kwargs) -> Dict:
+        return self.replay._place_order(symbol, side, quantity, "RiskManager")
+
+
+class MarketReplay:
+    """
+    Replays recorded market data through the live trading components
+
+    Each event goes through the entry points the live feeds use: closed
+    candles to StrategyEngine.process_candle, last prices to
+    RiskManager.update_price, AlertManager.update_price and
+    PaperTradingSimulator.update_prices. Strategy signals are filled by the
+    paper trader, fills are tracked by the risk manager, and its stop loss,
+    target and square-off exits go back to the paper trader. Components read
+    the simulated clock through their `now` hook while the replay runs.
+
+    The replay is also a data feed (get_quote / get_latest_candle), so the
+    components' own polling loops can run against it.
+    """
+
+    def __init__(self, strategy_engine=None, risk_manager=None, alert_manager=None,
+                 paper_trader=None, speed: Union[str, float, None] = 'max',
+                 exchange: str = "NSE", order_quantity: int = 1,
+                 stop_loss_percent: float = 0.0, target_percent: float = 0.0):
+        self.strategy_engine = strategy_engine
+        self.risk_manager = risk_manager
+        self.alert_manager = alert_manager
+        self.paper_trader = paper_trader
+        self.speed = parse_speed(speed)
+        self.exchange = exchange
+        self.order_quantity = order_quantity
+        self.stop_loss_percent = stop_loss_percent
+        self.target_percent = target_percent
+
+        self.clock = SimulatedClock()
+        self.stats = ReplayStats()
+
+        # Event stream, sorted by time
+        self._symbols: List[str] = []
+        self._times = np.empty(0, dtype='datetime64[ns]')
+        self._codes = np.empty(0, dtype=np.int32)
+        self._values: Dict[str, np.ndarray] = {}
+        self._is_ticks = False
+        self._bar = pd.Timedelta(0)
+
+        # Latest state per symbol, served to data-feed callers
+        self._quotes: Dict[str, Dict] = {}
+        self._candles: Dict[str, Dict] = {}
+        self._forming: Dict[str, Dict] = {}  # Tick replay: candle being built per symbol
+
+        self._running = False
+        self._paused = False
+        self._thread = None
+
+        if self.risk_manager is not None:
+            self.risk_manager.set_broker(_PaperBroker(self))
+            self.risk_manager.register_sl_hit_callback(self._on_risk_exit)
+            self.risk_manager.register_target_hit_callback(self._on_risk_exit)
+        if self.alert_manager is not None:
+            self.alert_manager.register_callback(self._on_alert)
+
+    def set_speed(self, speed: Union[str, float, None]):
+        """1x, 10x, any multiple, or 'max'"""
+        self.speed = parse_speed(speed)
+
+    def load_candles(self, data: Dict[str, pd.DataFrame]):
+        """
+        Load recorded candles
+
+        Args:
+            data: symbol -> DataFrame with datetime (bar open time, column or
+                  index), open, high, low, close, volume
+        """
+        frames = [(symbol, self._with_datetime(df)) for symbol, df in data.items() if len(df)]
+        self._load(frames, ('open', 'high', 'low', 'close', 'volume'))
+        self._is_ticks = False
+
+        # A candle is delivered when it closes, one bar length after its time
+        unique = np.unique(self._times)
+        self._bar = pd.Timedelta(np.diff(unique).min()) if len(unique) > 1 else pd.Timedelta(0)
+
+    def load_ticks(self, ticks: pd.DataFrame, interval: str = '1min'):
+        """
+        Load recorded ticks
+
+        Args:
+            ticks: DataFrame with datetime, symbol, price (or ltp) and optional volume
+            interval: Bar length of the candles built for the strategy engine
+        """
+        ticks = self._with_datetime(ticks)
+        if 'price' not in ticks.columns:
+            ticks = ticks.rename(columns={'ltp': 'price'})
+        if 'volume' not in ticks.columns:
+            ticks = ticks.assign(volume=0.0)
+
+        self._load(list(ticks.groupby('symbol', sort=False)), ('price', 'volume'))
+        self._is_ticks = True
+        self._bar = pd.Timedelta(interval)
+
+    @staticmethod
+    def _with_datetime(df: pd.DataFrame) -> pd.DataFrame:
+        if 'datetime' not in df.columns:
+            df = df.rename_axis('datetime').reset_index()
+        return df.assign(datetime=pd.to_datetime(df['datetime']))
+
+    def _load(self, frames: List, columns: tuple):
+        """Merge per-symbol frames into one time-ordered event stream"""
+        if not frames:
+            raise ValueError("No market data to replay")
+
+        self._symbols = [symbol for symbol, _ in frames]
+        times = np.concatenate([df['datetime'].to_numpy(dtype='datetime64[ns]') for _, df in frames])
+        codes = np.concatenate([np.full(len(df), i, dtype=np.int32) for i, (_, df) in enumerate(frames)])
+
+        # Stable sort keeps each symbol's own order for equal timestamps
+        order = np.argsort(times, kind='stable')
+        self._times = times[order]
+        self._codes = codes[order]
+        self._values = {
+            name: np.concatenate([df[name].to_numpy(dtype=float) for _, df in frames])[order]
+            for name in columns
+        }
+        logger.info(f"Replay loaded {len(self._times)} {'ticks' if 'price' in columns else 'candles'} "
+                    f"for {len(self._symbols)} symbols")
+
+    # Data-feed interface (RiskManager/AlertManager.start_monitoring, StrategyEngine.start_live)
+
+    def get_quote(self, symbol: str, exchange: str = None) -> Dict:
+        return self._quotes.get(symbol, {})
+
+    def get_latest_candle(self, symbol: str) -> Optional[Dict]:
+        return self._candles.get(symbol)
+
+    # Control
+
+    def start(self):
+        """Run the replay in a background thread"""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def pause(self):
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+
+    def stop(self):
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+
+    def run(self) -> ReplayStats:
+        """Replay every loaded event and return throughput statistics"""
+        if len(self._times) == 0:
+            raise ValueError("No market data loaded")
+
+        self._running = True
+        self._paused = False
+        self._quotes, self._candles, self._forming = {}, {}, {}
+        self.stats = ReplayStats(symbols=len(self._symbols),
+                                 component_seconds={name: 0.0 for name in COMPONENTS})
+
+        # Events sharing a timestamp are delivered together
+        boundaries = np.flatnonzero(np.diff(self._times)) + 1
+        starts = np.concatenate(([0], boundaries))
+        stops = np.concatenate((boundaries, [len(self._times)]))
+        offset = pd.Timedelta(0) if self._is_ticks else self._bar
+        first_time = pd.Timestamp(self._times[0]) + offset
+        self.stats.start = first_time.to_pydatetime()
+
+        speed = 'max' if self.speed is None else f'{self.speed:g}x'
+        logger.info(f"Market replay started at {speed} from {first_time}")
+
+        saved_clocks = self._attach_clock()
+        wall_start = time.perf_counter()
+        paused_for = 0.0
+        current_day = None
+
+        try:
+            for start, stop in zip(starts, stops):
+                if not self._running:
+                    break
+
+                if self._paused:
+                    pause_start = time.perf_counter()
+                    while self._paused and self._running:
+                        time.sleep(0.1)
+                    paused_for += time.perf_counter() - pause_start
+
+                when = pd.Timestamp(self._times[start]) + offset
+                if self.speed is not None:
+                    due = wall_start + paused_for + (when - first_time).total_seconds() / self.speed
+                    # Short sleeps so stop() is honoured at slow speeds
+                    while self._running and time.perf_counter() < due:
+                        time.sleep(min(due - time.perf_counter(), 0.1))
+
+                when = when.to_pydatetime()
+                self.clock.set(when)
+                if when.date() != current_day:
+                    if current_day is not None and self.risk_manager is not None:
+                        self.risk_manager.reset_daily_tracking()
+                    current_day = when.date()
+
+                if self._is_ticks:
+                    self._deliver_ticks(start, stop, when)
+                else:
+                    self._deliver_candles(start, stop, when)
+                self.stats.events += int(stop - start)
+                self.stats.end = when
+
+            # Candles still forming when the ticks run out
+            for symbol in list(self._forming):
+                self._close_forming(symbol)
+        finally:
+            self.stats.wall_seconds = time.perf_counter() - wall_start - paused_for
+            self._detach_clock(saved_clocks)
+            self._running = False
+
+        logger.info(f"Market replay complete: {self.stats.events} events in {self.stats.wall_seconds:.2f}s "
+                    f"({self.stats.events_per_second:,.0f}/s, {self.stats.speedup:,.0f}x real time), "
+                    f"{self.stats.signals} signals, {self.stats.orders} orders")
+        return self.stats
+
+    def _attach_clock(self) -> Dict:
+        saved = {}
+        for name in COMPONENTS:
+            component = getattr(self, name)
+            if component is not None and hasattr(component, 'now'):
+                saved[name] = component.now
+                component.now = self.clock.now
+        return saved
+
+    def _detach_clock(self, saved: Dict):
+        for name, now in saved.items():
+            getattr(self, name).now = now
+
+    # Delivery
+
+    def _deliver_candles(self, start: int, stop: int, when: datetime):
+        v = self._values
+        candle_time = pd.Timestamp(self._times[start]).to_pydatetime()
+        prices = {}
+
+        for i in range(start, stop):
+            symbol = self._symbols[self._codes[i]]
+            candle = {'time': candle_time, 'open': v['open'][i], 'high': v['high'][i],
+                      'low': v['low'][i], 'close': v['close'][i], 'volume': v['volume'][i]}
+            self._candles[symbol] = candle
+            prices[symbol] = candle['close']
+
+            self._update_price(symbol, candle['close'], when)
+            self._process_candle(symbol, candle)
+
+        self._update_paper_prices(prices)
+
+    def _deliver_ticks(self, start: int, stop: int, when: datetime):
+        price = self._values['price']
+        volume = self._values['volume']
+        bar_start = pd.Timestamp(when).floor(self._bar).to_pydatetime()
+        prices = {}
+
+        for i in range(start, stop):
+            symbol = self._symbols[self._codes[i]]
+            ltp = price[i]
+            prices[symbol] = ltp
+
+            forming = self._forming.get(symbol)
+            if forming is not None and forming['time'] != bar_start:
+                self._close_forming(symbol)
+                forming = None
+            if forming is None:
+                self._forming[symbol] = {'time': bar_start, 'open': ltp, 'high': ltp, 'low': ltp,
+                                         'close': ltp, 'volume': volume[i]}
+            else:
+                forming['high'] = max(forming['high'], ltp)
+                forming['low'] = min(forming['low'], ltp)
+                forming['close'] = ltp
+                forming['volume'] += volume[i]
+
+            self._update_price(symbol, ltp, when)
+
+        self._update_paper_prices(prices)
+
+    def _close_forming(self, symbol: str):
+        candle = self._forming.pop(symbol)
+        self._candles[symbol] = candle
+        self._process_candle(symbol, candle)
+
+    def _update_price(self, symbol: str, price: float, when: datetime):
+        self._quotes[symbol] = {'ltp': price, 'timestamp': when}
+        seconds = self.stats.component_seconds
+
+        if self.risk_manager is not None:
+            t = time.perf_counter()
+            self.risk_manager.update_price(symbol, price, self.exchange)
+            seconds['risk_manager'] += time.perf_counter() - t
+
+        if self.alert_manager is not None:
+            t = time.perf_counter()
+            self.alert_manager.update_price(symbol, price, self.exchange)
+            seconds['alert_manager'] += time.perf_counter() - t
+
+    def _update_paper_prices(self, prices: Dict[str, float]):
+        if self.paper_trader is not None:
+            t = time.perf_counter()
+            self.paper_trader.update_prices(prices)
+            self.stats.component_seconds['paper_trader'] += time.perf_counter() - t
+
+    def _process_candle(self, symbol: str, candle: Dict):
+        if self.strategy_engine is None:
+            return
+        self.stats.candles += 1
+
+        t = time.perf_counter()
+        signals = self.strategy_engine.process_candle(symbol, candle)
+        self.stats.component_seconds['strategy_engine'] += time.perf_counter() - t
+
+        for signal in signals:
+            self.stats.signals += 1
+            self._execute_signal(signal, candle['close'])
+
+    # Order routing
+
+    def _execute_signal(self, signal, price: float):
+        """Fill a strategy signal in the paper trader: entries open or reverse, exits flatten"""
+        if self.paper_trader is None:
+            return
+
+        symbol = signal.symbol
+        position = self.paper_trader.get_position(symbol)
+        held = position.quantity if position is not None else 0
+        side = position.action if position is not None else None
+
+        if signal.signal_type in (SignalType.BUY, SignalType.SELL):
+            action = signal.signal_type.value
+            if side == action:
+                return
+            quantity = (signal.quantity or self.order_quantity) + held
+        elif signal.signal_type == SignalType.EXIT_LONG and side == "BUY":
+            action, quantity = "SELL", held
+        elif signal.signal_type == SignalType.EXIT_SHORT and side == "SELL":
+            action, quantity = "BUY", held
+        else:
+            return
+
+        self._place_order(symbol, action, quantity, signal.strategy_name or "Replay", price)
+
+    def _place_order(self, symbol: str, action: str, quantity: int, source: str,
+                     price: float = None) -> Dict:
+        if price is None:
+            price = self._quotes.get(symbol, {}).get('ltp', 0.0)
+
+        t = time.perf_counter()
+        result = self.paper_trader.place_order(symbol, action, quantity, "MARKET", price=price, source=source)
+        self.stats.component_seconds['paper_trader'] += time.perf_counter() - t
+
+        if result['success']:
+            self.stats.orders += 1
+            if source != "RiskManager":
+                self._sync_risk_position(symbol)
+        return result
+
+    def _sync_risk_position(self, symbol: str):
+        """Mirror the paper trader's position for `symbol` in the risk manager"""
+        if self.risk_manager is None:
+            return
+
+        if self.risk_manager.get_position(symbol, self.exchange) is not None:
+            self.risk_manager.close_position(symbol, self._quotes[symbol]['ltp'], self.exchange)
+
+        position = self.paper_trader.get_position(symbol)
+        if position is None:
+            return
+
+        direction = 1 if position.action == "BUY" else -1
+        stop_loss = target = None
+        if self.stop_loss_percent > 0:
+            stop_loss = position.avg_price * (1 - direction * self.stop_loss_percent / 100)
+        if self.target_percent > 0:
+            target = position.avg_price * (1 + direction * self.target_percent / 100)
+        self.risk_manager.add_position(symbol, direction * position.quantity, position.avg_price,
+                                       exchange=self.exchange, stop_loss=stop_loss, target=target)
+
+    def _on_risk_exit(self, position):
+        """Stop loss / target hit: flatten in the paper trader and stop tracking"""
+        side = "SELL" if position.quantity > 0 else "BUY"
+        self._place_order(position.symbol, side, abs(position.quantity), "RiskManager", position.current_price)
+        self.risk_manager.close_position(position.symbol, position.current_price, position.exchange)
+
+    def _on_alert(self, event: Dict):
+        self.stats.alerts += 1
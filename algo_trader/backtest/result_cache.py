@@ -0,0 +1,319 @@
+"""
+Backtest Result Cache
+Content-addressed cache of backtest results on disk
+"""
+import os
+import re
+import json
+import pickle
+import shutil
+import hashlib
+import inspect
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Callable, Union
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from algo_trader.backtest.simulator import BacktestSimulator, BacktestResult
+
+
+# Source files whose changes can alter a backtest result (glob patterns)
+CODE_FILES = (
+    'backtest/simulator.py',
+    'backtest/intrabar.py',
+    'strategies/*.py',
+    'data/*.py',
+)
+
+# Simulator attributes that affect fills and P&L
+SETTINGS_ATTRIBUTES = ('initial_capital', 'slippage_percent', 'commission_per_trade',
+                       'stop_loss_percent', 'target_percent', 'trailing_sl_percent')
+
+DATA_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+_STRING = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+
+# Name of a per-code-version result directory (a code_version() digest)
+_VERSION_DIR = re.compile(r'[0-9a-f]{32}')
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the package version and the backtest, strategy and data sources"""
+    from algo_trader import __version__
+
+    digest = hashlib.blake2b(__version__.encode(), digest_size=16)
+    root = Path(__file__).resolve().parent.parent
+    for pattern in CODE_FILES:
+        for path in sorted(root.glob(pattern)):
+            digest.update(path.relative_to(root).as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """Hash of the OHLCV values and timestamps"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(data)).encode())
+
+    if 'datetime' in data.columns:
+        times = pd.DatetimeIndex(data['datetime'])
+    elif isinstance(data.index, pd.DatetimeIndex):
+        times = data.index
+    else:
+        times = None
+    if times is not None:
+        digest.update(np.ascontiguousarray(times.asi8).tobytes())
+
+    for column in DATA_COLUMNS:
+        if column in data.columns:
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+def normalize_pine_script(pine_script: str) -> str:
+    """Pine source without comments, blank lines or trailing whitespace (//@ annotations are kept)"""
+    lines = []
+    for line in pine_script.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('//@'):
+            lines.append(stripped)
+            continue
+
+        # Drop a // comment that is not inside a string literal
+        masked = _STRING.sub(lambda m: 'x' * len(m.group()), line)
+        if '//' in masked:
+            line = line[:masked.index('//')]
+        line = line.rstrip()
+        if line.strip():
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def _function_source(func: Callable) -> str:
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+    try:
+        body = inspect.getsource(func)
+    except (OSError, TypeError):
+        code = getattr(func, '__code__', None)
+        body = repr((code.co_code, code.co_consts)) if code is not None else ''
+    return f"{name}\n{body}"
+
+
+def _captured_value(value: Any) -> str:
+    """Text identifying a default argument or closure value (arrays and frames by content)"""
+    if isinstance(value, np.ndarray):
+        digest = hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16)
+        return f"ndarray{value.shape}{value.dtype}:{digest.hexdigest()}"
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest = hashlib.blake2b(pd.util.hash_pandas_object(value).to_numpy().tobytes(), digest_size=16)
+        return f"{type(value).__name__}{value.shape}:{digest.hexdigest()}"
+    if callable(value) and hasattr(value, '__code__'):
+        return _function_source(value)
+    return repr(value)
+
+
+def strategy_identity(strategy: Union[str, Callable]) -> str:
+    """
+    Hash of a normalized Pine script, or of a strategy function's name and code
+
+    A function's default arguments and closure values are part of its
+    identity, so two closures over different thresholds get different keys.
+    """
+    if isinstance(strategy, str):
+        source = normalize_pine_script(strategy)
+    else:
+        captured = list(getattr(strategy, '__defaults__', None) or ())
+        captured += sorted((getattr(strategy, '__kwdefaults__', None) or {}).items())
+        captured += [cell.cell_contents for cell in getattr(strategy, '__closure__', None) or ()]
+        source = '\n'.join([_function_source(strategy)] + [_captured_value(value) for value in captured])
+    return hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+
+
+def simulator_settings(simulator: BacktestSimulator, symbols: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Settings of a simulator that go into the cache key
+
+    Intrabar data is keyed by its fingerprint() for `symbols`; a source
+    without one cannot be keyed and raises TypeError.
+    """
+    settings = {name: getattr(simulator, name) for name in SETTINGS_ATTRIBUTES if hasattr(simulator, name)}
+    source = getattr(simulator, 'intrabar_data', None)
+    if source is None:
+        settings['intrabar_data'] = None
+    elif hasattr(source, 'fingerprint'):
+        settings['intrabar_data'] = source.fingerprint(symbols)
+    else:
+        raise TypeError(f"Cannot cache backtests using intrabar data from {type(source).__name__} "
+                        f"(no fingerprint())")
+    return settings
+
+
+class BacktestResultCache:
+    """
+    Content-addressed store of BacktestResult objects
+
+    Keys hash the OHLCV data, the normalized strategy, its inputs, the
+    simulator settings (including its intrabar data) and the code version,
+    so any change to them misses the cache. Results are pickled under `cache_dir/<code version>/` (the
+    directories of other code versions are removed on start-up) and the
+    most recent ones are also kept in memory. When the cache holds more
+    than `max_entries` results, the least recently used are evicted.
+    """
+
+    def __init__(self, cache_dir: str = None, max_entries: int = 200, memory_entries: int = 16):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".algo_trader" / "backtest_cache"
+        self.version_dir = self.cache_dir / code_version()
+        self.version_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        self._memory: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self._purge_stale_versions()
+
+    def _purge_stale_versions(self):
+        """Delete results cached by other code versions (other files in cache_dir are left alone)"""
+        for directory in self.cache_dir.iterdir():
+            if (directory.is_dir() and directory != self.version_dir
+                    and _VERSION_DIR.fullmatch(directory.name)):
+                shutil.rmtree(directory, ignore_errors=True)
+                logger.info(f"Dropped backtest results cached by code version {directory.name[:12]}")
+
+    def make_key(self, data: pd.DataFrame, strategy: Union[str, Callable],
+                 params: Optional[Dict[str, Any]] = None,
+                 settings: Union[BacktestSimulator, Dict[str, Any], None] = None,
+                 **extra) -> str:
+        """
+        Cache key for a backtest request
+
+        Args:
+            data: OHLCV DataFrame the backtest runs on
+            strategy: Pine Script source or strategy function
+            params: Strategy input values
+            settings: Simulator (or dict of its settings)
+            extra: Anything else that changes the result (symbol, mode, ...);
+                   `symbol` also selects the intrabar data that is fingerprinted
+        """
+        if isinstance(settings, BacktestSimulator):
+            settings = simulator_settings(settings, [extra['symbol']] if 'symbol' in extra else ())
+
+        request = {
+            'code': code_version(),
+            'data': data_fingerprint(data),
+            'strategy': strategy_identity(strategy),
+            'params': params or {},
+            'settings': settings or {},
+            'extra': extra,
+        }
+        canonical = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.blake2b(canonical.encode(), digest_size=20).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.version_dir / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[BacktestResult]:
+        """Cached result for key, or None"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self._touch(self._path(key))
+            self.hits += 1
+            return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached backtest {key}: {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        self._touch(path)
+        self._remember(key, result)
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: BacktestResult):
+        """Store a result and evict the least recently used entries beyond max_entries"""
+        path = self._path(key)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Error caching backtest result: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._remember(key, result)
+        self._evict()
+
+    def get_or_run(self, key: str, run: Callable[[], BacktestResult]) -> BacktestResult:
+        """Cached result for key, running (and caching) the backtest on a miss"""
+        result = self.get(key)
+        if result is not None:
+            logger.info(f"Backtest served from cache ({key[:12]})")
+            return result
+
+        result = run()
+        self.put(key, result)
+        return result
+
+    @staticmethod
+    def _touch(path: Path):
+        """Mark an entry as used: eviction drops the oldest modification times first"""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # Evicted by another process; the in-memory copy is still valid
+
+    def _remember(self, key: str, result: BacktestResult):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        entries = list(self.version_dir.glob("*.pkl"))
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            path.unlink(missing_ok=True)
+            self._memory.pop(path.stem, None)
+        logger.debug(f"Evicted {len(entries) - self.max_entries} cached backtests")
+
+    def invalidate(self, key: str = None):
+        """Drop one cached result, or all of them"""
+        if key is not None:
+            self._memory.pop(key, None)
+            self._path(key).unlink(missing_ok=True)
+            return
+
+        self._memory.clear()
+        for path in self.version_dir.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+        logger.info("Cleared backtest result cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and entry count"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'cached': len(list(self.version_dir.glob("*.pkl"))),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
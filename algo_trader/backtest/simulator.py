@@ -4,7 +4,7 @@ Runs strategies on historical data with realistic trade execution
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Iterable, Any, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -12,6 +12,8 @@ import threading
 import time
 from loguru import logger
 
+from algo_trader.data.bars import Bars, as_frame
+
 
 class TradeType(Enum):
     LONG = "LONG"
@@ -43,6 +45,155 @@ class SimulatedTrade:
     low_since_entry: float = 0.0
 
 
+class EquityCurve:
+    """
+    Per-bar equity stored as columns
+
+    Holds NumPy arrays (timestamps as a DatetimeIndex) for 'datetime',
+    'equity' and any other per-bar fields ('price', 'open_trades', ...).
+    Indexing or iterating gives the per-bar dicts the UI expects, built on
+    demand; slicing returns another EquityCurve.
+    """
+
+    def __init__(self, columns: Dict[str, Any] = None):
+        self._columns: Dict[str, Any] = {}
+        for name, values in (columns or {}).items():
+            self._columns[name] = self._as_column(name, values)
+
+        lengths = {len(values) for values in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Equity curve columns must have equal length")
+
+    @staticmethod
+    def _as_column(name: str, values: Any):
+        if name == 'datetime':
+            try:
+                return pd.DatetimeIndex(values)
+            except (TypeError, ValueError):
+                return np.asarray(values, dtype=object)
+        return np.asarray(values)
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> 'EquityCurve':
+        """Build from per-bar dicts"""
+        if not records:
+            return cls()
+        return cls({name: [r[name] for r in records] for name in records[0]})
+
+    @classmethod
+    def concat(cls, curves: List['EquityCurve']) -> 'EquityCurve':
+        """Join curves with the same columns end to end"""
+        curves = [c for c in curves if len(c)]
+        if not curves:
+            return cls()
+        columns = {}
+        for name in curves[0].columns:
+            parts = [c[name] for c in curves]
+            if isinstance(parts[0], pd.DatetimeIndex):
+                columns[name] = parts[0].append(parts[1:])
+            else:
+                columns[name] = np.concatenate(parts)
+        return cls(columns)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def equity(self) -> np.ndarray:
+        return self._columns['equity'] if 'equity' in self._columns else np.array([], dtype=float)
+
+    def __len__(self) -> int:
+        return len(next(iter(self._columns.values()))) if self._columns else 0
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            return self._columns[item]
+        if isinstance(item, slice):
+            return EquityCurve({name: values[item] for name, values in self._columns.items()})
+        return {name: self._scalar(values[item]) for name, values in self._columns.items()}
+
+    @staticmethod
+    def _scalar(value: Any) -> Any:
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __iter__(self):
+        lists = [list(values) if isinstance(values, pd.DatetimeIndex) else values.tolist()
+                 for values in self._columns.values()]
+        names = list(self._columns)
+        for row in zip(*lists):
+            yield dict(zip(names, row))
+
+    def to_dicts(self) -> List[Dict]:
+        """Per-bar dicts for every bar"""
+        return list(self)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self._columns)
+
+    def max_drawdown(self, initial_equity: float) -> float:
+        """Largest fall from a running peak (starting at initial_equity)"""
+        equity = self.equity.astype(float)
+        if len(equity) == 0:
+            return 0.0
+        peaks = np.maximum(np.maximum.accumulate(equity), initial_equity)
+        return max(0.0, float((peaks - equity).max()))
+
+
+class TradeLog:
+    """
+    Closed trades as NumPy columns
+
+    Columns: trade_id, symbol, trade_type, entry_time, exit_time (datetime64),
+    entry_price, exit_price, quantity, pnl, pnl_percent, exit_reason.
+    """
+
+    COLUMNS = ('trade_id', 'symbol', 'trade_type', 'entry_time', 'exit_time', 'entry_price',
+               'exit_price', 'quantity', 'pnl', 'pnl_percent', 'exit_reason')
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+
+    @classmethod
+    def from_trades(cls, trades: List[SimulatedTrade]) -> 'TradeLog':
+        columns = {
+            'trade_id': np.fromiter((t.trade_id for t in trades), dtype=np.int64, count=len(trades)),
+            'symbol': np.array([t.symbol for t in trades], dtype=object),
+            'trade_type': np.array([t.trade_type.value for t in trades], dtype=object),
+            'entry_time': cls._times([t.entry_time for t in trades]),
+            'exit_time': cls._times([t.exit_time for t in trades]),
+            'entry_price': np.fromiter((t.entry_price for t in trades), dtype=float, count=len(trades)),
+            'exit_price': np.fromiter((t.exit_price for t in trades), dtype=float, count=len(trades)),
+            'quantity': np.fromiter((t.quantity for t in trades), dtype=np.int64, count=len(trades)),
+            'pnl': np.fromiter((t.pnl for t in trades), dtype=float, count=len(trades)),
+            'pnl_percent': np.fromiter((t.pnl_percent for t in trades), dtype=float, count=len(trades)),
+            'exit_reason': np.array([t.exit_reason for t in trades], dtype=object),
+        }
+        return cls(columns)
+
+    @staticmethod
+    def _times(values: List) -> np.ndarray:
+        try:
+            return pd.to_datetime(values).to_numpy(dtype='datetime64[ns]')
+        except (TypeError, ValueError):
+            return np.full(len(values), np.datetime64('NaT'), dtype='datetime64[ns]')
+
+    def __len__(self) -> int:
+        return len(self.columns['pnl'])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def durations_minutes(self) -> np.ndarray:
+        """Holding time of each trade (NaN where a time is missing)"""
+        delta = (self.columns['exit_time'] - self.columns['entry_time']).astype('timedelta64[ns]')
+        minutes = delta.astype(np.int64) / 6e10
+        return np.where(np.isnat(delta), np.nan, minutes)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns)
+
+
 @dataclass
 class BacktestResult:
     """Results from a backtest run"""
@@ -67,7 +218,13 @@ class BacktestResult:
     largest_loss: float
     avg_trade_duration: float  # in minutes
     trades: List[SimulatedTrade] = field(default_factory=list)
-    equity_curve: List[Dict] = field(default_factory=list)
+    equity_curve: EquityCurve = field(default_factory=EquityCurve)
+    trade_log: Optional[TradeLog] = None
+
+    def trade_frame(self) -> pd.DataFrame:
+        """Closed trades as a DataFrame"""
+        log = self.trade_log if self.trade_log is not None else TradeLog.from_trades(self.trades)
+        return log.to_frame()
 
 
 class BacktestSimulator:
@@ -103,10 +260,24 @@ class BacktestSimulator:
         self.target_percent = 0.0
         self.trailing_sl_percent = 0.0
 
+        # Finer bars/ticks for bars where both SL and target could hit (see intrabar.py)
+        self.intrabar_data = None
+        self.intrabar_resolved = 0
+
         # Callbacks for UI updates
         self._trade_callbacks: List[Callable] = []
+        self._trade_batch_callbacks: List[Callable] = []
         self._progress_callbacks: List[Callable] = []
 
+        # Callback throttling (see set_progress_interval / set_trade_batching)
+        self.progress_every_bars = 1
+        self.progress_every_ms = 0.0
+        self.trade_batch_size = 1
+        self.silent = False  # Only start/summary lines are logged, not every trade
+        self._pending_trade_events: List[Tuple[SimulatedTrade, str]] = []
+        self._last_progress_idx = -1
+        self._last_progress_time = 0.0
+
         # Simulation state
         self._running = False
         self._paused = False
@@ -116,10 +287,41 @@ class BacktestSimulator:
         """Register callback for trade events"""
         self._trade_callbacks.append(callback)
 
+    def register_trade_batch_callback(self, callback: Callable):
+        """Register callback receiving lists of (trade, event) tuples"""
+        self._trade_batch_callbacks.append(callback)
+
     def register_progress_callback(self, callback: Callable):
         """Register callback for progress updates"""
         self._progress_callbacks.append(callback)
 
+    def set_progress_interval(self, every_bars: int = 1, every_ms: float = 0):
+        """
+        Throttle progress callbacks
+
+        A progress update is delivered once `every_bars` bars have passed
+        since the last one, or `every_ms` milliseconds have elapsed,
+        whichever comes first (0 disables either condition). The last bar
+        is always reported.
+        """
+        self.progress_every_bars = max(0, int(every_bars))
+        self.progress_every_ms = max(0.0, float(every_ms))
+
+    def set_trade_batching(self, batch_size: int):
+        """
+        Deliver trade events in batches
+
+        With batch_size > 1, OPEN/CLOSE events are queued and delivered when
+        the queue reaches batch_size, with each progress update and at the
+        end of the run. Trades are passed by reference, so a queued OPEN
+        event may already carry its exit.
+        """
+        self.trade_batch_size = max(1, int(batch_size))
+
+    def set_silent(self, silent: bool = True):
+        """High-throughput mode: no per-trade logging, only run summaries"""
+        self.silent = silent
+
     def set_risk_params(self, stop_loss: float = 0, target: float = 0,
                         trailing_sl: float = 0):
         """Set risk management parameters (in percentage)"""
@@ -127,6 +329,16 @@ class BacktestSimulator:
         self.target_percent = target
         self.trailing_sl_percent = trailing_sl
 
+    def set_intrabar_data(self, source):
+        """
+        Resolve SL/target ordering on ambiguous bars with finer data
+
+        Args:
+            source: Object with get_bars(symbol, start, end) returning 1-minute
+                    bars or ticks for [start, end), e.g. IntrabarData; None disables
+        """
+        self.intrabar_data = source
+
     def set_speed(self, speed: float):
         """Set simulation speed (1.0 = normal)"""
         self._speed = max(0.1, min(10.0, speed))
@@ -144,16 +356,49 @@ class BacktestSimulator:
         self._running = False
 
     def _notify_trade(self, trade: SimulatedTrade, event: str):
-        """Notify callbacks about trade event"""
+        """Notify callbacks about trade event (queued when batching)"""
+        if not self._trade_callbacks and not self._trade_batch_callbacks:
+            return
+        self._pending_trade_events.append((trade, event))
+        if len(self._pending_trade_events) >= self.trade_batch_size:
+            self._flush_trade_events()
+
+    def _flush_trade_events(self):
+        """Deliver queued trade events"""
+        if not self._pending_trade_events:
+            return
+        events, self._pending_trade_events = self._pending_trade_events, []
+
         for callback in self._trade_callbacks:
+            for trade, event in events:
+                try:
+                    callback(trade, event)
+                except Exception as e:
+                    logger.error(f"Trade callback error: {e}")
+
+        for callback in self._trade_batch_callbacks:
             try:
-                callback(trade, event)
+                callback(events)
             except Exception as e:
-                logger.error(f"Trade callback error: {e}")
+                logger.error(f"Trade batch callback error: {e}")
 
     def _notify_progress(self, current_idx: int, total: int,
                          current_time: datetime, current_price: float):
-        """Notify callbacks about simulation progress"""
+        """Notify callbacks about simulation progress, at most as often as set_progress_interval allows"""
+        if not self._progress_callbacks:
+            return
+
+        if current_idx < total - 1:
+            due = 0 < self.progress_every_bars <= current_idx - self._last_progress_idx
+            if not due and self.progress_every_ms > 0:
+                due = (time.monotonic() - self._last_progress_time) * 1000 >= self.progress_every_ms
+            if not due:
+                return
+
+        self._last_progress_idx = current_idx
+        self._last_progress_time = time.monotonic()
+        self._flush_trade_events()
+
         for callback in self._progress_callbacks:
             try:
                 callback(current_idx, total, current_time, current_price,
@@ -209,7 +454,8 @@ class BacktestSimulator:
             self.trades.append(trade)
             self.open_trades[symbol] = trade
 
-            logger.info(f"Opened {trade_type.value} trade: {symbol} @ ₹{exec_price:.2f} x {quantity}")
+            if not self.silent:
+                logger.info(f"Opened {trade_type.value} trade: {symbol} @ ₹{exec_price:.2f} x {quantity}")
             self._notify_trade(trade, "OPEN")
 
             return trade
@@ -249,7 +495,8 @@ class BacktestSimulator:
 
             del self.open_trades[symbol]
 
-            logger.info(f"Closed trade: {symbol} @ ₹{exec_price:.2f}, P&L: ₹{trade.pnl:.2f} ({reason})")
+            if not self.silent:
+                logger.info(f"Closed trade: {symbol} @ ₹{exec_price:.2f}, P&L: ₹{trade.pnl:.2f} ({reason})")
             self._notify_trade(trade, "CLOSE")
 
             return trade
@@ -300,32 +547,41 @@ class BacktestSimulator:
 
         return None
 
-    def run_backtest(self, data: pd.DataFrame, strategy_func: Callable,
+    def run_backtest(self, data: Union[pd.DataFrame, Bars], strategy_func: Callable = None,
                      symbol: str = "UNKNOWN", strategy_name: str = "Strategy",
-                     realtime_mode: bool = False) -> BacktestResult:
+                     realtime_mode: bool = False, signals=None) -> BacktestResult:
         """
         Run backtest on historical data
 
         Args:
-            data: DataFrame with columns: datetime, open, high, low, close, volume
-            strategy_func: Function that takes (row, index, data) and returns signal ('BUY', 'SELL', None)
+            data: DataFrame with columns: datetime, open, high, low, close, volume (or Bars)
+            strategy_func: Function that takes (row, index, data) and returns signal ('BUY', 'SELL', 'EXIT', None)
             symbol: Symbol being tested
             strategy_name: Name of the strategy
             realtime_mode: If True, simulate real-time with delays for visualization
+            signals: Precomputed per-bar signals instead of strategy_func; runs
+                     the array-based engine unless realtime_mode is set
 
         Returns:
             BacktestResult with all statistics and trades
         """
+        if signals is not None:
+            signals = np.asarray(signals, dtype=object)
+            if len(signals) != len(data):
+                raise ValueError("signals must have one entry per bar")
+            if not realtime_mode:
+                return self.run_backtest_vectorized(data, signals, symbol, strategy_name)
+            strategy_func = lambda row, idx, full_data: signals[full_data.index.get_loc(idx)]
+
+        if strategy_func is None:
+            raise ValueError("Either strategy_func or signals is required")
+
+        # The bar loop reads prices from rows: float64 as from a DataFrame
+        data = as_frame(data, dtype=float, datetime_column=True)
+
         self._running = True
         self._paused = False
-
-        # Reset state
-        self.current_capital = self.initial_capital
-        self.available_capital = self.initial_capital
-        self.trades = []
-        self.open_trades = {}
-        self.equity_curve = []
-        self._trade_counter = 0
+        self._reset_state()
 
         start_date = data.iloc[0]['datetime'] if 'datetime' in data.columns else datetime.now()
         end_date = data.iloc[-1]['datetime'] if 'datetime' in data.columns else datetime.now()
@@ -333,7 +589,12 @@ class BacktestSimulator:
         total_rows = len(data)
         logger.info(f"Starting backtest: {symbol} from {start_date} to {end_date} ({total_rows} candles)")
 
-        for idx, row in data.iterrows():
+        if self.intrabar_data is not None:
+            bar_times = self._bar_times(data)
+            bar_prices = np.column_stack([data['high'].to_numpy(dtype=float), data['low'].to_numpy(dtype=float),
+                                          data['close'].to_numpy(dtype=float)]).ravel()
+
+        for position, (idx, row) in enumerate(data.iterrows()):
             if not self._running:
                 break
 
@@ -347,6 +608,14 @@ class BacktestSimulator:
 
             # Check risk conditions for open trades
             for sym, trade in list(self.open_trades.items()):
+                if self.intrabar_data is not None:
+                    hit = self._scan_risk_exit(trade, bar_prices, position, position, bar_times)
+                    if hit is not None:
+                        _, price, exit_reason, exit_time = hit
+                        self._close_trade(sym, price, exit_time if exit_time is not None else current_time,
+                                          exit_reason)
+                    continue
+
                 # Check with high and low for more accurate SL/Target hit
                 for check_price in [high, low, current_price]:
                     exit_reason = self._check_risk_conditions(trade, check_price)
@@ -374,6 +643,10 @@ class BacktestSimulator:
                     self._close_trade(symbol, current_price, current_time, "Reverse Signal")
                     self._open_trade(symbol, TradeType.SHORT, current_price, current_time)
 
+            elif signal == 'EXIT':
+                if symbol in self.open_trades:
+                    self._close_trade(symbol, current_price, current_time, "Exit Signal")
+
             # Calculate current equity
             unrealized_pnl = 0
             for trade in self.open_trades.values():
@@ -394,7 +667,7 @@ class BacktestSimulator:
             })
 
             # Notify progress
-            self._notify_progress(idx, total_rows, current_time, current_price)
+            self._notify_progress(position, total_rows, current_time, current_price)
 
             # Simulate real-time delay
             if realtime_mode and self._running:
@@ -408,6 +681,8 @@ class BacktestSimulator:
         for sym in list(self.open_trades.keys()):
             self._close_trade(sym, last_price, last_time, "End of Backtest")
 
+        self._flush_trade_events()
+
         # Calculate results
         result = self._calculate_results(symbol, strategy_name, start_date, end_date)
 
@@ -416,34 +691,427 @@ class BacktestSimulator:
 
         return result
 
+    def run_backtest_vectorized(self, data: Union[pd.DataFrame, Bars], signals,
+                                symbol: str = "UNKNOWN",
+                                strategy_name: str = "Strategy") -> BacktestResult:
+        """
+        Array-based backtest over precomputed signals
+
+        Same fills, P&L and equity as run_backtest with one position per
+        symbol. Trades are opened and closed through _open_trade/_close_trade;
+        between them, stop loss / target / trailing SL hits are found by
+        scanning [high, low, close] of each bar as one flattened array, and
+        equity is filled in per segment instead of per row.
+
+        Args:
+            data: DataFrame with columns: datetime, open, high, low, close, volume (or Bars)
+            signals: Per-bar 'BUY', 'SELL', 'EXIT' or None
+        """
+        data = as_frame(data, datetime_column=True)
+        n = len(data)
+        if n == 0:
+            raise ValueError("No data to backtest")
+
+        self._running = True
+        self._paused = False
+        self._reset_state()
+
+        times = self._bar_times(data)
+        start_date = times[0]
+        end_date = times[-1]
+        logger.info(f"Starting vectorized backtest: {symbol} from {start_date} to {end_date} ({n} candles)")
+
+        close = data['close'].to_numpy(dtype=float)
+        self.equity_curve = self._step_signals(data, signals, symbol, times)
+
+        # Close any remaining open trades at last price
+        for sym in list(self.open_trades.keys()):
+            self._close_trade(sym, float(close[-1]), times[-1], "End of Backtest")
+
+        self._notify_progress(n - 1, n, end_date, close[-1])
+        self._flush_trade_events()
+
+        result = self._calculate_results(symbol, strategy_name, start_date, end_date)
+
+        self._running = False
+        logger.info(f"Backtest complete: {result.total_trades} trades, P&L: ₹{result.total_pnl:.2f}")
+
+        return result
+
+    def run_backtest_chunks(self, chunks: Iterable[Union[pd.DataFrame, Bars]],
+                            signal_func: Callable[[pd.DataFrame], Any],
+                            symbol: str = "UNKNOWN", strategy_name: str = "Strategy",
+                            warmup_bars: int = 0,
+                            keep_equity_curve: bool = True) -> BacktestResult:
+        """
+        Out-of-core backtest over consecutive chunks of history
+
+        Only one chunk (plus `warmup_bars` of the previous ones) is held at a
+        time. Open trades and capital carry over between chunks; indicator
+        state is carried by evaluating each chunk with the warm-up bars
+        prepended, so window indicators match a full-history run and
+        recursive ones (EMA, RMA, SuperTrend) converge within the warm-up.
+
+        Args:
+            chunks: DataFrames with columns: datetime, open, high, low, close, volume (or Bars)
+            signal_func: Takes a DataFrame (warm-up + chunk) and returns one
+                         'BUY' / 'SELL' / 'EXIT' / None per row
+            warmup_bars: Bars of history prepended to each chunk for signal_func
+            keep_equity_curve: Keep per-bar equity; when False only the last
+                               point of each chunk is kept (drawdown is still
+                               computed over every bar)
+        """
+        self._running = True
+        self._paused = False
+        self._reset_state()
+
+        warmup = None
+        curves = []
+        start_date = end_date = None
+        last_price = last_time = None
+        bars = 0
+        peak_equity = self.initial_capital
+        max_drawdown = 0.0
+
+        for chunk in chunks:
+            if not self._running:
+                break
+            if len(chunk) == 0:
+                continue
+
+            chunk = as_frame(chunk, datetime_column=True)
+            window = chunk if warmup is None else pd.concat([warmup, chunk], ignore_index=True)
+            signals = np.asarray(signal_func(window), dtype=object)
+            if len(signals) != len(window):
+                raise ValueError("signal_func must return one signal per row")
+
+            chunk = chunk.reset_index(drop=True)
+            times = self._bar_times(chunk)
+            points = self._step_signals(chunk, signals[len(window) - len(chunk):], symbol, times)
+
+            equity = points.equity
+            peaks = np.maximum.accumulate(np.append(peak_equity, equity))[1:]
+            max_drawdown = max(max_drawdown, float((peaks - equity).max()))
+            peak_equity = float(peaks[-1])
+
+            curves.append(points if keep_equity_curve else points[-1:])
+
+            if start_date is None:
+                start_date = times[0]
+            end_date = last_time = times[-1]
+            last_price = float(chunk['close'].iloc[-1])
+            bars += len(chunk)
+            self._notify_progress(bars - 1, bars, last_time, last_price)
+
+            warmup = window.iloc[-warmup_bars:].reset_index(drop=True) if warmup_bars > 0 else None
+
+        if start_date is None:
+            raise ValueError("No data to backtest")
+        self.equity_curve = EquityCurve.concat(curves)
+
+        # Close any remaining open trades at last price
+        for sym in list(self.open_trades.keys()):
+            self._close_trade(sym, last_price, last_time, "End of Backtest")
+        self._flush_trade_events()
+
+        result = self._calculate_results(symbol, strategy_name, start_date, end_date)
+        result.max_drawdown = max_drawdown
+        result.max_drawdown_percent = (max_drawdown / self.initial_capital) * 100
+
+        self._running = False
+        logger.info(f"Chunked backtest complete: {bars} candles, {result.total_trades} trades, "
+                    f"P&L: ₹{result.total_pnl:.2f}")
+
+        return result
+
+    def _reset_state(self):
+        self.intrabar_resolved = 0
+        self._pending_trade_events = []
+        self._last_progress_idx = -1
+        self._last_progress_time = time.monotonic()
+        self.current_capital = self.initial_capital
+        self.available_capital = self.initial_capital
+        self.trades = []
+        self.open_trades = {}
+        self.equity_curve = []
+        self._trade_counter = 0
+
+    @staticmethod
+    def _bar_times(data: pd.DataFrame):
+        if 'datetime' not in data.columns:
+            return [datetime.now()] * len(data)
+        if pd.api.types.is_datetime64_any_dtype(data['datetime']):
+            # Timestamps are only boxed for the bars that trade
+            return pd.DatetimeIndex(data['datetime'])
+        return data['datetime'].tolist()
+
+    def _step_signals(self, data: pd.DataFrame, signals, symbol: str, times: List) -> EquityCurve:
+        """
+        Apply per-bar signals to `data`, continuing from the current account state
+
+        Returns:
+            Equity curve points for the bars of `data`
+        """
+        n = len(data)
+        signals = np.asarray(signals, dtype=object)
+        high = data['high'].to_numpy(dtype=float)
+        low = data['low'].to_numpy(dtype=float)
+        close = data['close'].to_numpy(dtype=float)
+
+        # Check prices in the order the bar loop uses them: high, low, close
+        prices = np.column_stack([high, low, close]).ravel()
+
+        buy_bars = np.flatnonzero(signals == 'BUY')
+        sell_bars = np.flatnonzero(signals == 'SELL')
+        exit_bars = np.flatnonzero(signals == 'EXIT')
+        entry_bars = np.union1d(buy_bars, sell_bars)
+        close_long_bars = np.union1d(sell_bars, exit_bars)
+        close_short_bars = np.union1d(buy_bars, exit_bars)
+
+        # Account state after each event bar: (bar, available, quantity, entry, direction)
+        events = []
+
+        def record(bar: int):
+            trade = self.open_trades.get(symbol)
+            if trade is None:
+                events.append((bar, self.available_capital, 0, 0.0, 0))
+            else:
+                direction = 1 if trade.trade_type == TradeType.LONG else -1
+                events.append((bar, self.available_capital, trade.quantity, trade.entry_price, direction))
+
+        def open_at(bar: int, trade_type: TradeType):
+            self._open_trade(symbol, trade_type, float(close[bar]), times[bar])
+            record(bar)
+
+        # State carried in from before the first bar
+        record(-1)
+
+        bar = 0
+        while bar < n:
+            trade = self.open_trades.get(symbol)
+
+            if trade is None:
+                k = np.searchsorted(entry_bars, bar)
+                if k >= len(entry_bars):
+                    break
+                bar = int(entry_bars[k])
+                open_at(bar, TradeType.LONG if signals[bar] == 'BUY' else TradeType.SHORT)
+                bar += 1
+                continue
+
+            # Next signal that closes this trade (risk checks on that bar come first)
+            is_long = trade.trade_type == TradeType.LONG
+            closing = close_long_bars if is_long else close_short_bars
+            k = np.searchsorted(closing, bar)
+            signal_bar = int(closing[k]) if k < len(closing) else None
+            last = signal_bar if signal_bar is not None else n - 1
+
+            hit = self._scan_risk_exit(trade, prices, bar, last, times)
+            if hit is not None:
+                exit_bar, price, reason, exit_time = hit
+                self._close_trade(symbol, price, exit_time if exit_time is not None else times[exit_bar], reason)
+                record(exit_bar)
+                # The signal on the exit bar is still processed
+                bar = exit_bar
+                continue
+
+            if signal_bar is None:
+                break
+
+            if signals[signal_bar] == 'EXIT':
+                self._close_trade(symbol, float(close[signal_bar]), times[signal_bar], "Exit Signal")
+                record(signal_bar)
+            else:
+                self._close_trade(symbol, float(close[signal_bar]), times[signal_bar], "Reverse Signal")
+                open_at(signal_bar, TradeType.SHORT if is_long else TradeType.LONG)
+            bar = signal_bar + 1
+
+        return self._vectorized_equity_curve(events, close, times)
+
+    # Bars scanned per block when looking for a risk exit (doubles each block)
+    _SCAN_BLOCK = 256
+
+    def _scan_risk_exit(self, trade: SimulatedTrade, prices: np.ndarray,
+                        start: int, last: int, times=None) -> Optional[tuple]:
+        """
+        First stop loss / target / trailing SL hit on bars [start, last]
+
+        Evaluates the same conditions as _check_risk_conditions over the
+        flattened [high, low, close] prices. Updates the trade's high/low
+        since entry up to the hit (or through `last`). With intrabar data
+        set and bar `times` given, a bar whose high and low both trigger an
+        exit is replayed on the finer data to find which came first.
+
+        Returns:
+            (bar, price, reason, exit_time or None for the bar's time) or None
+        """
+        if not (self.stop_loss_percent > 0 or self.target_percent > 0 or self.trailing_sl_percent > 0):
+            if last >= start:
+                p = prices[3 * start:3 * (last + 1)]
+                trade.high_since_entry = float(np.fmax.accumulate(np.append(trade.high_since_entry, p))[-1])
+                trade.low_since_entry = float(np.fmin.accumulate(np.append(trade.low_since_entry, p))[-1])
+            return None
+
+        block = self._SCAN_BLOCK
+        bar = start
+        while bar <= last:
+            stop = min(last + 1, bar + block)
+            p = prices[3 * bar:3 * stop]
+            high_before, low_before = trade.high_since_entry, trade.low_since_entry
+            highs = np.fmax.accumulate(np.concatenate(([high_before], p)))[1:]
+            lows = np.fmin.accumulate(np.concatenate(([low_before], p)))[1:]
+
+            hits = self._risk_hits(trade, p, highs, lows)
+            if hits is None:
+                if len(p):
+                    trade.high_since_entry = float(highs[-1])
+                    trade.low_since_entry = float(lows[-1])
+                bar = stop
+                block *= 2
+                continue
+
+            any_hit, hit_index = hits[0], hits[1]
+            hit_bar = bar + hit_index // 3
+
+            # High and low of the same bar both trigger: the fixed order may be wrong
+            if self.intrabar_data is not None and times is not None \
+                    and hit_index % 3 == 0 and any_hit[hit_index + 1]:
+                if hit_index > 0:
+                    high_before, low_before = float(highs[hit_index - 1]), float(lows[hit_index - 1])
+                resolved = self._resolve_intrabar(trade, hit_bar, times, high_before, low_before)
+                if resolved is not None:
+                    return resolved
+
+            trade.high_since_entry = float(highs[hit_index])
+            trade.low_since_entry = float(lows[hit_index])
+            return hit_bar, float(p[hit_index]), self._risk_reason(trade, hits, hit_index), None
+
+        return None
+
+    def _risk_hits(self, trade: SimulatedTrade, p: np.ndarray,
+                   highs: np.ndarray, lows: np.ndarray) -> Optional[tuple]:
+        """
+        Risk conditions at each price of a path
+
+        Returns:
+            (any_hit, first hit index, sl_hit, target_hit, trail_hit) or None
+            when nothing triggers; disabled rules give None masks
+        """
+        entry = trade.entry_price
+        if trade.trade_type == TradeType.LONG:
+            pnl_percent = ((p - entry) / entry) * 100
+            trail = highs * (1 - self.trailing_sl_percent / 100)
+            trail_hit = (p <= trail) & (p > entry)
+        else:
+            pnl_percent = ((entry - p) / entry) * 100
+            trail = lows * (1 + self.trailing_sl_percent / 100)
+            trail_hit = (p >= trail) & (p < entry)
+
+        sl_hit = (pnl_percent <= -self.stop_loss_percent) if self.stop_loss_percent > 0 else None
+        target_hit = (pnl_percent >= self.target_percent) if self.target_percent > 0 else None
+        trail_hit = trail_hit if self.trailing_sl_percent > 0 else None
+
+        any_hit = np.zeros(len(p), dtype=bool)
+        for hits in (sl_hit, target_hit, trail_hit):
+            if hits is not None:
+                any_hit |= hits
+        if not any_hit.any():
+            return None
+        return any_hit, int(np.argmax(any_hit)), sl_hit, target_hit, trail_hit
+
+    @staticmethod
+    def _risk_reason(trade: SimulatedTrade, hits: tuple, index: int) -> str:
+        """Exit reason at a hit index, same priority as _check_risk_conditions"""
+        sl_hit, target_hit = hits[2], hits[3]
+        if sl_hit is not None and sl_hit[index]:
+            return "Stop Loss"
+        if target_hit is not None and target_hit[index]:
+            return "Target"
+        if trade.trade_type == TradeType.LONG:
+            return f"Trailing SL (High: ₹{trade.high_since_entry:.2f})"
+        return f"Trailing SL (Low: ₹{trade.low_since_entry:.2f})"
+
+    def _resolve_intrabar(self, trade: SimulatedTrade, bar: int, times,
+                          high_before: float, low_before: float) -> Optional[tuple]:
+        """Replay an ambiguous bar on finer data; None when it is unavailable or shows no hit"""
+        from algo_trader.backtest.intrabar import intrabar_path
+
+        bar_start = times[bar]
+        if bar + 1 < len(times):
+            bar_end = times[bar + 1]
+        elif bar > 0:
+            bar_end = bar_start + (bar_start - times[bar - 1])
+        else:
+            return None
+
+        try:
+            fine = self.intrabar_data.get_bars(trade.symbol, bar_start, bar_end)
+        except Exception as e:
+            logger.error(f"Intrabar data error for {trade.symbol} at {bar_start}: {e}")
+            return None
+        if fine is None or len(fine) == 0:
+            return None
+
+        p, stamps = intrabar_path(fine)
+        highs = np.fmax.accumulate(np.concatenate(([high_before], p)))[1:]
+        lows = np.fmin.accumulate(np.concatenate(([low_before], p)))[1:]
+        hits = self._risk_hits(trade, p, highs, lows)
+        if hits is None:
+            return None
+
+        index = hits[1]
+        trade.high_since_entry = float(highs[index])
+        trade.low_since_entry = float(lows[index])
+        self.intrabar_resolved += 1
+        return bar, float(p[index]), self._risk_reason(trade, hits, index), stamps[index]
+
+    def _vectorized_equity_curve(self, events: List[tuple], close: np.ndarray,
+                                 times: List) -> EquityCurve:
+        """Per-bar equity from the account state after each event bar (first event: bar -1)"""
+        n = len(close)
+        bars = np.array([e[0] for e in events], dtype=int)
+        available = np.array([e[1] for e in events], dtype=float)
+        quantity = np.array([e[2] for e in events], dtype=float)
+        entry = np.array([e[3] for e in events], dtype=float)
+        direction = np.array([e[4] for e in events], dtype=int)
+
+        # State in force on each bar: the last event at or before it
+        state = np.searchsorted(bars, np.arange(n), side='right') - 1
+        qty = quantity[state]
+        entry_price = entry[state]
+        side = direction[state]
+
+        # Same operation order as the bar loop: available + unrealized, then + entry value
+        unrealized = np.where(side == 1, (close - entry_price) * qty, (entry_price - close) * qty)
+        equity = np.where(side == 0, available[state],
+                          available[state] + unrealized + entry_price * qty)
+        open_trades = (side != 0).astype(int)
+
+        return EquityCurve({'datetime': times, 'equity': equity, 'price': close, 'open_trades': open_trades})
+
     def _calculate_results(self, symbol: str, strategy_name: str,
                           start_date: datetime, end_date: datetime) -> BacktestResult:
         """Calculate backtest statistics"""
         closed_trades = [t for t in self.trades if t.status == TradeStatus.CLOSED]
+        trade_log = TradeLog.from_trades(closed_trades)
+
+        if not isinstance(self.equity_curve, EquityCurve):
+            self.equity_curve = EquityCurve.from_records(self.equity_curve)
 
-        winning = [t for t in closed_trades if t.pnl > 0]
-        losing = [t for t in closed_trades if t.pnl <= 0]
+        pnl = trade_log['pnl']
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl <= 0]
 
-        total_pnl = sum(t.pnl for t in closed_trades)
-        total_wins = sum(t.pnl for t in winning)
-        total_losses = abs(sum(t.pnl for t in losing))
+        total_pnl = float(pnl.sum())
+        total_wins = float(wins.sum())
+        total_losses = abs(float(losses.sum()))
 
-        # Max drawdown
-        max_equity = self.initial_capital
-        max_drawdown = 0
-        for point in self.equity_curve:
-            eq = point['equity']
-            max_equity = max(max_equity, eq)
-            drawdown = max_equity - eq
-            max_drawdown = max(max_drawdown, drawdown)
+        max_drawdown = self.equity_curve.max_drawdown(self.initial_capital)
 
         # Average trade duration
-        durations = []
-        for t in closed_trades:
-            if t.entry_time and t.exit_time:
-                duration = (t.exit_time - t.entry_time).total_seconds() / 60
-                durations.append(duration)
-        avg_duration = np.mean(durations) if durations else 0
+        durations = trade_log.durations_minutes()
+        durations = durations[~np.isnan(durations)]
+        avg_duration = float(durations.mean()) if len(durations) else 0
 
         result = BacktestResult(
             symbol=symbol,
@@ -455,19 +1123,20 @@ class BacktestSimulator:
             total_pnl=total_pnl,
             total_pnl_percent=(total_pnl / self.initial_capital) * 100,
             total_trades=len(closed_trades),
-            winning_trades=len(winning),
-            losing_trades=len(losing),
-            win_rate=(len(winning) / len(closed_trades) * 100) if closed_trades else 0,
+            winning_trades=len(wins),
+            losing_trades=len(losses),
+            win_rate=(len(wins) / len(closed_trades) * 100) if closed_trades else 0,
             max_drawdown=max_drawdown,
             max_drawdown_percent=(max_drawdown / self.initial_capital) * 100,
             profit_factor=(total_wins / total_losses) if total_losses > 0 else float('inf'),
-            avg_win=(total_wins / len(winning)) if winning else 0,
-            avg_loss=(total_losses / len(losing)) if losing else 0,
-            largest_win=max((t.pnl for t in winning), default=0),
-            largest_loss=min((t.pnl for t in losing), default=0),
+            avg_win=(total_wins / len(wins)) if len(wins) else 0,
+            avg_loss=(total_losses / len(losses)) if len(losses) else 0,
+            largest_win=float(wins.max()) if len(wins) else 0,
+            largest_loss=float(losses.min()) if len(losses) else 0,
             avg_trade_duration=avg_duration,
             trades=closed_trades,
-            equity_curve=self.equity_curve
+            equity_curve=self.equity_curve,
+            trade_log=trade_log
         )
 
         return result
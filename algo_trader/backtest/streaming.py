@@ -0,0 +1,166 @@
+"""
+Streaming Backtests
+Out-of-core backtests over Parquet history read one row group or partition at a time
+"""
+import itertools
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from algo_trader.backtest.simulator import BacktestSimulator, BacktestResult
+
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pq = None
+    PYARROW_AVAILABLE = False
+
+
+# Warm-up per bar of indicator lookback; recursive indicators (EMA/RMA)
+# forget their seed within ~10 lengths
+WARMUP_LOOKBACKS = 10
+
+# Indicators accumulated over the whole history: no warm-up window reproduces them
+CUMULATIVE_INDICATORS = frozenset({'ta.vwap'})
+
+
+def _normalize_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """Chunk with a datetime column (cache files store it as the index)"""
+    if 'datetime' not in df.columns:
+        df = df.reset_index()
+        df = df.rename(columns={df.columns[0]: 'datetime'})
+    df['datetime'] = pd.to_datetime(df['datetime'])
+    return df
+
+
+def parquet_files(source: Union[str, Path]) -> List[Path]:
+    """Parquet files of a file or partitioned directory, in path order (date partitions sort by date)"""
+    source = Path(source)
+    if source.is_dir():
+        return sorted(source.rglob('*.parquet'))
+    return [source]
+
+
+def iter_parquet_chunks(source: Union[str, Path], batch_rows: Optional[int] = None,
+                        columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield OHLCV chunks of a Parquet file or partitioned directory
+
+    Each chunk is one row group (or `batch_rows` rows) of one file, so
+    only a chunk is in memory at a time. Without pyarrow every file is
+    read whole.
+
+    Args:
+        source: Parquet file, or directory of Parquet partitions
+        batch_rows: Rows per chunk (default: one row group per chunk)
+        columns: Columns to read (default: all)
+    """
+    files = parquet_files(source)
+    if not files:
+        logger.warning(f"No Parquet files under {source}")
+        return
+
+    if not PYARROW_AVAILABLE:
+        logger.warning("pyarrow not installed - reading whole Parquet files instead of row groups")
+
+    for path in files:
+        if not PYARROW_AVAILABLE:
+            yield _normalize_chunk(pd.read_parquet(path, columns=columns))
+            continue
+
+        parquet_file = pq.ParquetFile(path)
+        if batch_rows:
+            for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=columns):
+                yield _normalize_chunk(batch.to_pandas())
+        else:
+            for i in range(parquet_file.num_row_groups):
+                yield _normalize_chunk(parquet_file.read_row_group(i, columns=columns).to_pandas())
+
+
+class PineSignalSource:
+    """
+    Signal function for BacktestSimulator.run_backtest_chunks
+
+    Evaluates a Pine Script strategy over each warm-up + chunk window with
+    one interpreter, so compiled plans are reused between chunks. Windows
+    are loaded at their absolute bar position (found from the overlap with
+    the previous window), so bar_index matches a full-history run.
+    Strategies using cumulative indicators are rejected: their values
+    depend on every earlier bar, not just the warm-up.
+    """
+
+    def __init__(self, pine_script: str):
+        from algo_trader.strategies.pine_parser import PineScriptParser
+        from algo_trader.strategies.pine_interpreter import PineScriptInterpreter
+
+        strategy = PineScriptParser().parse(pine_script)
+        if not strategy:
+            raise ValueError("Failed to parse strategy")
+        self.interpreter = PineScriptInterpreter(strategy)
+
+        cumulative = sorted({node['function'] for node in self.interpreter._iter_indicator_calls()}
+                            & CUMULATIVE_INDICATORS)
+        if cumulative:
+            raise ValueError(f"{', '.join(cumulative)} accumulates over the whole history and "
+                             f"cannot be evaluated in chunks - run a full backtest instead")
+
+        self._offset = 0  # Bar number of the last window's first row
+        self._last_index: Optional[pd.Index] = None
+
+    @property
+    def warmup_bars(self) -> int:
+        """Bars of history each chunk needs for its indicators to settle (after the first call)"""
+        if self.interpreter.data is None:
+            raise ValueError("Warm-up is known once a chunk has been evaluated")
+        lookback = self.interpreter._max_lookback()
+        return max(self.interpreter.MIN_BUFFER_BARS, WARMUP_LOOKBACKS * lookback)
+
+    def __call__(self, window: pd.DataFrame) -> np.ndarray:
+        data = window.set_index('datetime') if 'datetime' in window.columns else window
+        if self._last_index is not None and len(data):
+            # The window starts inside (warm-up) or right after the previous one
+            self._offset += int(self._last_index.searchsorted(data.index[0]))
+        self._last_index = data.index
+
+        self.interpreter.load_data(data, bar_offset=self._offset)
+        return self.interpreter.generate_signals().to_numpy(dtype=object)
+
+
+def run_streaming_backtest(source: Union[str, Path], pine_script: str,
+                           simulator: Optional[BacktestSimulator] = None,
+                           symbol: str = "UNKNOWN", strategy_name: str = "Strategy",
+                           batch_rows: Optional[int] = None,
+                           warmup_bars: Optional[int] = None,
+                           keep_equity_curve: bool = False) -> BacktestResult:
+    """
+    Backtest a Pine Script strategy over Parquet history without loading it all
+
+    Args:
+        source: Parquet file or partitioned directory (sorted by time)
+        pine_script: Strategy source
+        simulator: Configured simulator (capital, risk, costs); default BacktestSimulator()
+        batch_rows: Rows per chunk (default: one row group per chunk)
+        warmup_bars: Bars prepended to each chunk (default from the strategy's lookback)
+        keep_equity_curve: Keep per-bar equity instead of one point per chunk
+    """
+    simulator = simulator or BacktestSimulator()
+    signal_source = PineSignalSource(pine_script)
+    chunks = iter_parquet_chunks(source, batch_rows=batch_rows)
+
+    if warmup_bars is None:
+        # Input-dependent lookbacks resolve once the strategy has seen data
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError(f"No data in {source}")
+        signal_source(first)
+        warmup_bars = signal_source.warmup_bars
+        chunks = itertools.chain([first], chunks)
+
+    logger.info(f"Streaming backtest of {symbol} from {source} ({warmup_bars}-bar warm-up)")
+    return simulator.run_backtest_chunks(
+        chunks, signal_source, symbol=symbol, strategy_name=strategy_name,
+        warmup_bars=warmup_bars, keep_equity_curve=keep_equity_curve
+    )
@@ -0,0 +1,381 @@
+"""
+Walk-Forward Analysis
+Rolling or anchored train/test optimization on top of BacktestSimulator
+"""
+import os
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Callable, Sequence, Tuple
+from dataclasses import dataclass, field
+from loguru import logger
+
+from algo_trader.backtest.simulator import BacktestSimulator, BacktestResult, EquityCurve
+from algo_trader.backtest.optimizer import grid_search_space, random_search_space, get_strategy_inputs
+from algo_trader.strategies.pine_parser import PineScriptParser
+from algo_trader.strategies.pine_interpreter import PineScriptInterpreter
+
+
+# Window objective -> True when larger is better
+OBJECTIVES = {
+    'sharpe_ratio': True,
+    'profit_factor': True,
+    'total_pnl': True,
+    'win_rate': True,
+    'max_drawdown_percent': False,
+}
+
+# Full-history signal arrays each worker keeps (one per parameter set)
+SIGNAL_CACHE_SIZE = 128
+
+# Indicator results each worker keeps across parameter sets
+WORKER_CACHE_ENTRIES = 256
+
+
+def walk_forward_splits(n_bars: int, train_bars: int, test_bars: int,
+                        anchored: bool = False) -> List[Tuple[int, int, int, int]]:
+    """
+    Train/test bar ranges as (train_start, train_end, test_start, test_end)
+
+    Test windows are consecutive and non-overlapping. Rolling windows train
+    on the `train_bars` before each test window; anchored windows train on
+    everything from the first bar.
+    """
+    if train_bars < 1 or test_bars < 1:
+        raise ValueError("train_bars and test_bars must be positive")
+
+    splits = []
+    test_start = train_bars
+    while test_start < n_bars:
+        test_end = min(test_start + test_bars, n_bars)
+        train_start = 0 if anchored else test_start - train_bars
+        splits.append((train_start, test_start, test_start, test_end))
+        test_start = test_end
+    return splits
+
+
+def sharpe_ratio(equity_curve: EquityCurve) -> float:
+    """Annualized Sharpe ratio of per-bar equity returns"""
+    equity = equity_curve.equity.astype(float)
+    if len(equity) < 2:
+        return 0.0
+    returns = np.diff(equity) / equity[:-1]
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    return float(returns.mean() / std * np.sqrt(252)) if std > 0 else 0.0
+
+
+def score_result(result: BacktestResult, objective: str) -> float:
+    """Objective value of a backtest (NaN when it made no trades)"""
+    if result.total_trades == 0:
+        return np.nan
+    if objective == 'sharpe_ratio':
+        return sharpe_ratio(result.equity_curve)
+    return float(getattr(result, objective))
+
+
+@dataclass
+class WalkForwardWindow:
+    """One train/test step of a walk-forward run"""
+    index: int
+    train_start: Any
+    train_end: Any
+    test_start: Any
+    test_end: Any
+    best_params: Dict[str, Any]
+    train_score: float
+    test_score: float = np.nan
+    test_result: Optional[BacktestResult] = None
+
+
+@dataclass
+class WalkForwardResult:
+    """Stitched out-of-sample results of a walk-forward run"""
+    objective: str
+    anchored: bool
+    initial_capital: float
+    final_capital: float
+    total_pnl: float
+    total_pnl_percent: float
+    total_trades: int
+    sharpe_ratio: float
+    windows: List[WalkForwardWindow] = field(default_factory=list)
+    equity_curve: EquityCurve = field(default_factory=EquityCurve)
+
+    def summary(self) -> pd.DataFrame:
+        """One row per window: dates, chosen params, train and test scores"""
+        rows = []
+        for w in self.windows:
+            row = {
+                'window': w.index,
+                'train_start': w.train_start,
+                'train_end': w.train_end,
+                'test_start': w.test_start,
+                'test_end': w.test_end,
+                'train_score': w.train_score,
+                'test_score': w.test_score,
+                'test_pnl': w.test_result.total_pnl if w.test_result else np.nan,
+                'test_trades': w.test_result.total_trades if w.test_result else 0,
+            }
+            row.update(w.best_params)
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+class _WalkForwardWorker:
+    """
+    Backtests parameter sets on slices of one loaded history
+
+    Signals are computed once per parameter set over the full history and
+    sliced per window, so overlapping windows share indicator work.
+    """
+
+    def __init__(self, pine_script: str, data: pd.DataFrame, initial_capital: float,
+                 settings: Dict[str, Any], symbol: str):
+        self.data = data
+        self.initial_capital = initial_capital
+        self.settings = settings
+        self.symbol = symbol
+
+        strategy = PineScriptParser().parse(pine_script)
+        self.strategy_name = strategy.name or "Strategy"
+        self.interpreter = PineScriptInterpreter(strategy)
+        self.interpreter.indicator_cache.max_entries = WORKER_CACHE_ENTRIES
+        self.interpreter.load_data(data.set_index('datetime'))
+        self._signals: OrderedDict = OrderedDict()
+
+    def signals(self, params: Dict[str, Any]) -> np.ndarray:
+        """Full-history signal array for a parameter set"""
+        key = tuple(sorted(params.items()))
+        if key in self._signals:
+            self._signals.move_to_end(key)
+            return self._signals[key]
+
+        for name, value in params.items():
+            self.interpreter.set_input(name, value)
+        signals = self.interpreter.generate_signals().to_numpy()
+
+        self._signals[key] = signals
+        if len(self._signals) > SIGNAL_CACHE_SIZE:
+            self._signals.popitem(last=False)
+        return signals
+
+    def backtest(self, params: Dict[str, Any], start: int, stop: int,
+                 capital: float) -> BacktestResult:
+        """Run BacktestSimulator over bars [start, stop)"""
+        signals = self.signals(params)[start:stop]
+        window = self.data.iloc[start:stop].reset_index(drop=True)
+
+        simulator = BacktestSimulator(initial_capital=capital)
+        simulator.set_silent()
+        simulator.set_risk_params(
+            stop_loss=self.settings.get('stop_loss', 0),
+            target=self.settings.get('target', 0),
+            trailing_sl=self.settings.get('trailing_sl', 0)
+        )
+        if 'slippage_percent' in self.settings:
+            simulator.slippage_percent = self.settings['slippage_percent']
+        if 'commission_per_trade' in self.settings:
+            simulator.commission_per_trade = self.settings['commission_per_trade']
+
+        return simulator.run_backtest(
+            data=window,
+            signals=signals,
+            symbol=self.symbol,
+            strategy_name=self.strategy_name
+        )
+
+    def optimize(self, start: int, stop: int, param_sets: List[Dict[str, Any]],
+                 objective: str) -> Tuple[Dict[str, Any], float]:
+        """Best parameter set on bars [start, stop)"""
+        higher_is_better = OBJECTIVES[objective]
+        best_params, best_score = param_sets[0], np.nan
+
+        for params in param_sets:
+            try:
+                score = score_result(self.backtest(params, start, stop, self.initial_capital), objective)
+            except Exception as e:
+                logger.error(f"Backtest failed for {params}: {e}")
+                continue
+            if np.isnan(score):
+                continue
+            if np.isnan(best_score) or (score > best_score if higher_is_better else score < best_score):
+                best_params, best_score = params, score
+
+        return best_params, best_score
+
+
+# Per-process worker, created once by the pool initializer
+_worker: Optional[_WalkForwardWorker] = None
+
+
+def _init_worker(pine_script: str, data: pd.DataFrame, initial_capital: float,
+                 settings: Dict[str, Any], symbol: str):
+    global _worker
+    # Start/summary lines of thousands of short backtests would flood the log
+    logger.disable("algo_trader.backtest.simulator")
+    _worker = _WalkForwardWorker(pine_script, data, initial_capital, settings, symbol)
+
+
+def _optimize_window(start: int, stop: int, param_sets: List[Dict[str, Any]],
+                     objective: str) -> Tuple[Dict[str, Any], float]:
+    return _worker.optimize(start, stop, param_sets, objective)
+
+
+class WalkForwardAnalyzer:
+    """
+    Walk-forward optimizer for Pine Script strategies
+
+    Each window optimizes the inputs on its training bars and evaluates
+    the winner on the following test bars. Windows are optimized in
+    parallel worker processes; test windows then run in order with the
+    capital carried forward, giving one stitched out-of-sample equity curve.
+    """
+
+    def __init__(self, pine_script: str, data: pd.DataFrame, initial_capital: float = 100000.0,
+                 settings: Optional[Dict[str, Any]] = None, symbol: str = "UNKNOWN",
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            pine_script: Strategy source
+            data: OHLCV data with a 'datetime' column or a datetime index
+            initial_capital: Starting capital
+            settings: Simulator settings - stop_loss, target, trailing_sl (percent),
+                      slippage_percent, commission_per_trade
+            symbol: Symbol name used in trades
+            max_workers: Worker processes (default: CPU count)
+        """
+        if 'datetime' not in data.columns:
+            data = data.rename_axis('datetime').reset_index()
+        self.data = data.reset_index(drop=True)
+        self.pine_script = pine_script
+        self.initial_capital = initial_capital
+        self.settings = dict(settings or {})
+        self.symbol = symbol
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        self.strategy = PineScriptParser().parse(pine_script)
+        if not self.strategy:
+            raise ValueError("Failed to parse strategy")
+
+    def run(self, param_ranges: Dict[str, Sequence], train_bars: int, test_bars: int,
+            anchored: bool = False, method: str = "grid", n_samples: int = 100,
+            objective: str = "sharpe_ratio", seed: Optional[int] = None,
+            progress_callback: Callable[[int, int], None] = None) -> WalkForwardResult:
+        """
+        Run the walk-forward analysis
+
+        Args:
+            param_ranges: Input name -> values to try on each training window
+            train_bars: Training window length (bars)
+            test_bars: Test window length (bars)
+            anchored: Train from the first bar instead of a rolling window
+            method: 'grid' or 'random' search on each training window
+            n_samples: Number of combinations for random search
+            objective: Training objective, one of OBJECTIVES
+            seed: Random search seed
+            progress_callback: Called with (optimized windows, total windows)
+
+        Returns:
+            WalkForwardResult with per-window results and stitched equity
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}")
+
+        inputs = get_strategy_inputs(self.strategy)
+        unknown = [name for name in param_ranges if name not in inputs]
+        if unknown:
+            raise ValueError(f"Unknown strategy inputs: {', '.join(unknown)}")
+
+        param_ranges = {name: list(values) for name, values in param_ranges.items()}
+        if method == "grid":
+            param_sets = grid_search_space(param_ranges)
+        elif method == "random":
+            param_sets = random_search_space(param_ranges, n_samples, seed)
+        else:
+            raise ValueError(f"Unknown search method: {method}")
+
+        splits = walk_forward_splits(len(self.data), train_bars, test_bars, anchored)
+        if not splits:
+            raise ValueError("Not enough data for a single train/test window")
+
+        workers = min(self.max_workers, len(splits))
+        logger.info(f"Walk-forward: {len(splits)} {'anchored' if anchored else 'rolling'} windows, "
+                    f"{len(param_sets)} parameter sets each, {workers} workers")
+
+        local = _WalkForwardWorker(self.pine_script, self.data, self.initial_capital,
+                                   self.settings, self.symbol)
+        if workers <= 1:
+            best = []
+            for i, (train_start, train_end, _, _) in enumerate(splits):
+                best.append(local.optimize(train_start, train_end, param_sets, objective))
+                if progress_callback:
+                    progress_callback(i + 1, len(splits))
+        else:
+            best = self._optimize_parallel(splits, param_sets, objective, workers, progress_callback)
+
+        return self._stitch(local, splits, best, objective, anchored)
+
+    def _optimize_parallel(self, splits: List[Tuple], param_sets: List[Dict], objective: str,
+                           workers: int, progress_callback: Callable = None) -> List[Tuple]:
+        best: List[Optional[Tuple]] = [None] * len(splits)
+        completed = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.pine_script, self.data, self.initial_capital,
+                                           self.settings, self.symbol)) as pool:
+            futures = {
+                pool.submit(_optimize_window, train_start, train_end, param_sets, objective): i
+                for i, (train_start, train_end, _, _) in enumerate(splits)
+            }
+            for future in as_completed(futures):
+                best[futures[future]] = future.result()
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, len(splits))
+        return best
+
+    def _stitch(self, worker: _WalkForwardWorker, splits: List[Tuple], best: List[Tuple],
+                objective: str, anchored: bool) -> WalkForwardResult:
+        """Run the test windows in order, carrying capital forward"""
+        times = self.data['datetime']
+        capital = self.initial_capital
+        windows = []
+        curves = []
+        total_trades = 0
+
+        for i, ((train_start, train_end, test_start, test_end), (params, train_score)) in \
+                enumerate(zip(splits, best)):
+            result = worker.backtest(params, test_start, test_end, capital)
+            capital = result.final_capital
+            total_trades += result.total_trades
+            curves.append(result.equity_curve)
+
+            windows.append(WalkForwardWindow(
+                index=i,
+                train_start=times.iloc[train_start],
+                train_end=times.iloc[train_end - 1],
+                test_start=times.iloc[test_start],
+                test_end=times.iloc[test_end - 1],
+                best_params=params,
+                train_score=train_score,
+                test_score=score_result(result, objective),
+                test_result=result
+            ))
+
+        equity_curve = EquityCurve.concat(curves)
+        total_pnl = capital - self.initial_capital
+        logger.info(f"Walk-forward complete: {len(windows)} windows, {total_trades} OOS trades, "
+                    f"P&L: ₹{total_pnl:.2f}")
+
+        return WalkForwardResult(
+            objective=objective,
+            anchored=anchored,
+            initial_capital=self.initial_capital,
+            final_capital=capital,
+            total_pnl=total_pnl,
+            total_pnl_percent=(total_pnl / self.initial_capital) * 100,
+            total_trades=total_trades,
+            sharpe_ratio=sharpe_ratio(equity_curve),
+            windows=windows,
+            equity_curve=equity_curve
+        )
@@ -414,10 +414,12 @@ class AliceBlueBroker(BaseBroker):
 
     def get_historical_data(self, symbol: str, exchange: str = "NSE",
                            interval: str = "day", from_date: str = None,
-                           to_date: str = None) -> List[Dict]:
+                           to_date: str = None) -> Optional[List[Dict]]:
         """
         Get historical OHLCV data
         Note: Alice Blue has limited historical data API
+
+        Returns None when the request failed (see BaseBroker.get_historical_data)
         """
         # Alice Blue's historical data API requires specific subscription
         # This is a placeholder implementation
@@ -431,20 +433,21 @@ class AliceBlueBroker(BaseBroker):
 
         result = self._make_request("POST", "/chart/history", payload)
 
-        if result.get('success') and result.get('data'):
-            candles = result['data']
-            formatted = []
-            for c in candles:
-                formatted.append({
-                    'timestamp': c.get('time'),
-                    'open': c.get('open'),
-                    'high': c.get('high'),
-                    'low': c.get('low'),
-                    'close': c.get('close'),
-                    'volume': c.get('volume')
-                })
-            return formatted
-        return []
+        if not result.get('success'):
+            logger.warning(f"Alice Blue historical data failed for {symbol}: {result.get('message')}")
+            return None
+
+        formatted = []
+        for c in result.get('data') or []:
+            formatted.append({
+                'timestamp': c.get('time'),
+                'open': c.get('open'),
+                'high': c.get('high'),
+                'low': c.get('low'),
+                'close': c.get('close'),
+                'volume': c.get('volume')
+            })
+        return formatted
 
     def get_profile(self) -> Dict:
         """Get user profile"""
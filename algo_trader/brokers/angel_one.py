@@ -15,6 +15,7 @@ except ImportError:
     pyotp = None
 
 from algo_trader.brokers.base import BaseBroker, BrokerOrder
+from algo_trader.data.rate_limit import RETRY_STATUS, RETRYABLE_ERRORS
 
 
 class AngelOneBroker(BaseBroker):
@@ -372,9 +373,11 @@ class AngelOneBroker(BaseBroker):
             return {}
 
     def get_historical_data(self, symbol: str, exchange: str,
-                           interval: str, from_date: str, to_date: str) -> List[Dict]:
+                           interval: str, from_date: str, to_date: str) -> Optional[List[Dict]]:
         """
         Get historical OHLCV data
+
+        Returns None when the request failed (see BaseBroker.get_historical_data)
         """
         try:
             url = f"{self.BASE_URL}/rest/secure/angelbroking/historical/v1/getCandleData"
@@ -402,26 +405,32 @@ class AngelOneBroker(BaseBroker):
             }
 
             response = self._session.post(url, json=data, headers=self._get_headers())
+            if response.status_code in RETRY_STATUS:
+                response.raise_for_status()  # Retried by call_with_retry
             result = response.json()
 
-            if result.get('status') and result.get('data'):
-                candles = result['data']
-                return [
-                    {
-                        'timestamp': c[0],
-                        'open': float(c[1]),
-                        'high': float(c[2]),
-                        'low': float(c[3]),
-                        'close': float(c[4]),
-                        'volume': int(c[5])
-                    }
-                    for c in candles
-                ]
-            return []
+            if not result.get('status'):
+                logger.warning(f"Angel One historical data failed for {symbol}: {result.get('message')}")
+                return None
+
+            candles = result.get('data') or []
+            return [
+                {
+                    'timestamp': c[0],
+                    'open': float(c[1]),
+                    'high': float(c[2]),
+                    'low': float(c[3]),
+                    'close': float(c[4]),
+                    'volume': int(c[5])
+                }
+                for c in candles
+            ]
 
+        except RETRYABLE_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Angel One get_historical_data error: {e}")
-            return []
+            return None
 
     def _get_symbol_token(self, symbol: str, exchange: str) -> str:
         """Get symbol token for a trading symbol"""
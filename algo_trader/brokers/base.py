@@ -131,10 +131,14 @@ class BaseBroker(ABC):
 
     @abstractmethod
     def get_historical_data(self, symbol: str, exchange: str,
-                           interval: str, from_date: str, to_date: str) -> List[Dict]:
+                           interval: str, from_date: str, to_date: str) -> Optional[List[Dict]]:
         """
         Get historical OHLCV data
         interval: 1minute, 5minute, 15minute, 30minute, 60minute, day
+
+        Returns an empty list only when the broker answered successfully with
+        no candles (holidays, weekends), and None when the request failed, so
+        callers never record a failed range as fetched.
         """
         pass
 
@@ -578,7 +578,7 @@ class MT5Broker(BaseBroker):
 
     def get_historical_data(self, symbol: str, exchange: str = None,
                            interval: str = '1d', from_date: str = None,
-                           to_date: str = None, days: int = 100) -> List[Dict]:
+                           to_date: str = None, days: int = 100) -> Optional[List[Dict]]:
         """
         Get historical OHLCV data
 
@@ -588,9 +588,12 @@ class MT5Broker(BaseBroker):
             from_date: Start date (YYYY-MM-DD)
             to_date: End date (YYYY-MM-DD)
             days: Number of days if from_date not specified
+
+        Returns:
+            Candles (empty when the range has none), or None when the request failed
         """
         if not self._check_connection():
-            return []
+            return None
 
         try:
             # Get timeframe
@@ -610,7 +613,10 @@ class MT5Broker(BaseBroker):
             # Get rates
             rates = mt5.copy_rates_range(symbol, timeframe, start, end)
 
-            if rates is None or len(rates) == 0:
+            if rates is None:
+                logger.warning(f"MT5 historical data failed for {symbol}: {mt5.last_error()}")
+                return None
+            if len(rates) == 0:
                 logger.warning(f"No data for {symbol}")
                 return []
 
@@ -630,7 +636,7 @@ class MT5Broker(BaseBroker):
 
         except Exception as e:
             logger.error(f"Error getting historical data: {e}")
-            return []
+            return None
 
     def get_symbols(self, group: str = None) -> List[Dict]:
         """
@@ -20,6 +20,7 @@ except ImportError:
     logger.warning("websockets package not installed - WebSocket features disabled")
 
 from .base import BaseBroker, BrokerOrder
+from algo_trader.data.rate_limit import RETRY_STATUS, RETRYABLE_ERRORS
 
 
 class UpstoxWebSocketManager:
@@ -217,6 +218,7 @@ class UpstoxBroker(BaseBroker):
         self.redirect_uri = redirect_uri
         self.ws_manager: Optional[UpstoxWebSocketManager] = None
         self._instrument_key_cache: Dict[str, str] = {}  # Cache for option instrument keys
+        self._session = requests.Session()  # Keep-alive connections for API requests
 
     def get_login_url(self) -> str:
         """Get Upstox OAuth login URL"""
@@ -297,8 +299,15 @@ class UpstoxBroker(BaseBroker):
             'Accept': 'application/json'
         }
 
-    def _make_request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
-        """Make authenticated API request"""
+    def _make_request(self, method: str, endpoint: str, data: Dict = None,
+                      raise_retryable: bool = False) -> Dict:
+        """
+        Make authenticated API request
+
+        With raise_retryable, 429/5xx responses, connection errors and
+        timeouts raise instead of returning a failure, so call_with_retry
+        can back off and try again.
+        """
         if not self.is_authenticated:
             return {'success': False, 'message': 'Not authenticated'}
 
@@ -307,16 +316,19 @@ class UpstoxBroker(BaseBroker):
 
         try:
             if method == "GET":
-                response = requests.get(url, headers=self._get_headers(), params=data)
+                response = self._session.get(url, headers=self._get_headers(), params=data)
             elif method == "POST":
-                response = requests.post(url, headers=self._get_headers(), json=data)
+                response = self._session.post(url, headers=self._get_headers(), json=data)
             elif method == "PUT":
-                response = requests.put(url, headers=self._get_headers(), json=data)
+                response = self._session.put(url, headers=self._get_headers(), json=data)
             elif method == "DELETE":
-                response = requests.delete(url, headers=self._get_headers())
+                response = self._session.delete(url, headers=self._get_headers())
             else:
                 return {'success': False, 'message': f'Unknown method: {method}'}
 
+            if raise_retryable and response.status_code in RETRY_STATUS:
+                response.raise_for_status()
+
             result = response.json()
             logger.debug(f"Upstox API response for {endpoint}: status={response.status_code}, data_keys={list(result.keys()) if isinstance(result, dict) else 'not_dict'}")
 
@@ -335,6 +347,8 @@ class UpstoxBroker(BaseBroker):
                 return {'success': False, 'message': error_msg}
 
         except Exception as e:
+            if raise_retryable and isinstance(e, RETRYABLE_ERRORS):
+                raise
             logger.error(f"Upstox API error: {e}")
             return {'success': False, 'message': str(e)}
 
@@ -661,10 +675,12 @@ class UpstoxBroker(BaseBroker):
 
     def get_historical_data(self, symbol: str, exchange: str = "NSE",
                            interval: str = "day", from_date: str = None,
-                           to_date: str = None) -> List[Dict]:
+                           to_date: str = None) -> Optional[List[Dict]]:
         """
         Get historical OHLCV data
         interval: 1minute, 5minute, 15minute, 30minute, 60minute, day, week, month
+
+        Returns None when the request failed (see BaseBroker.get_historical_data)
         """
         instrument = self._format_symbol(symbol, exchange)
 
@@ -690,23 +706,25 @@ class UpstoxBroker(BaseBroker):
         if to_date:
             params['to_date'] = to_date
 
-        result = self._make_request("GET", "/historical-candle/intraday", params)
+        result = self._make_request("GET", "/historical-candle/intraday", params, raise_retryable=True)
 
-        if result.get('success') and result.get('data'):
-            candles = result['data'].get('candles', [])
-            # Format candles
-            formatted = []
-            for c in candles:
-                formatted.append({
-                    'timestamp': c[0],
-                    'open': c[1],
-                    'high': c[2],
-                    'low': c[3],
-                    'close': c[4],
-                    'volume': c[5]
-                })
-            return formatted
-        return []
+        if not result.get('success'):
+            logger.warning(f"Upstox historical data failed for {symbol}: {result.get('message')}")
+            return None
+
+        candles = (result.get('data') or {}).get('candles', [])
+        # Format candles
+        formatted = []
+        for c in candles:
+            formatted.append({
+                'timestamp': c[0],
+                'open': c[1],
+                'high': c[2],
+                'low': c[3],
+                'close': c[4],
+                'volume': c[5]
+            })
+        return formatted
 
     def get_profile(self) -> Dict:
         """Get user profile"""
@@ -8,6 +8,7 @@ from datetime import datetime
 from loguru import logger
 
 from algo_trader.brokers.base import BaseBroker, BrokerOrder
+from algo_trader.data.rate_limit import RETRY_STATUS, RETRYABLE_ERRORS
 
 
 class ZerodhaBroker(BaseBroker):
@@ -325,12 +326,13 @@ class ZerodhaBroker(BaseBroker):
             return {}
 
     def get_historical_data(self, symbol: str, exchange: str,
-                           interval: str, from_date: str, to_date: str) -> List[Dict]:
+                           interval: str, from_date: str, to_date: str) -> Optional[List[Dict]]:
         """
         Get historical OHLCV data
 
         Note: Zerodha requires instrument_token for historical data.
-        This is a simplified implementation.
+        This is a simplified implementation. Returns None when the request
+        failed (see BaseBroker.get_historical_data).
         """
         try:
             # Map interval to Kite format
@@ -348,7 +350,7 @@ class ZerodhaBroker(BaseBroker):
             instrument_token = self._get_instrument_token(symbol, exchange)
             if not instrument_token:
                 logger.warning(f"Could not find instrument token for {symbol}")
-                return []
+                return None
 
             url = f"{self.BASE_URL}/instruments/historical/{instrument_token}/{kite_interval}"
             params = {
@@ -357,26 +359,32 @@ class ZerodhaBroker(BaseBroker):
             }
 
             response = self._session.get(url, params=params, headers=self._get_headers())
+            if response.status_code in RETRY_STATUS:
+                response.raise_for_status()  # Retried by call_with_retry
             result = response.json()
 
-            if result.get('status') == 'success':
-                candles = result.get('data', {}).get('candles', [])
-                return [
-                    {
-                        'timestamp': c[0],
-                        'open': c[1],
-                        'high': c[2],
-                        'low': c[3],
-                        'close': c[4],
-                        'volume': c[5]
-                    }
-                    for c in candles
-                ]
-            return []
+            if result.get('status') != 'success':
+                logger.warning(f"Zerodha historical data failed for {symbol}: {result.get('message')}")
+                return None
+
+            candles = (result.get('data') or {}).get('candles', [])
+            return [
+                {
+                    'timestamp': c[0],
+                    'open': c[1],
+                    'high': c[2],
+                    'low': c[3],
+                    'close': c[4],
+                    'volume': c[5]
+                }
+                for c in candles
+            ]
 
+        except RETRYABLE_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Zerodha get_historical_data error: {e}")
-            return []
+            return None
 
     def _get_instrument_token(self, symbol: str, exchange: str) -> Optional[int]:
         """Get instrument token for a symbol"""
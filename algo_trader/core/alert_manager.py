@@ -72,6 +72,7 @@ class AlertManager:
         self._thread = None
         self._price_feed = None
         self._lock = threading.Lock()
+        self.now: Callable[[], datetime] = datetime.now
 
         # Callbacks
         self.alert_callbacks: List[Callable] = []
@@ -294,7 +295,7 @@ class AlertManager:
 
     def trigger_alert(self, alert: Alert, current_value: float):
         """Handle alert trigger"""
-        alert.triggered_at = datetime.now()
+        alert.triggered_at = self.now()
 
         if not alert.repeat:
             alert.status = AlertStatus.TRIGGERED
@@ -65,6 +65,7 @@ class PaperTradingSimulator:
 
         self._order_counter = 0
         self._lock = threading.Lock()
+        self.now: Callable[[], datetime] = datetime.now
 
         # Callbacks
         self._order_callbacks: List[Callable] = []
@@ -93,7 +94,7 @@ class PaperTradingSimulator:
     def _generate_order_id(self) -> str:
         """Generate unique order ID"""
         self._order_counter += 1
-        return f"PAPER_{datetime.now().strftime('%Y%m%d')}_{self._order_counter:06d}"
+        return f"PAPER_{self.now().strftime('%Y%m%d')}_{self._order_counter:06d}"
 
     def _simulate_price(self, base_price: float, action: str) -> float:
         """Simulate execution price with slippage"""
@@ -145,6 +146,7 @@ class PaperTradingSimulator:
                 quantity=quantity,
                 order_type=order_type,
                 price=price,
+                timestamp=self.now(),
                 source=source
             )
 
@@ -170,7 +172,7 @@ class PaperTradingSimulator:
         executed_price = self._simulate_price(market_price, order.action)
         order.executed_price = executed_price
         order.status = OrderStatus.EXECUTED
-        order.executed_at = datetime.now()
+        order.executed_at = self.now()
 
         trade_value = executed_price * order.quantity
 
@@ -119,6 +119,7 @@ class RiskManager:
         self._thread = None
         self._price_feed = None
         self._broker = None  # Broker instance for executing square-off orders
+        self.now: Callable[[], datetime] = datetime.now
 
         # Risk settings
         self.max_loss_per_trade_percent = 2.0
@@ -181,7 +182,8 @@ class RiskManager:
             trailing_sl_percent=trailing_sl_percent,
             trailing_sl_points=trailing_sl_points,
             broker=broker,
-            order_id=order_id
+            order_id=order_id,
+            entry_time=self.now()
         )
 
         key = f"{exchange}:{symbol}"
@@ -352,7 +354,7 @@ class RiskManager:
 
     def get_mtm_summary(self) -> MTMSummary:
         """Get current MTM summary"""
-        summary = MTMSummary(date=date.today())
+        summary = MTMSummary(date=self.now().date())
 
         # Calculate unrealized P&L from open positions
         for position in self.positions.values():
@@ -370,7 +372,7 @@ class RiskManager:
             })
 
         # Calculate realized P&L from closed positions today
-        today = date.today()
+        today = summary.date
         for position in self.closed_positions:
             if position.entry_time.date() == today:
                 summary.realized_pnl += position.pnl
@@ -533,7 +535,7 @@ class RiskManager:
 
         settings = self.auto_square_off
         mtm = self.get_mtm_summary()
-        current_time = datetime.now().time()
+        current_time = self.now().time()
 
         # 1. Check time-based square-off
         if settings.square_off_time:
@@ -663,7 +665,7 @@ class RiskManager:
             'pnl_percent': position.pnl_percent,
             'reason': reason.value,
             'message': message,
-            'timestamp': datetime.now()
+            'timestamp': self.now()
         }
 
         for callback in self.square_off_callbacks:
@@ -677,7 +679,7 @@ class RiskManager:
         self._squared_off_today = False
         self._position_max_profits.clear()
         self.closed_positions = [p for p in self.closed_positions
-                                 if p.entry_time.date() != date.today()]
+                                 if p.entry_time.date() != self.now().date()]
         logger.info("Daily tracking reset")
 
     def get_auto_square_off_status(self) -> Dict:
@@ -1,16 +1,22 @@
 """
 Strategy Engine - Executes Pine Script strategies
 """
-from typing import Dict, List, Optional, Callable
+from typing import TYPE_CHECKING, Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 import threading
 import time
+import pandas as pd
 from loguru import logger
 
 from algo_trader.core.order_manager import OrderManager, Order, OrderType, TransactionType, Exchange
 from algo_trader.core.database import Database
+from algo_trader.data.bar_buffer import BarBuffer
+
+if TYPE_CHECKING:
+    from algo_trader.strategies.indicator_cache import IndicatorCache
+    from algo_trader.strategies.pine_interpreter import PineScriptInterpreter
 
 
 class SignalType(Enum):
@@ -47,6 +53,14 @@ class StrategyEngine:
         self.signal_callbacks = []  # List of callbacks to call on new signal
         self._running = False
         self._thread = None
+        self.now: Callable[[], datetime] = datetime.now
+
+        # Per-symbol state shared by all strategies trading that symbol
+        self._history: Dict[str, pd.DataFrame] = {}  # symbol -> OHLCV history (until live)
+        self._buffers: Dict[str, BarBuffer] = {}  # symbol -> live bars (history + candles)
+        self._indicator_caches: Dict[str, 'IndicatorCache'] = {}  # symbol -> shared indicator results
+        self._last_bar: Dict[str, object] = {}  # symbol -> time of the last bar processed
+        self._interpreters: Dict[Tuple[str, str], 'PineScriptInterpreter'] = {}  # (name, symbol) -> interpreter
 
     def register_signal_callback(self, callback: Callable[[Signal], None]):
         """Register a callback to be called when signals are generated"""
@@ -64,6 +78,7 @@ class StrategyEngine:
             strategy = parser.parse(pine_script)
 
             if strategy:
+                self._drop_interpreters(name)
                 self.active_strategies[name] = {
                     'parser': parser,
                     'strategy': strategy,
@@ -106,6 +121,7 @@ class StrategyEngine:
         """Remove a strategy"""
         if name in self.active_strategies:
             del self.active_strategies[name]
+            self._drop_interpreters(name)
             logger.info(f"Strategy '{name}' removed")
             return True
         return False
@@ -120,24 +136,115 @@ class StrategyEngine:
             for name, data in self.active_strategies.items()
         ]
 
+    def load_history(self, symbol: str, data: pd.DataFrame):
+        """
+        Set the OHLCV history strategies on `symbol` start from
+        Interpreters already running on the symbol are reloaded.
+        """
+        self._history[symbol] = data
+        self._buffers.pop(symbol, None)
+        self._last_bar.pop(symbol, None)
+        self._get_indicator_cache(symbol).clear()
+
+        for (name, sym), interpreter in self._interpreters.items():
+            if sym == symbol:
+                interpreter.load_data(data)
+
+    def _start_live(self, symbol: str, names: List[str]):
+        """
+        Move a symbol's history into one bar buffer shared by its strategies
+
+        The buffer holds the longest window any of them needs, so every
+        strategy sees the same bars and indicator results are shared.
+        """
+        interpreters = [self._get_interpreter(name, symbol) for name in names]
+        interpreters += [i for (_, sym), i in self._interpreters.items() if sym == symbol and i not in interpreters]
+
+        bars = BarBuffer(max(interpreter.buffer_capacity for interpreter in interpreters))
+        bars.load(self._history.pop(symbol))
+        self._buffers[symbol] = bars
+        for interpreter in interpreters:
+            interpreter.start_live(bars)
+
+    def _get_indicator_cache(self, symbol: str) -> 'IndicatorCache':
+        """Indicator cache shared by every strategy running on a symbol"""
+        if symbol not in self._indicator_caches:
+            from algo_trader.strategies.indicator_cache import IndicatorCache
+            self._indicator_caches[symbol] = IndicatorCache()
+        return self._indicator_caches[symbol]
+
+    def _get_interpreter(self, name: str, symbol: str) -> 'PineScriptInterpreter':
+        """Interpreter running strategy `name` on `symbol` (created on first use)"""
+        key = (name, symbol)
+        if key not in self._interpreters:
+            from algo_trader.strategies.pine_interpreter import PineScriptInterpreter
+
+            interpreter = PineScriptInterpreter(self.active_strategies[name]['strategy'],
+                                                indicator_cache=self._get_indicator_cache(symbol))
+            bars = self._buffers.get(symbol)
+            if bars is not None:
+                # Joining a live symbol: start from the shared buffer's current bars
+                if bars.capacity < interpreter.buffer_capacity:
+                    bars.resize(interpreter.buffer_capacity)
+                interpreter.load_data(bars.to_frame())
+                interpreter.start_live(bars)
+            elif symbol in self._history:
+                interpreter.load_data(self._history[symbol])
+            self._interpreters[key] = interpreter
+        return self._interpreters[key]
+
+    def _drop_interpreters(self, name: str):
+        for key in [k for k in self._interpreters if k[0] == name]:
+            self._interpreters.pop(key).stop_live()
+
+    def _start_bar(self, symbol: str, candle: Dict):
+        """Invalidate the symbol's shared indicator results when a new bar arrives"""
+        bar_time = candle.get('time')
+        if bar_time is None or self._last_bar.get(symbol) != bar_time:
+            self._get_indicator_cache(symbol).clear()
+        self._last_bar[symbol] = bar_time
+
+    def get_indicator_stats(self, symbol: str = None) -> Dict:
+        """Shared indicator cache hit/miss counters by symbol"""
+        symbols = [symbol] if symbol else list(self._indicator_caches)
+        return {s: self._indicator_caches[s].stats() for s in symbols if s in self._indicator_caches}
+
     def process_candle(self, symbol: str, candle: Dict) -> List[Signal]:
         """
         Process a new candle through all enabled strategies
         Returns list of signals generated
+
+        Strategies on the same symbol share indicator results: each
+        distinct indicator is computed once per bar.
         """
         signals = []
-
-        for name, data in self.active_strategies.items():
-            if not data['enabled']:
-                continue
-
+        names = [name for name, data in self.active_strategies.items() if data['enabled']]
+        if not names:
+            return signals
+        self._start_bar(symbol, candle)
+
+        bars = self._buffers.get(symbol)
+        if bars is None:
+            if symbol not in self._history:
+                # No history loaded: the first candle seeds it
+                self.load_history(symbol, pd.DataFrame([candle], index=[candle.get('time', self.now())]))
+                return signals
+            self._start_live(symbol, names)
+            bars = self._buffers[symbol]
+
+        # Append the candle once; every strategy evaluates the same window
+        bars.append(candle.get('time', self.now()), candle['open'], candle['high'],
+                    candle['low'], candle['close'], candle['volume'])
+        window = bars.to_frame()
+
+        for name in names:
             try:
-                strategy = data['strategy']
-                signal = strategy.process_candle(symbol, candle)
+                interpreter = self._get_interpreter(name, symbol)
+                signal = interpreter.evaluate_bar(symbol, window)
 
                 if signal and signal.signal_type != SignalType.NONE:
                     signal.strategy_name = name
-                    signal.timestamp = datetime.now()
+                    signal.timestamp = self.now()
                     signals.append(signal)
 
                     # Notify callbacks
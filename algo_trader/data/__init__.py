@@ -1,2 +1,8 @@
 # Data modules
 from algo_trader.data.historical import HistoricalDataManager
+from algo_trader.data.rate_limit import TokenBucket, RateLimiters
+from algo_trader.data.resample import resample_bars, ResampleCache
+from algo_trader.data.bars import Bars
+from algo_trader.data.store import MarketDataStore
+from algo_trader.data.backfill import Backfill, BackfillReport, plan_windows
+from algo_trader.data.synthetic import SyntheticMarket
@@ -0,0 +1,195 @@
+"""
+Backfill
+Splits long history requests into broker-sized windows and fetches them concurrently
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Tuple, Union
+from loguru import logger
+
+
+# Longest date range (days) each broker serves per historical request, by interval
+MAX_DAYS_PER_REQUEST: Dict[str, Dict[str, int]] = {
+    'upstox': {'1minute': 30, '5minute': 30, '15minute': 30, '30minute': 30,
+               '60minute': 90, 'day': 3650, 'week': 3650, 'month': 3650},
+    'angelone': {'1minute': 30, '3minute': 60, '5minute': 100, '10minute': 100, '15minute': 200,
+                 '30minute': 200, '60minute': 400, 'day': 2000},
+    'zerodha': {'1minute': 60, '3minute': 100, '5minute': 100, '10minute': 100, '15minute': 200,
+                '30minute': 200, '60minute': 400, 'day': 2000},
+}
+DEFAULT_MAX_DAYS = {'1minute': 30, 'day': 365}
+FALLBACK_MAX_DAYS = 30
+
+
+def max_days_per_request(source: str, interval: str) -> int:
+    """Request window for a broker and interval (conservative default for unknown ones)"""
+    limits = MAX_DAYS_PER_REQUEST.get(source.lower(), DEFAULT_MAX_DAYS)
+    return limits.get(interval, DEFAULT_MAX_DAYS.get(interval, FALLBACK_MAX_DAYS))
+
+
+def plan_windows(start: Union[date, datetime], end: Union[date, datetime],
+                 max_days: int) -> List[Tuple[date, date]]:
+    """
+    Split [start, end) into consecutive inclusive date windows of at most `max_days` days
+
+    The end is exclusive: a range ending at midnight (or on a date) stops
+    the day before, one ending later in the day includes that day.
+    """
+    if max_days < 1:
+        raise ValueError("max_days must be at least 1")
+    start = start.date() if isinstance(start, datetime) else start
+    if isinstance(end, datetime) and end.time() != datetime.min.time():
+        end = end.date()
+    else:
+        end = (end.date() if isinstance(end, datetime) else end) - timedelta(days=1)
+
+    windows = []
+    cursor = start
+    while cursor <= end:
+        window_end = min(cursor + timedelta(days=max_days - 1), end)
+        windows.append((cursor, window_end))
+        cursor = window_end + timedelta(days=1)
+    return windows
+
+
+@dataclass
+class BackfillReport:
+    """Outcome of a backfill run"""
+    chunks: int = 0          # Windows that needed fetching
+    skipped: int = 0         # Symbols already fully cached
+    fetched: int = 0         # Windows fetched and merged into the cache (including empty ones)
+    rows: int = 0
+    failed: List[Tuple[str, date, date]] = field(default_factory=list)  # (symbol, from, to)
+    rows_by_symbol: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed
+
+
+class Backfill:
+    """
+    Fills the HistoricalDataManager cache for many symbols over a long range
+
+    The missing parts of [start, end] for each symbol are split into the
+    broker's per-request window and fetched on a thread pool; every request
+    goes through the manager's per-source rate limiter and retries. Each
+    window is merged into the cache (de-duplicated by time) and recorded as
+    covered as soon as it arrives, so the cache coverage is the checkpoint:
+    running the same backfill again after a failure or interruption fetches
+    only the windows that did not complete.
+    """
+
+    def __init__(self, data_manager, broker: str = None, max_workers: int = 4):
+        if not data_manager.brokers:
+            raise ValueError("Backfill needs a broker registered with the data manager")
+        self.data_manager = data_manager
+        self.broker = broker or list(data_manager.brokers.keys())[0]
+        if self.broker not in data_manager.brokers:
+            raise ValueError(f"Broker not registered: {self.broker}")
+        self.source = getattr(data_manager.brokers[self.broker], 'broker_name', self.broker)
+        self.max_workers = max_workers
+        self._running = False
+
+    def plan(self, symbols: List[str], exchange: str, interval: str,
+             start: datetime, end: datetime, max_days: int = None) -> List[Tuple[str, date, date]]:
+        """(symbol, from_date, to_date) requests still needed to cover [start, end]"""
+        max_days = max_days or max_days_per_request(self.source, interval)
+        # A tail fetched up to 'now' recently is not fetched again
+        max_age = self.data_manager.cache_max_age(interval)
+        jobs = []
+        for symbol in dict.fromkeys(symbols):
+            ranges = self.data_manager.get_cached_ranges(symbol, exchange, interval)
+            for gap_start, gap_end in self.data_manager._missing_ranges(ranges, start, end, max_age):
+                jobs.extend((symbol, a, b) for a, b in plan_windows(gap_start, gap_end, max_days))
+        return jobs
+
+    def run(self, symbols: List[str], exchange: str = "NSE", interval: str = "1minute",
+            start: datetime = None, end: datetime = None, days: int = 365,
+            max_days: int = None,
+            progress_callback: Callable[[int, int, str], None] = None) -> BackfillReport:
+        """
+        Backfill `symbols` over [start, end] (default: the last `days` days)
+
+        Args:
+            max_days: Request window override (default: the broker's limit for `interval`)
+            progress_callback: Called with (windows done, windows total, symbol)
+
+        Returns:
+            BackfillReport; windows listed in `failed` (broker requests that
+            failed, or were skipped by stop()) are retried by the next run
+        """
+        end = end or datetime.now()
+        start = start or datetime.combine((end - timedelta(days=days)).date(), datetime.min.time())
+
+        jobs = self.plan(symbols, exchange, interval, start, end, max_days)
+        report = BackfillReport(chunks=len(jobs))
+        report.skipped = len(set(symbols) - {symbol for symbol, _, _ in jobs})
+        if not jobs:
+            logger.info(f"Backfill: {len(symbols)} symbols already cached")
+            return report
+
+        logger.info(f"Backfill: {len(jobs)} requests for {len(symbols)} symbols "
+                    f"({interval}, {start:%Y-%m-%d} to {end:%Y-%m-%d}, {self.max_workers} workers)")
+
+        self._running = True
+        lock = threading.Lock()
+        done = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            futures = {pool.submit(self._fetch_window, job, exchange, interval, end): job for job in jobs}
+            for future in as_completed(futures):
+                symbol, from_date, to_date = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    logger.error(f"Backfill {symbol} {from_date} to {to_date} failed: {e}")
+                    rows = None
+
+                with lock:
+                    done += 1
+                    if rows is None:
+                        report.failed.append((symbol, from_date, to_date))
+                    else:
+                        report.fetched += 1
+                        report.rows += rows
+                        report.rows_by_symbol[symbol] = report.rows_by_symbol.get(symbol, 0) + rows
+
+                if progress_callback:
+                    progress_callback(done, len(jobs), symbol)
+
+        self._running = False
+        logger.info(f"Backfill complete: {report.fetched}/{report.chunks} requests, {report.rows} rows, "
+                    f"{len(report.failed)} failed")
+        return report
+
+    def stop(self):
+        """Skip the windows not yet started (they stay missing for the next run)"""
+        self._running = False
+
+    def _fetch_window(self, job: Tuple[str, date, date], exchange: str, interval: str,
+                      end: datetime):
+        """
+        Fetch one window and merge it into the cache; rows stored, or None if it failed
+
+        A confirmed empty answer (holidays, no trading) is still recorded as
+        covered; a failed request (or one skipped by stop()) records nothing.
+        """
+        if not self._running:
+            return None
+
+        symbol, from_date, to_date = job
+        from_dt = datetime.combine(from_date, datetime.min.time())
+        to_dt = datetime.combine(to_date, datetime.min.time())
+
+        df = self.data_manager.fetch_broker_range(symbol, exchange, interval, from_dt, to_dt, self.broker)
+        if df is None:
+            logger.warning(f"Backfill {symbol} {from_date} to {to_date}: broker request failed")
+            return None
+
+        # The window covers whole days, except today which is only covered up to `end`
+        covered_until = min(to_dt + timedelta(days=1), end)
+        self.data_manager.add_to_cache(df, symbol, exchange, interval, (from_dt, covered_until))
+        return len(df)
@@ -0,0 +1,148 @@
+"""
+Bar Buffer
+Fixed-capacity ring buffer of OHLCV bars for live strategy execution
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable, Any
+
+
+class BarBuffer:
+    """
+    Preallocated NumPy ring buffer holding the last `capacity` bars
+
+    Every value is written twice (at i and i + capacity) so the
+    chronological window is always a contiguous, zero-copy slice.
+    Extra columns (e.g. indicator outputs) roll together with the bars.
+    """
+
+    PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("BarBuffer capacity must be at least 1")
+
+        self.capacity = capacity
+        self._columns: Dict[Hashable, np.ndarray] = {
+            name: np.full(2 * capacity, np.nan) for name in self.PRICE_COLUMNS
+        }
+        self._times = np.empty(2 * capacity, dtype=object)
+        self._next = 0  # Slot the next bar is written to
+        self._size = 0
+        self.total = 0  # Bars appended since creation
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_column(self, name: Hashable):
+        """Add an extra float column (filled with NaN)"""
+        if name not in self._columns:
+            self._columns[name] = np.full(2 * self.capacity, np.nan)
+
+    def has_column(self, name: Hashable) -> bool:
+        return name in self._columns
+
+    def remove_column(self, name: Hashable):
+        """Drop an extra column (price columns are kept)"""
+        if name not in self.PRICE_COLUMNS:
+            self._columns.pop(name, None)
+
+    def resize(self, capacity: int):
+        """Change the capacity, keeping the most recent bars that fit"""
+        if capacity < 1:
+            raise ValueError("BarBuffer capacity must be at least 1")
+
+        size = min(self._size, capacity)
+        drop = self._size - size
+        columns = {name: self.view(name)[drop:].copy() for name in self._columns}
+        times = self.times()[drop:].copy()
+
+        self.capacity = capacity
+        self._columns = {name: np.full(2 * capacity, np.nan) for name in columns}
+        self._times = np.empty(2 * capacity, dtype=object)
+        for name, values in columns.items():
+            self._columns[name][:size] = values
+            self._columns[name][capacity:capacity + size] = values
+        self._times[:size] = times
+        self._times[capacity:capacity + size] = times
+        self._next = size % capacity
+        self._size = size
+
+    def append(self, time: Any, open: float, high: float, low: float,
+               close: float, volume: float):
+        """Append a bar, overwriting the oldest one when full"""
+        slot = self._next
+        mirror = slot + self.capacity
+        values = {'open': open, 'high': high, 'low': low, 'close': close, 'volume': volume}
+
+        for name, column in self._columns.items():
+            value = values.get(name, np.nan)
+            column[slot] = value
+            column[mirror] = value
+        self._times[slot] = time
+        self._times[mirror] = time
+
+        self._next = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.total += 1
+
+    def load(self, data: pd.DataFrame):
+        """Bulk-append the last `capacity` rows of an OHLCV DataFrame"""
+        tail = data.iloc[-self.capacity:]
+        columns = [tail[name].to_numpy(dtype=float) for name in self.PRICE_COLUMNS]
+        times = tail.index
+
+        for i in range(len(tail)):
+            self.append(times[i], *(column[i] for column in columns))
+
+        # Bars dropped by the capacity limit still count towards the total
+        self.total += len(data) - len(tail)
+
+    def set_last(self, name: Hashable, value: float):
+        """Set a column value for the most recent bar"""
+        slot = (self._next - 1) % self.capacity
+        column = self._columns[name]
+        column[slot] = value
+        column[slot + self.capacity] = value
+
+    def load_column(self, name: Hashable, values: np.ndarray):
+        """Fill a column with values aligned to the most recent bars"""
+        self.add_column(name)
+        values = np.asarray(values, dtype=float)[-self._size:]
+        offset = self._size - len(values)
+        for i, value in enumerate(values):
+            slot = (self._start() + offset + i) % self.capacity
+            self._columns[name][slot] = value
+            self._columns[name][slot + self.capacity] = value
+
+    def _start(self) -> int:
+        return self._next if self._size == self.capacity else 0
+
+    def view(self, name: Hashable) -> np.ndarray:
+        """Chronological zero-copy view of a column"""
+        start = self._start()
+        return self._columns[name][start:start + self._size]
+
+    def times(self) -> np.ndarray:
+        """Chronological view of bar timestamps"""
+        start = self._start()
+        return self._times[start:start + self._size]
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame of the buffered window with Pine Script price sources"""
+        open_ = self.view('open')
+        high = self.view('high')
+        low = self.view('low')
+        close = self.view('close')
+
+        return pd.DataFrame({
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': self.view('volume'),
+            'hl2': (high + low) / 2,
+            'hlc3': (high + low + close) / 3,
+            'ohlc4': (open_ + high + low + close) / 4,
+            'hlcc4': (high + low + 2 * close) / 4,
+        }, index=pd.Index(self.times()))
@@ -2,14 +2,22 @@
 Historical Data Manager
 Fetches and caches historical OHLCV data from brokers and Yahoo Finance
 """
+import numpy as np
 import pandas as pd
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Callable, Iterator, Tuple
 from pathlib import Path
 import json
+import threading
 from loguru import logger
 
+from algo_trader.data.rate_limit import RATE_LIMITERS, RateLimiters, pooled_session, call_with_retry
+from algo_trader.data.resample import ResampleCache
+from algo_trader.data.bars import Bars
+from algo_trader.data.store import MarketDataStore
+from algo_trader.data.synthetic import SyntheticMarket
+
 
 # Yahoo Finance symbol mapping for Indian stocks
 NSE_SUFFIX = ".NS"
@@ -18,6 +26,8 @@ INDEX_SYMBOLS = {
     'NIFTY': '^NSEI', 'NIFTY50': '^NSEI',
     'BANKNIFTY': '^NSEBANK', 'SENSEX': '^BSESN',
 }
+YAHOO_EXCHANGE = "YAHOO"  # Cache namespace for Yahoo Finance downloads
+IST = "Asia/Kolkata"
 
 
 class HistoricalDataManager:
@@ -25,10 +35,18 @@ class HistoricalDataManager:
     Manages historical data fetching and caching
     """
 
-    def __init__(self, cache_dir: str = None):
+    def __init__(self, cache_dir: str = None, store: MarketDataStore = None,
+                 rate_limiters: RateLimiters = None):
         self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".algo_trader" / "data_cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.brokers = {}
+        # Per-source token buckets, process-wide unless given: limits apply across all managers
+        self.rate_limiters = rate_limiters or RATE_LIMITERS
+        self._session = pooled_session()  # Keep-alive connections for Yahoo Finance
+        self._resampled = ResampleCache()  # Higher timeframes derived from cached base intervals
+        # Cached bars live in a partitioned store; float64 keeps cached prices exact
+        self.store = store or MarketDataStore(self.cache_dir / "store", price_dtype=np.float64)
+        self._cache_lock = threading.Lock()  # Serializes coverage updates from concurrent backfill chunks
 
     def register_broker(self, name: str, broker_instance):
         """Register a broker for data fetching"""
@@ -51,48 +69,126 @@ class HistoricalDataManager:
         Returns:
             DataFrame with columns: open, high, low, close, volume, datetime
         """
-        # Try cache first
-        cached_data = self._load_from_cache(symbol, exchange, interval, days)
-        if cached_data is not None:
-            logger.info(f"Loaded {symbol} data from cache")
-            return cached_data
+        end = datetime.now()
+        start = datetime.combine((end - timedelta(days=days)).date(), datetime.min.time())
 
-        # Fetch from broker
         broker_name = broker or (list(self.brokers.keys())[0] if self.brokers else None)
-
         if not broker_name or broker_name not in self.brokers:
+            cached = self.load_cached(symbol, exchange, interval, start, end)
+            if cached is not None and len(cached):
+                logger.info(f"Loaded {symbol} data from cache (no broker available)")
+                return cached
             logger.warning("No broker available for historical data")
             return self._get_sample_data(symbol, days)
 
-        try:
-            broker_instance = self.brokers[broker_name]
-            end_date = datetime.now().strftime("%Y-%m-%d")
-            start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        def fetch(from_dt: datetime, to_dt: datetime) -> Optional[pd.DataFrame]:
+            return self.fetch_broker_range(symbol, exchange, interval, from_dt, to_dt, broker_name)
+
+        df = self._get_incremental(symbol, exchange, interval, start, end, fetch)
+        if df is not None and len(df):
+            return df
 
-            candles = broker_instance.get_historical_data(
+        # Return sample data as fallback
+        return self._get_sample_data(symbol, days)
+
+    def fetch_broker_range(self, symbol: str, exchange: str, interval: str,
+                           from_dt: datetime, to_dt: datetime, broker: str = None) -> Optional[pd.DataFrame]:
+        """
+        One rate-limited, retried broker request for [from_dt, to_dt] (dates, inclusive)
+
+        Bypasses the cache. Returns a datetime-indexed OHLCV frame - empty when
+        the broker confirmed the range has no bars - or None when the broker
+        request failed, so the range is not recorded as fetched.
+        """
+        broker_name = broker or (list(self.brokers.keys())[0] if self.brokers else None)
+        if not broker_name or broker_name not in self.brokers:
+            raise ValueError(f"Broker not registered: {broker_name}")
+
+        broker_instance = self.brokers[broker_name]
+        source = getattr(broker_instance, 'broker_name', broker_name)
+
+        def request():
+            self.rate_limiters.acquire(source)
+            return broker_instance.get_historical_data(
                 symbol=symbol,
                 exchange=exchange,
                 interval=interval,
-                from_date=start_date,
-                to_date=end_date
+                from_date=from_dt.strftime("%Y-%m-%d"),
+                to_date=to_dt.strftime("%Y-%m-%d")
             )
 
-            if candles:
-                df = pd.DataFrame(candles)
-                df['datetime'] = pd.to_datetime(df['timestamp'])
-                df = df.set_index('datetime')
-                df = df[['open', 'high', 'low', 'close', 'volume']]
-
-                # Cache the data
-                self._save_to_cache(df, symbol, exchange, interval)
+        candles = call_with_retry(request, label=f"{source} {symbol}")
+        if candles is None:
+            return None
+        if not candles:
+            return self._empty_frame()
+        df = pd.DataFrame(candles)
+        df['datetime'] = pd.to_datetime(df['timestamp'])
+        df = df.set_index('datetime')
+        return df[['open', 'high', 'low', 'close', 'volume']]
+
+    def get_bars(self, symbol: str, exchange: str = "NSE", interval: str = "day",
+                 days: int = 365, broker: str = None) -> Optional[Bars]:
+        """get_historical_data as compact columnar Bars"""
+        df = self.get_historical_data(symbol, exchange, interval, days, broker)
+        return Bars.from_frame(df) if df is not None else None
+
+    def iter_historical_data_many(self, symbols: List[str], exchange: str = "NSE",
+                                  interval: str = "day", days: int = 365, broker: str = None,
+                                  max_workers: int = 8) -> Iterator[Tuple[str, Optional[pd.DataFrame]]]:
+        """
+        Fetch history for many symbols concurrently, yielding (symbol, data) as each completes
 
-                return df
+        Requests share the per-source rate limit and pooled connections, so
+        `max_workers` only bounds how many symbols are in flight.
+        """
+        return self._fetch_many(
+            symbols, lambda symbol: self.get_historical_data(symbol, exchange, interval, days, broker),
+            max_workers)
+
+    def get_historical_data_many(self, symbols: List[str], exchange: str = "NSE",
+                                 interval: str = "day", days: int = 365, broker: str = None,
+                                 max_workers: int = 8,
+                                 callback: Callable[[str, Optional[pd.DataFrame]], None] = None
+                                 ) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Get historical OHLCV data for many symbols concurrently
 
-        except Exception as e:
-            logger.error(f"Error fetching historical data: {e}")
+        Args:
+            symbols: Stock symbols
+            exchange, interval, days, broker: As for get_historical_data
+            max_workers: Symbols fetched in parallel
+            callback: Called with (symbol, data) as each symbol completes
 
-        # Return sample data as fallback
-        return self._get_sample_data(symbol, days)
+        Returns:
+            Dict of symbol -> DataFrame (None if the fetch failed)
+        """
+        results = {}
+        for symbol, df in self.iter_historical_data_many(symbols, exchange, interval, days,
+                                                         broker, max_workers):
+            results[symbol] = df
+            if callback:
+                callback(symbol, df)
+        return results
+
+    def _fetch_many(self, symbols: List[str], fetch: Callable[[str], Optional[pd.DataFrame]],
+                    max_workers: int) -> Iterator[Tuple[str, Optional[pd.DataFrame]]]:
+        """Run `fetch(symbol)` on a thread pool, yielding results in completion order"""
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return
+
+        logger.info(f"Fetching history for {len(symbols)} symbols ({max_workers} workers)")
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as pool:
+            futures = {pool.submit(fetch, symbol): symbol for symbol in symbols}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching historical data for {symbol}: {e}")
+                    df = None
+                yield symbol, df
 
     def _get_cache_key(self, symbol: str, exchange: str, interval: str) -> str:
         """Generate cache key"""
@@ -102,120 +198,220 @@ class HistoricalDataManager:
         """Get cache file path"""
         return self.cache_dir / f"{cache_key}.parquet"
 
-    def _load_from_cache(self, symbol: str, exchange: str, interval: str, days: int) -> Optional[pd.DataFrame]:
-        """Load data from cache if valid"""
-        cache_key = self._get_cache_key(symbol, exchange, interval)
-        cache_path = self._get_cache_path(cache_key)
-        meta_path = self.cache_dir / f"{cache_key}_meta.json"
+    def _get_meta_path(self, cache_key: str) -> Path:
+        """Get cache metadata file path"""
+        return self.cache_dir / f"{cache_key}_meta.json"
 
-        if not cache_path.exists() or not meta_path.exists():
-            return None
+    def _get_incremental(self, symbol: str, exchange: str, interval: str,
+                         start: datetime, end: datetime, fetch) -> Optional[pd.DataFrame]:
+        """
+        Serve [start, end] from the cache, fetching only the ranges it does not cover
+
+        The cache remembers which time ranges have been fetched (not just which
+        bars exist, so holidays and weekends are not asked for again). Missing
+        ranges - usually just the tail since the last run - are fetched with
+        `fetch(from_dt, to_dt)` (date granular), appended to the store and
+        recorded as covered. `fetch` returns an empty frame for a range that has
+        no bars, which is recorded as covered too, and None when it failed,
+        which is left for the next call. A tail younger than the cache max age
+        (1 hour intraday, 24 hours daily) is treated as fresh.
+        """
+        ranges = self.get_cached_ranges(symbol, exchange, interval)
+        gaps = self._missing_ranges(ranges, start, end, self.cache_max_age(interval))
+
+        fetched = []
+        covered = []
+        for gap_start, gap_end in gaps:
+            try:
+                df = fetch(gap_start, gap_end)
+            except Exception as e:
+                logger.error(f"Error fetching historical data: {e}")
+                continue
+            if df is None:
+                continue
+            if not df.empty:
+                fetched.append(df)
+            # Fetches are by calendar date, so the whole first day is covered
+            covered.append((datetime.combine(gap_start.date(), datetime.min.time()), gap_end))
+
+        if covered:
+            df = self._merge_frames(fetched) if fetched else self._empty_frame()
+            with self._cache_lock:
+                ranges = self.get_cached_ranges(symbol, exchange, interval) + covered
+                self._save_to_cache(df, symbol, exchange, interval, ranges)
+            logger.info(f"Fetched {sum(len(df) for df in fetched)} new rows for {symbol} "
+                        f"in {len(covered)} range(s)")
+        elif ranges and not gaps:
+            logger.info(f"Loaded {symbol} data from cache")
 
-        try:
-            # Check cache validity
-            with open(meta_path, 'r') as f:
-                meta = json.load(f)
+        return self.load_cached(symbol, exchange, interval, start, end)
 
-            cached_date = datetime.fromisoformat(meta.get('cached_at', '2000-01-01'))
-            cache_age = (datetime.now() - cached_date).total_seconds() / 3600  # hours
+    @staticmethod
+    def cache_max_age(interval: str) -> timedelta:
+        """How long a cached tail up to 'now' counts as fresh"""
+        return timedelta(hours=24 if interval in ('day', '1d') else 1)
 
-            # Cache valid for 24 hours for daily data, 1 hour for intraday
-            max_age = 24 if interval == 'day' else 1
+    @staticmethod
+    def _missing_ranges(ranges: List, start: datetime, end: datetime,
+                        max_age: timedelta = timedelta(0)) -> List:
+        """Parts of [start, end] not covered by the (start, end) tuples in `ranges`"""
+        gaps = []
+        cursor = start
+        for range_start, range_end in sorted(ranges):
+            if range_end <= cursor:
+                continue
+            if range_start > end:
+                break
+            if range_start > cursor:
+                gaps.append((cursor, range_start))
+            cursor = max(cursor, range_end)
+        if cursor < end and end - cursor > max_age:
+            gaps.append((cursor, end))
+        return gaps
 
-            if cache_age > max_age:
-                return None
+    @staticmethod
+    def _merge_ranges(ranges: List) -> List:
+        """Coalesce overlapping or touching (start, end) ranges"""
+        merged = []
+        for range_start, range_end in sorted(ranges):
+            if merged and range_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+        return merged
+
+    @staticmethod
+    def _empty_frame() -> pd.DataFrame:
+        """A datetime-indexed OHLCV frame with no bars"""
+        return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'], dtype=float,
+                            index=pd.DatetimeIndex([], name='datetime'))
+
+    @staticmethod
+    def _merge_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatenate bar frames; later frames win on duplicate timestamps (refetched partial bars)"""
+        df = pd.concat(frames)
+        df = df[~df.index.duplicated(keep='last')]
+        return df.sort_index()
+
+    def _migrate_legacy_cache(self, symbol: str, exchange: str, interval: str):
+        """Move a flat `{exchange}_{symbol}_{interval}.parquet` cache file into the store"""
+        cache_key = self._get_cache_key(symbol, exchange, interval)
+        cache_path = self._get_cache_path(cache_key)
+        meta_path = self._get_meta_path(cache_key)
+
+        if not cache_path.exists():
+            return
 
-            # Load data
+        try:
             df = pd.read_parquet(cache_path)
-            return df
 
+            meta = {}
+            if meta_path.exists():
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+
+            if 'ranges' in meta:
+                ranges = [(datetime.fromisoformat(a), datetime.fromisoformat(b)) for a, b in meta['ranges']]
+            elif len(df):
+                # Cache written before coverage was tracked: it covers its own data up to when it was saved
+                first = pd.Timestamp(df.index.min()).tz_localize(None).to_pydatetime()
+                cached_at = datetime.fromisoformat(meta.get('cached_at', first.isoformat()))
+                ranges = [(first, cached_at)]
+            else:
+                ranges = []
+
+            self._save_to_cache(df, symbol, exchange, interval, ranges)
+            cache_path.unlink()
+            if meta_path.exists():
+                meta_path.unlink()
+            logger.info(f"Moved {cache_key} cache into the market data store")
+
+        except Exception as e:
+            logger.error(f"Error migrating cache: {e}")
+
+    def load_cached(self, symbol: str, exchange: str = "NSE", interval: str = "1minute",
+                    start: datetime = None, end: datetime = None) -> Optional[pd.DataFrame]:
+        """Cached history regardless of age, optionally sliced to [start, end] (None if never cached)"""
+        self._migrate_legacy_cache(symbol, exchange, interval)
+        try:
+            return self.store.read_frame(exchange, symbol, interval, start, end)
         except Exception as e:
             logger.error(f"Error loading cache: {e}")
             return None
 
-    def _save_to_cache(self, df: pd.DataFrame, symbol: str, exchange: str, interval: str):
-        """Save data to cache"""
+    def load_cached_bars(self, symbol: str, exchange: str = "NSE", interval: str = "1minute",
+                         start: datetime = None, end: datetime = None) -> Optional[Bars]:
+        """Cached history as memory-mapped Bars (no float64 copy)"""
+        self._migrate_legacy_cache(symbol, exchange, interval)
+        return self.store.read(exchange, symbol, interval, start, end)
+
+    def get_cached_ranges(self, symbol: str, exchange: str = "NSE", interval: str = "day") -> List:
+        """Time ranges (start, end) already fetched into the cache"""
+        self._migrate_legacy_cache(symbol, exchange, interval)
+        meta = self.store.get_meta(exchange, symbol, interval)
+        return [(datetime.fromisoformat(a), datetime.fromisoformat(b)) for a, b in meta.get('ranges', [])]
+
+    def _save_to_cache(self, df: pd.DataFrame, symbol: str, exchange: str, interval: str,
+                       ranges: List = None):
+        """Append bars to the store and record the ranges they cover"""
         try:
-            cache_key = self._get_cache_key(symbol, exchange, interval)
-            cache_path = self._get_cache_path(cache_key)
-            meta_path = self.cache_dir / f"{cache_key}_meta.json"
-
-            # Save data
-            df.to_parquet(cache_path)
-
-            # Save metadata
+            ranges = self._merge_ranges(ranges or [])
             meta = {
-                'symbol': symbol,
-                'exchange': exchange,
-                'interval': interval,
                 'cached_at': datetime.now().isoformat(),
-                'rows': len(df)
+                'ranges': [[a.isoformat(), b.isoformat()] for a, b in ranges]
             }
-            with open(meta_path, 'w') as f:
-                json.dump(meta, f)
-
+            self.store.append(exchange, symbol, interval, df[['open', 'high', 'low', 'close', 'volume']], meta)
             logger.info(f"Cached {len(df)} rows for {symbol}")
 
         except Exception as e:
             logger.error(f"Error saving cache: {e}")
 
+    def add_to_cache(self, df: pd.DataFrame, symbol: str, exchange: str, interval: str,
+                     covered: Tuple[datetime, datetime]):
+        """
+        Merge bars fetched outside get_historical_data into the cache, marking `covered` as fetched
+
+        `df` may be None or empty to record a range that has no bars (holidays).
+        """
+        if df is None:
+            df = self._empty_frame()
+        with self._cache_lock:
+            ranges = self.get_cached_ranges(symbol, exchange, interval)
+            self._save_to_cache(df, symbol, exchange, interval, ranges + [covered])
+
     def _get_sample_data(self, symbol: str, days: int) -> pd.DataFrame:
         """Generate sample data for testing when no broker is available"""
-        import numpy as np
-
         logger.info(f"Generating sample data for {symbol} ({days} days)")
 
-        dates = pd.date_range(end=pd.Timestamp.now(), periods=days, freq='D')
-
-        # Generate realistic-looking price data
-        np.random.seed(hash(symbol) % 2**32)  # Consistent data for same symbol
-
-        # Start price based on symbol
-        if 'NIFTY' in symbol.upper():
-            base_price = 18000
-        elif 'BANK' in symbol.upper():
-            base_price = 42000
-        else:
-            base_price = 1000 + (hash(symbol) % 4000)
-
-        # Generate returns
-        returns = np.random.randn(days) * 0.015  # 1.5% daily volatility
-        prices = base_price * np.exp(np.cumsum(returns))
-
-        # Generate OHLCV
-        df = pd.DataFrame({
-            'open': prices * (1 + np.random.randn(days) * 0.005),
-            'high': prices * (1 + np.abs(np.random.randn(days) * 0.01)),
-            'low': prices * (1 - np.abs(np.random.randn(days) * 0.01)),
-            'close': prices,
-            'volume': np.random.randint(100000, 10000000, days)
-        }, index=dates)
-
-        # Ensure high >= close, open and low <= close, open
-        df['high'] = df[['open', 'high', 'close']].max(axis=1)
-        df['low'] = df[['open', 'low', 'close']].min(axis=1)
-
-        return df
+        # Deterministic across runs: same symbol, same data
+        return SyntheticMarket().daily_bars(symbol, days)
 
     def clear_cache(self, symbol: str = None, exchange: str = None):
         """Clear cached data"""
         if symbol and exchange:
             # Clear specific symbol
-            for interval in ['1minute', '5minute', '15minute', '30minute', '60minute', 'day']:
+            for interval in ['1minute', '5minute', '15minute', '30minute', '60minute', 'day',
+                             '1m', '5m', '15m', '30m', '1h', '1d', '1wk']:
                 cache_key = self._get_cache_key(symbol, exchange, interval)
                 cache_path = self._get_cache_path(cache_key)
-                meta_path = self.cache_dir / f"{cache_key}_meta.json"
+                meta_path = self._get_meta_path(cache_key)
 
                 if cache_path.exists():
                     cache_path.unlink()
                 if meta_path.exists():
                     meta_path.unlink()
 
+            self.store.delete(exchange, symbol)
+            self._resampled.clear()
             logger.info(f"Cleared cache for {exchange}:{symbol}")
         else:
             # Clear all cache
             for file in self.cache_dir.glob("*"):
-                file.unlink()
+                if file.is_file():
+                    file.unlink()
+            for exchange_dir in self.store.root.glob("*"):
+                self.store.delete(exchange_dir.name)
+            self._resampled.clear()
             logger.info("Cleared all data cache")
 
     def fetch_yahoo_data(self, symbol: str, start_date: datetime, end_date: datetime,
@@ -231,6 +427,7 @@ class HistoricalDataManager:
 
         Returns:
             DataFrame with columns: datetime, open, high, low, close, volume
+            (empty when the range has no bars), or None when the request failed
         """
         # Convert to Yahoo symbol
         symbol_upper = symbol.upper().strip()
@@ -252,12 +449,15 @@ class HistoricalDataManager:
             'events': 'history'
         }
 
-        try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+        def request():
+            self.rate_limiters.acquire('yahoo')
+            response = self._session.get(url, params=params, headers=headers, timeout=30)
             response.raise_for_status()
+            return response.json()
 
-            data = response.json()
+        try:
+            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+            data = call_with_retry(request, label=f"Yahoo {symbol}")
 
             if 'chart' not in data or 'result' not in data['chart']:
                 logger.error(f"Invalid response from Yahoo Finance for {symbol}")
@@ -266,8 +466,9 @@ class HistoricalDataManager:
             result = data['chart']['result'][0]
 
             if 'timestamp' not in result:
-                logger.error(f"No data available for {symbol}")
-                return None
+                # A valid chart without bars: the range has no trading sessions
+                logger.info(f"No data available for {symbol} in range")
+                return self._empty_frame().reset_index()
 
             timestamps = result['timestamp']
             quotes = result['indicators']['quote'][0]
@@ -304,14 +505,11 @@ class HistoricalDataManager:
         Returns:
             DataFrame with datetime, open, high, low, close, volume
         """
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-
-        # Try Yahoo Finance first
-        df = self.fetch_yahoo_data(symbol, start_date, end_date, interval)
+        # Try Yahoo Finance first, fetching only what the cache is missing
+        df = self._get_yahoo_incremental(symbol, days, interval)
 
         if df is not None and len(df) > 0:
-            return df
+            return df.rename_axis('datetime').reset_index()
 
         # Fall back to sample data
         logger.warning(f"Using sample data for {symbol}")
@@ -320,6 +518,63 @@ class HistoricalDataManager:
         sample_df = sample_df.rename(columns={'index': 'datetime'})
         return sample_df
 
+    def _get_yahoo_incremental(self, symbol: str, days: int, interval: str) -> Optional[pd.DataFrame]:
+        """Datetime-indexed Yahoo Finance history through the range-aware cache"""
+        end_date = datetime.now()
+        start_date = datetime.combine((end_date - timedelta(days=days)).date(), datetime.min.time())
+
+        def fetch(from_dt: datetime, to_dt: datetime) -> Optional[pd.DataFrame]:
+            df = self.fetch_yahoo_data(symbol, from_dt, to_dt, interval)
+            return df.set_index('datetime') if df is not None else None
+
+        return self._get_incremental(symbol, YAHOO_EXCHANGE, interval, start_date, end_date, fetch)
+
+    def get_timeframe_data(self, symbol: str, timeframe: str, days: int = 30,
+                           exchange: str = "NSE", base_interval: str = "1minute",
+                           broker: str = None, source: str = "broker") -> Optional[pd.DataFrame]:
+        """
+        Get bars of any timeframe derived from one cached base interval
+
+        Args:
+            symbol: Stock symbol
+            timeframe: N-minute or N-hour bars (5minute, 15m, 1h, 4h, ...), day/session or week
+            days: Number of days of history
+            exchange: Exchange
+            base_interval: Interval downloaded and cached (1minute; 1m/5m/1d with Yahoo)
+            broker: Broker to fetch the base from (source="broker")
+            source: "broker" or "yahoo"
+
+        Returns:
+            DataFrame indexed by bar start time with open, high, low, close, volume
+        """
+        if source == "yahoo":
+            base = self._get_yahoo_incremental(symbol, days, base_interval)
+            if base is None:
+                return None
+            # Yahoo timestamps are UTC; bars are anchored to the IST session
+            base = base.tz_localize('UTC').tz_convert(IST).tz_localize(None)
+            key = (YAHOO_EXCHANGE, symbol, base_interval)
+        else:
+            base = self.get_historical_data(symbol, exchange, base_interval, days, broker)
+            if base is None:
+                return None
+            key = (exchange, symbol, base_interval)
+
+        return self._resampled.resample(key, base.sort_index(), timeframe)
+
+    def get_data_for_backtest_many(self, symbols: List[str], days: int = 365, interval: str = "1d",
+                                   max_workers: int = 8,
+                                   callback: Callable[[str, Optional[pd.DataFrame]], None] = None
+                                   ) -> Dict[str, Optional[pd.DataFrame]]:
+        """get_data_for_backtest for many symbols concurrently (callback as each completes)"""
+        results = {}
+        for symbol, df in self._fetch_many(
+                symbols, lambda symbol: self.get_data_for_backtest(symbol, days, interval), max_workers):
+            results[symbol] = df
+            if callback:
+                callback(symbol, df)
+        return results
+
     @staticmethod
     def get_available_symbols() -> List[str]:
         """Get list of commonly used NSE symbols"""
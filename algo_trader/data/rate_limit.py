@@ -0,0 +1,109 @@
+"""
+Rate Limiting
+Token buckets, pooled HTTP sessions and retries for historical data sources
+"""
+import threading
+import time
+from typing import Callable, Dict, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from loguru import logger
+
+
+# Historical-data request limits per source: (requests per second, burst)
+RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    'upstox': (25.0, 25),
+    'angelone': (3.0, 3),
+    'zerodha': (3.0, 3),
+    'yahoo': (5.0, 5),
+}
+DEFAULT_RATE_LIMIT = (2.0, 2)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Transient failures call_with_retry retries (HTTPError only for RETRY_STATUS);
+# broker historical-data requests raise these instead of returning nothing
+RETRYABLE_ERRORS = (requests.HTTPError, requests.ConnectionError, requests.Timeout)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Token bucket needs a positive rate and capacity")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiters:
+    """One token bucket per source, created on first use"""
+
+    def __init__(self, limits: Dict[str, Tuple[float, int]] = None):
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source: str) -> TokenBucket:
+        source = source.lower()
+        with self._lock:
+            if source not in self._buckets:
+                self._buckets[source] = TokenBucket(*self.limits.get(source, DEFAULT_RATE_LIMIT))
+            return self._buckets[source]
+
+    def acquire(self, source: str):
+        self.get(source).acquire()
+
+
+# Limits are per account/IP, not per object: every data manager in the process shares these buckets
+RATE_LIMITERS = RateLimiters()
+
+
+def pooled_session(pool_size: int = 16) -> requests.Session:
+    """Session keeping up to `pool_size` keep-alive connections per host"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def call_with_retry(func: Callable, retries: int = 3, backoff: float = 0.5, label: str = ""):
+    """
+    Call `func()`, retrying connection errors, timeouts and 429/5xx responses
+
+    Waits backoff, 2*backoff, 4*backoff, ... between attempts and re-raises
+    the last error once `retries` retries are used up.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status not in RETRY_STATUS or attempt == retries:
+                raise
+            error = e
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == retries:
+                raise
+            error = e
+
+        delay = backoff * 2 ** attempt
+        logger.warning(f"{label or 'Request'} failed ({error}), retrying in {delay:.1f}s")
+        time.sleep(delay)
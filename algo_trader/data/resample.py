@@ -0,0 +1,160 @@
+"""
+Resampler
+Derives higher-timeframe OHLCV bars from one base interval, aligned to NSE sessions
+"""
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Hashable, Tuple
+import numpy as np
+import pandas as pd
+
+
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=15)  # NSE cash market open, the bar anchor
+
+NS_PER_MINUTE = 60 * 10**9
+NS_PER_DAY = 1440 * NS_PER_MINUTE
+
+_TIMEFRAME_ALIASES = {
+    'day': 'session', '1d': 'session', 'd': 'session', 'daily': 'session', 'session': 'session',
+    'week': 'week', '1w': 'week', '1wk': 'week', 'w': 'week', 'weekly': 'week',
+}
+_UNIT_MINUTES = {'m': 1, 'min': 1, 'minute': 1, 'h': 60, 'hr': 60, 'hour': 60}
+
+
+def parse_timeframe(timeframe: str) -> Tuple[str, int]:
+    """
+    Normalize a timeframe to ('minute', N), ('session', 1) or ('week', 1)
+
+    Accepts broker and Yahoo spellings: 5minute, 5m, 15min, 60minute, 1h,
+    4 hour, day, 1d, week, 1wk.
+    """
+    key = timeframe.strip().lower()
+    if key in _TIMEFRAME_ALIASES:
+        return _TIMEFRAME_ALIASES[key], 1
+
+    match = re.fullmatch(r'(\d+)\s*(m|min|minute|h|hr|hour)s?', key)
+    if not match or int(match.group(1)) < 1:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return 'minute', int(match.group(1)) * _UNIT_MINUTES[match.group(2)]
+
+
+def _local_ns(index: pd.Index) -> np.ndarray:
+    """Exchange wall-clock times as int64 ns (tz-aware indexes keep their local time)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    # asi8 is in the index's own unit (pandas 3 infers us from Python datetimes)
+    return index.as_unit('ns').asi8
+
+
+def bar_starts(index: pd.Index, timeframe: str) -> np.ndarray:
+    """Start time (int64 ns) of the `timeframe` bar each timestamp falls in"""
+    kind, minutes = parse_timeframe(timeframe)
+    t = _local_ns(index)
+    day = t - t % NS_PER_DAY
+
+    if kind == 'session':
+        return day
+    if kind == 'week':
+        # 1970-01-01 was a Thursday: shift so weeks start on Monday
+        days = day // NS_PER_DAY
+        return (days - (days + 3) % 7) * NS_PER_DAY
+
+    # N-minute bars restart at every session open: 09:15, 09:15 + N, ...
+    anchor = day + SESSION_OPEN.value
+    width = minutes * NS_PER_MINUTE
+    return anchor + (t - anchor) // width * width
+
+
+def resample_bars(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Aggregate datetime-indexed OHLCV bars into `timeframe` bars
+
+    Bars are labelled by their start time. Intraday bars are anchored at the
+    09:15 session open each day (so hourly bars are 09:15, 10:15, ...,
+    15:15), session bars cover one trading day and weekly bars start on
+    Monday. The input must be sorted by time.
+    """
+    if df.empty:
+        return df.iloc[:0]
+
+    starts = bar_starts(df.index, timeframe)
+    first = np.concatenate(([0], np.flatnonzero(np.diff(starts)) + 1))
+    last = np.concatenate((first[1:] - 1, [len(starts) - 1]))
+
+    index = pd.DatetimeIndex(starts[first])
+    tz = getattr(df.index, 'tz', None)
+    if tz is not None:
+        index = index.tz_localize(tz)
+
+    out = {}
+    for column in df.columns:
+        values = df[column].to_numpy()
+        if column == 'open':
+            out[column] = values[first]
+        elif column == 'high':
+            out[column] = np.maximum.reduceat(values, first)
+        elif column == 'low':
+            out[column] = np.minimum.reduceat(values, first)
+        elif column == 'close':
+            out[column] = values[last]
+        elif column == 'volume':
+            out[column] = np.add.reduceat(values, first)
+    return pd.DataFrame(out, index=index.rename(df.index.name))
+
+
+@dataclass
+class _Derived:
+    bars: pd.DataFrame
+    base_start: pd.Timestamp  # Earliest base bar the derived bars were built from
+
+
+class ResampleCache:
+    """
+    Derived timeframe frames per base series, extended incrementally
+
+    When the base gains new bars only the last derived bar (which may have
+    been partial) and anything after it are recomputed; if the base now
+    starts earlier than before, the frame is rebuilt.
+    """
+
+    def __init__(self):
+        self._frames: Dict[Tuple[Hashable, str], _Derived] = {}
+        self._lock = threading.Lock()
+
+    def resample(self, key: Hashable, base: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """`timeframe` bars for `base` (identified by `key`), reusing earlier work"""
+        if base.empty:
+            return resample_bars(base, timeframe)
+
+        cache_key = (key, parse_timeframe(timeframe))
+        base_start = base.index[0]
+
+        with self._lock:
+            entry = self._frames.get(cache_key)
+
+        if entry is not None and len(entry.bars) and entry.base_start <= base_start <= entry.bars.index[-1]:
+            tail_start = entry.bars.index[-1]
+            tail = resample_bars(base.loc[tail_start:], timeframe)
+            bars = pd.concat([entry.bars.iloc[:-1], tail])
+            base_start = entry.base_start
+        else:
+            bars = resample_bars(base, timeframe)
+
+        with self._lock:
+            self._frames[cache_key] = _Derived(bars, base_start)
+
+        # Only the bars the caller's base reaches back to
+        first = pd.DatetimeIndex(bar_starts(base.index[:1], timeframe))
+        if bars.index.tz is not None:
+            first = first.tz_localize(bars.index.tz)
+        return bars.loc[first[0]:]
+
+    def clear(self, key: Hashable = None):
+        with self._lock:
+            if key is None:
+                self._frames.clear()
+            else:
+                for cache_key in [k for k in self._frames if k[0] == key]:
+                    del self._frames[cache_key]
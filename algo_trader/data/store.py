@@ -0,0 +1,281 @@
+"""
+Market Data Store
+Exchange/symbol/interval/date partitioned OHLCV store with memory-mapped column reads
+"""
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from algo_trader.data.bars import Bars, volume_dtype_for
+
+
+MANIFEST = "manifest.json"
+PARTITION_UNITS = {'day': 'D', 'month': 'M', 'year': 'Y'}
+READ_ATTEMPTS = 3  # Manifest reloads when a concurrent append removed a partition mid-read
+
+
+class MarketDataStore:
+    """
+    On-disk bar store: root/{exchange}/{symbol}/{interval}/{partition}/{column}.npy
+
+    Each series has a manifest listing its partitions (one per day, month or
+    year of bars) with their row counts and first/last times, plus free-form
+    metadata. Column files are plain .npy arrays opened with mmap, so a range
+    read binary-searches the time column of the partitions that overlap it
+    and touches only those pages.
+
+    Writes never modify files in place: changed partitions are written as a
+    new version directory and the manifest is swapped in with an atomic
+    rename, so a reader sees either the old or the new data. Superseded
+    versions are removed after the swap; a read that loaded the manifest
+    just before it retries with the new one.
+    """
+
+    def __init__(self, root: Union[str, Path] = None, partition: str = 'month',
+                 price_dtype=np.float32, volume_dtype=np.int32):
+        if partition not in PARTITION_UNITS:
+            raise ValueError(f"partition must be one of {list(PARTITION_UNITS)}")
+        self.root = Path(root) if root else Path.home() / ".algo_trader" / "market_data"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.partition = partition
+        self.price_dtype = price_dtype
+        self.volume_dtype = volume_dtype
+        self._lock = threading.Lock()
+        self._manifests: Dict[Path, Tuple[tuple, Dict]] = {}  # series dir -> (file identity, manifest)
+
+    def _series_dir(self, exchange: str, symbol: str, interval: str) -> Path:
+        return self.root / exchange / symbol / interval
+
+    # Manifest
+
+    @staticmethod
+    def _identity(stat: os.stat_result) -> tuple:
+        """Changes whenever the manifest is swapped, even within the mtime resolution"""
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load_manifest(self, series_dir: Path) -> Optional[Dict]:
+        path = series_dir / MANIFEST
+        try:
+            identity = self._identity(path.stat())
+        except FileNotFoundError:
+            return None
+
+        cached = self._manifests.get(series_dir)
+        if cached is not None and cached[0] == identity:
+            return cached[1]
+
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+            identity = self._identity(os.fstat(f.fileno()))
+        self._manifests[series_dir] = (identity, manifest)
+        return manifest
+
+    def _write_manifest(self, series_dir: Path, manifest: Dict):
+        tmp_path = series_dir / f"{MANIFEST}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        identity = self._identity(tmp_path.stat())
+        os.replace(tmp_path, series_dir / MANIFEST)
+        self._manifests[series_dir] = (identity, manifest)
+
+    # Writing
+
+    def append(self, exchange: str, symbol: str, interval: str,
+               data: Union[pd.DataFrame, Bars], meta: Dict = None) -> int:
+        """
+        Add bars to a series; bars at existing times replace the stored ones
+
+        Only the partitions the new bars fall in are rewritten. `meta` is
+        merged into the series metadata in the same atomic manifest swap.
+
+        Returns:
+            Number of bars written
+        """
+        bars = data if isinstance(data, Bars) else Bars.from_frame(
+            data, price_dtype=self.price_dtype, volume_dtype=self.volume_dtype)
+        series_dir = self._series_dir(exchange, symbol, interval)
+
+        with self._lock:
+            series_dir.mkdir(parents=True, exist_ok=True)
+            manifest = self._load_manifest(series_dir) or {
+                'exchange': exchange, 'symbol': symbol, 'interval': interval,
+                'partition': self.partition, 'tz': bars.tz, 'partitions': {}, 'meta': {},
+            }
+            manifest = {**manifest, 'partitions': dict(manifest['partitions']),
+                        'meta': {**manifest['meta'], **(meta or {})}}
+            if manifest.get('tz') is None:
+                manifest['tz'] = bars.tz
+            superseded = []
+
+            if len(bars):
+                order = np.argsort(bars.time, kind='stable')
+                keys = self._partition_keys(bars.time[order], manifest['partition'])
+                bounds = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+
+                for part in np.split(order, bounds):
+                    key = str(self._partition_keys(bars.time[part[:1]], manifest['partition'])[0])
+                    columns = {'time': bars.time[part], **{name: bars.values(name)[part] for name in Bars.COLUMNS}}
+
+                    entry = manifest['partitions'].get(key)
+                    if entry is not None:
+                        columns = self._merge(self._read_partition(series_dir / entry['dir'], mmap=False), columns)
+                        superseded.append(entry['dir'])
+                    else:
+                        columns = self._merge(columns)
+
+                    version = entry['version'] + 1 if entry else 1
+                    directory = f"{key}.{version}"
+                    self._write_partition(series_dir, directory, columns)
+                    manifest['partitions'][key] = {
+                        'dir': directory, 'version': version, 'rows': len(columns['time']),
+                        'start': int(columns['time'][0]), 'end': int(columns['time'][-1]),
+                    }
+
+            self._write_manifest(series_dir, manifest)
+
+        for directory in superseded:
+            shutil.rmtree(series_dir / directory, ignore_errors=True)
+
+        logger.debug(f"Stored {len(bars)} bars for {exchange}:{symbol} {interval}")
+        return len(bars)
+
+    @staticmethod
+    def _partition_keys(times: np.ndarray, partition: str) -> np.ndarray:
+        return times.view('datetime64[ns]').astype(f'datetime64[{PARTITION_UNITS[partition]}]').astype(str)
+
+    @staticmethod
+    def _merge(*parts: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Union of column sets sorted by time; later parts (and later rows) win on equal times"""
+        merged = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        order = np.argsort(merged['time'], kind='stable')
+        times = merged['time'][order]
+        keep = order[np.append(times[1:] != times[:-1], True)]  # Last of each run of equal times
+        return {name: values[keep] for name, values in merged.items()}
+
+    def _write_partition(self, series_dir: Path, directory: str, columns: Dict[str, np.ndarray]):
+        tmp_dir = series_dir / f".{directory}.{uuid.uuid4().hex}.tmp"
+        tmp_dir.mkdir()
+        dtypes = {'time': np.int64, 'volume': volume_dtype_for(columns['volume'], self.volume_dtype)}
+        for name, values in columns.items():
+            np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(values, dtype=dtypes.get(name, self.price_dtype)))
+        # Left over by a write that never reached its manifest swap
+        shutil.rmtree(series_dir / directory, ignore_errors=True)
+        os.replace(tmp_dir, series_dir / directory)
+
+    # Reading
+
+    @staticmethod
+    def _read_partition(path: Path, mmap: bool = True) -> Dict[str, np.ndarray]:
+        mode = 'r' if mmap else None
+        return {name: np.load(path / f"{name}.npy", mmap_mode=mode) for name in ('time',) + Bars.COLUMNS}
+
+    def read(self, exchange: str, symbol: str, interval: str,
+             start=None, end=None) -> Optional[Bars]:
+        """
+        Bars with start <= time <= end (None if the series was never stored)
+
+        A range inside one partition is returned as memory-mapped views;
+        ranges spanning partitions are copied into one array per column.
+        """
+        series_dir = self._series_dir(exchange, symbol, interval)
+        for attempt in range(READ_ATTEMPTS):
+            manifest = self._load_manifest(series_dir)
+            if manifest is None:
+                return None
+            try:
+                return self._read_range(series_dir, manifest, start, end)
+            except FileNotFoundError:
+                # An append swapped the manifest and removed a partition this one lists
+                if attempt == READ_ATTEMPTS - 1:
+                    raise
+                logger.debug(f"Partition superseded during read of {exchange}:{symbol} {interval}, retrying")
+
+    def _read_range(self, series_dir: Path, manifest: Dict, start, end) -> Bars:
+        tz = manifest.get('tz')
+        lo = self._to_ns(start, tz)
+        hi = self._to_ns(end, tz)
+
+        pieces = []
+        for key in sorted(manifest['partitions']):
+            entry = manifest['partitions'][key]
+            if (hi is not None and entry['start'] > hi) or (lo is not None and entry['end'] < lo):
+                continue
+            columns = self._read_partition(series_dir / entry['dir'])
+            times = columns['time']
+            first = 0 if lo is None else int(np.searchsorted(times, lo, side='left'))
+            last = len(times) if hi is None else int(np.searchsorted(times, hi, side='right'))
+            if last > first:
+                pieces.append({name: values[first:last] for name, values in columns.items()})
+
+        if not pieces:
+            return Bars([], [], [], [], [], [], price_dtype=self.price_dtype,
+                        volume_dtype=self.volume_dtype, tz=tz)
+        if len(pieces) == 1:
+            columns = pieces[0]
+        else:
+            columns = {name: np.concatenate([piece[name] for piece in pieces]) for name in pieces[0]}
+
+        return Bars(columns['time'], *(columns[name] for name in Bars.COLUMNS),
+                    price_dtype=columns['close'].dtype, volume_dtype=columns['volume'].dtype, tz=tz)
+
+    @staticmethod
+    def _to_ns(when, tz: str = None) -> Optional[int]:
+        if when is None:
+            return None
+        when = pd.Timestamp(when)
+        if when.tzinfo is not None:
+            when = (when.tz_convert(tz) if tz else when).tz_localize(None)
+        return when.value
+
+    def read_frame(self, exchange: str, symbol: str, interval: str,
+                   start=None, end=None) -> Optional[pd.DataFrame]:
+        """read() as a float64 DataFrame on a datetime index"""
+        bars = self.read(exchange, symbol, interval, start, end)
+        return bars.to_frame(dtype=float) if bars is not None else None
+
+    # Catalogue
+
+    def exists(self, exchange: str, symbol: str, interval: str) -> bool:
+        return (self._series_dir(exchange, symbol, interval) / MANIFEST).exists()
+
+    def get_meta(self, exchange: str, symbol: str, interval: str) -> Dict:
+        manifest = self._load_manifest(self._series_dir(exchange, symbol, interval))
+        return dict(manifest['meta']) if manifest else {}
+
+    def get_info(self, exchange: str, symbol: str, interval: str) -> Optional[Dict]:
+        """Row count and time span of a series"""
+        manifest = self._load_manifest(self._series_dir(exchange, symbol, interval))
+        if not manifest or not manifest['partitions']:
+            return None
+        entries = manifest['partitions'].values()
+        return {
+            'rows': sum(entry['rows'] for entry in entries),
+            'partitions': len(manifest['partitions']),
+            'start': pd.Timestamp(min(entry['start'] for entry in entries)),
+            'end': pd.Timestamp(max(entry['end'] for entry in entries)),
+        }
+
+    def list_series(self) -> List[Tuple[str, str, str]]:
+        """(exchange, symbol, interval) of every stored series"""
+        return sorted(
+            tuple(path.parent.relative_to(self.root).parts)
+            for path in self.root.glob(f"*/*/*/{MANIFEST}")
+        )
+
+    def delete(self, exchange: str, symbol: str = None, interval: str = None):
+        """Remove a series, every interval of a symbol, or a whole exchange"""
+        path = self.root / exchange
+        if symbol:
+            path = path / symbol
+            if interval:
+                path = path / interval
+        with self._lock:
+            shutil.rmtree(path, ignore_errors=True)
+            self._manifests = {d: m for d, m in self._manifests.items() if path not in d.parents and d != path}
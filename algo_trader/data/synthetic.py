@@ -0,0 +1,292 @@
+"""
+Synthetic Market Data
+Deterministic, vectorized generator of intraday bars, ticks and option chains for benchmarks
+"""
+import zlib
+from datetime import date, datetime
+from typing import Dict, List, Union
+import numpy as np
+import pandas as pd
+
+from algo_trader.data.bars import Bars
+from algo_trader.core.options_manager import INDEX_STRIKE_GAPS
+
+
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=15)
+SESSION_MINUTES = 375  # 09:15 - 15:30
+TRADING_DAYS = 252
+
+# Volatility multiplier of each regime; days switch regime as a Markov chain
+REGIMES = {'calm': 0.6, 'normal': 1.0, 'volatile': 2.0}
+
+
+def _stable_hash(text: str) -> int:
+    """Same value in every Python process (unlike hash(), which is salted per run)"""
+    return zlib.crc32(text.upper().encode())
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF (Abramowitz-Stegun 7.1.26, |error| < 1.5e-7)"""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+
+class SyntheticMarket:
+    """
+    Generates NSE-like market data without any network access
+
+    Every series is a pure function of (seed, symbol, dates): each symbol
+    draws from its own generator seeded with a stable hash, so adding symbols
+    or generating them in a different order never changes existing ones.
+
+    Prices follow a log random walk whose volatility is scaled by a per-day
+    regime (calm / normal / volatile) and by a U-shaped intraday profile
+    (busier at the open and close). Each session opens with an overnight gap,
+    occasionally a jump. Volume follows a steeper U-shape. Prices are
+    rounded to the 0.05 tick.
+    """
+
+    def __init__(self, seed: int = 0, annual_vol: float = 0.25,
+                 regimes: Dict[str, float] = None, regime_persistence: float = 0.95,
+                 gap_vol: float = 0.005, jump_prob: float = 0.02, jump_size: float = 0.04,
+                 vol_smile: float = 1.5, volume_smile: float = 3.0,
+                 base_volume: float = 5000.0, tick_size: float = 0.05):
+        """
+        Args:
+            seed: Global seed; the same seed always gives the same data
+            annual_vol: Annualized volatility in the normal regime
+            regimes: Regime name -> volatility multiplier
+            regime_persistence: Probability a day keeps the previous day's regime
+            gap_vol: Standard deviation of the overnight gap (log return)
+            jump_prob: Probability of an overnight jump of +/- jump_size on top of the gap
+            vol_smile, volume_smile: Open/close vs midday ratio of the intraday volatility / volume profile
+            base_volume: Mean 1-minute volume at midday
+            tick_size: Price tick
+        """
+        self.seed = seed
+        self.annual_vol = annual_vol
+        self.regimes = dict(regimes or REGIMES)
+        self.regime_persistence = regime_persistence
+        self.gap_vol = gap_vol
+        self.jump_prob = jump_prob
+        self.jump_size = jump_size
+        self.vol_smile = vol_smile
+        self.volume_smile = volume_smile
+        self.base_volume = base_volume
+        self.tick_size = tick_size
+
+    def _rng(self, *keys) -> np.random.Generator:
+        return np.random.default_rng([self.seed] + [_stable_hash(str(key)) for key in keys])
+
+    @staticmethod
+    def base_price(symbol: str) -> float:
+        """Starting price for a symbol"""
+        if 'NIFTY' in symbol.upper():
+            return 18000.0
+        if 'BANK' in symbol.upper():
+            return 42000.0
+        return 1000.0 + _stable_hash(symbol) % 4000
+
+    @staticmethod
+    def trading_days(days: int, end: Union[date, datetime] = None) -> pd.DatetimeIndex:
+        """The last `days` weekdays up to `end` (default today)"""
+        end = pd.Timestamp(end or datetime.now()).normalize()
+        return pd.bdate_range(end=end, periods=days)
+
+    @staticmethod
+    def _profile(n: int, smile: float) -> np.ndarray:
+        """U-shaped intraday profile over n slots, mean 1, open/close `smile` times midday"""
+        x = (np.arange(n) + 0.5) / n
+        profile = 1.0 + (smile - 1.0) * (2.0 * x - 1.0) ** 2
+        return profile / profile.mean()
+
+    def regime_path(self, symbol: str, n_days: int) -> np.ndarray:
+        """Volatility multiplier per day"""
+        rng = self._rng(symbol, 'regime')
+        levels = np.array(list(self.regimes.values()))
+        switch = rng.random(n_days) > self.regime_persistence
+        switch[0] = True
+        draws = rng.integers(0, len(levels), n_days)
+        # Each day takes the draw of the most recent switch day
+        last_switch = np.maximum.accumulate(np.where(switch, np.arange(n_days), 0))
+        return levels[draws[last_switch]]
+
+    def intraday_bars(self, symbol: str, days: int = 5, interval_minutes: int = 1,
+                      end: Union[date, datetime] = None,
+                      as_bars: bool = False) -> Union[pd.DataFrame, Bars]:
+        """
+        Intraday OHLCV bars for one symbol
+
+        Bars start at 09:15 every weekday; with an interval that does not
+        divide the 375-minute session the last bar of the day is shorter.
+
+        Returns:
+            DataFrame indexed by bar start time (or Bars with as_bars)
+        """
+        dates = self.trading_days(days, end)
+        n_days = len(dates)
+        per_day = -(-SESSION_MINUTES // interval_minutes)
+        rng = self._rng(symbol, 'bars', interval_minutes)
+
+        regime = self.regime_path(symbol, n_days)[:, None]
+        bar_vol = self.annual_vol / np.sqrt(TRADING_DAYS * SESSION_MINUTES) * np.sqrt(interval_minutes)
+        sigma = bar_vol * regime * np.sqrt(self._profile(per_day, self.vol_smile))[None, :]
+
+        moves = rng.standard_normal((n_days, per_day)) * sigma
+        gaps = rng.normal(0.0, self.gap_vol, n_days)
+        jumps = rng.random(n_days) < self.jump_prob
+        gaps += jumps * self.jump_size * rng.choice([-1.0, 1.0], n_days)
+        gaps[0] = 0.0
+
+        # The overnight gap lands between the previous close and the day's first open
+        steps = moves.copy()
+        steps[:, 0] += gaps
+        log_close = np.log(self.base_price(symbol)) + np.cumsum(steps.ravel())
+        log_open = log_close - moves.ravel()
+
+        wick = np.abs(rng.standard_normal((2, n_days * per_day))) * (0.5 * sigma).ravel()
+        close = np.exp(log_close)
+        open_ = np.exp(log_open)
+        high = np.maximum(open_, close) * np.exp(wick[0])
+        low = np.minimum(open_, close) * np.exp(-wick[1])
+
+        volume_profile = self._profile(per_day, self.volume_smile)[None, :]
+        volume = (self.base_volume * interval_minutes * volume_profile * regime
+                  * rng.lognormal(-0.125, 0.5, (n_days, per_day))).ravel()
+
+        offsets = SESSION_OPEN.value + np.arange(per_day, dtype=np.int64) * interval_minutes * 60 * 10**9
+        times = (dates.as_unit('ns').asi8[:, None] + offsets[None, :]).ravel()
+
+        tick = self.tick_size
+        columns = [np.round(values / tick) * tick for values in (open_, high, low, close)]
+
+        if as_bars:
+            return Bars(times, *columns, np.round(volume))
+        return pd.DataFrame(
+            dict(zip(Bars.PRICE_COLUMNS, columns), volume=np.round(volume).astype(np.int64)),
+            index=pd.DatetimeIndex(times.view('datetime64[ns]'), name='datetime'))
+
+    def daily_bars(self, symbol: str, days: int = 365,
+                   end: Union[date, datetime] = None) -> pd.DataFrame:
+        """One bar per weekday, indexed by date"""
+        df = self.intraday_bars(symbol, days, SESSION_MINUTES, end)
+        df.index = df.index.normalize()
+        return df
+
+    def generate(self, symbols: List[str], days: int = 5, interval_minutes: int = 1,
+                 end: Union[date, datetime] = None,
+                 as_bars: bool = True) -> Dict[str, Union[Bars, pd.DataFrame]]:
+        """intraday_bars for many symbols (symbol -> Bars, or DataFrame)"""
+        return {symbol: self.intraday_bars(symbol, days, interval_minutes, end, as_bars) for symbol in symbols}
+
+    def ticks(self, symbols: Union[str, List[str]], days: int = 1, ticks_per_minute: int = 60,
+              end: Union[date, datetime] = None) -> pd.DataFrame:
+        """
+        Tick stream (datetime, symbol, price, volume) ordered by time
+
+        Ticks are evenly spaced within the session, `ticks_per_minute` per
+        symbol, with the same regime, gap and intraday profile model as the
+        bars. The frame loads straight into MarketReplay.load_ticks.
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        dates = self.trading_days(days, end)
+        n_days = len(dates)
+        per_day = SESSION_MINUTES * ticks_per_minute
+
+        spacing = 60 * 10**9 // ticks_per_minute
+        offsets = SESSION_OPEN.value + np.arange(per_day, dtype=np.int64) * spacing
+        times = (dates.as_unit('ns').asi8[:, None] + offsets[None, :]).ravel()
+        vol_profile = np.sqrt(self._profile(per_day, self.vol_smile))[None, :]
+        volume_profile = self._profile(per_day, self.volume_smile)[None, :]
+        tick_vol = self.annual_vol / np.sqrt(TRADING_DAYS * SESSION_MINUTES * ticks_per_minute)
+
+        frames = []
+        for symbol in symbols:
+            rng = self._rng(symbol, 'ticks', ticks_per_minute)
+            regime = self.regime_path(symbol, n_days)[:, None]
+            steps = rng.standard_normal((n_days, per_day)) * tick_vol * regime * vol_profile
+            gaps = rng.normal(0.0, self.gap_vol, n_days)
+            gaps += (rng.random(n_days) < self.jump_prob) * self.jump_size * rng.choice([-1.0, 1.0], n_days)
+            gaps[0] = 0.0
+            steps[:, 0] += gaps
+
+            price = np.exp(np.log(self.base_price(symbol)) + np.cumsum(steps.ravel()))
+            volume = (self.base_volume / ticks_per_minute * volume_profile * regime
+                      * rng.lognormal(-0.125, 0.5, (n_days, per_day))).ravel()
+            frames.append(pd.DataFrame({
+                'datetime': times.view('datetime64[ns]'),
+                'symbol': symbol,
+                'price': np.round(price / self.tick_size) * self.tick_size,
+                'volume': np.maximum(np.round(volume), 1).astype(np.int64),
+            }))
+
+        ticks = pd.concat(frames, ignore_index=True)
+        return ticks.sort_values('datetime', kind='stable').reset_index(drop=True)
+
+    def option_chain(self, underlying: str, spot: float, expiry: Union[date, datetime],
+                     as_of: Union[date, datetime] = None, strikes_each_side: int = 10,
+                     strike_gap: float = None, atm_iv: float = None,
+                     rate: float = 0.065) -> pd.DataFrame:
+        """
+        Black-Scholes priced option chain around `spot`
+
+        Implied volatility has a skew (puts below spot richer) and smile;
+        open interest peaks near the money. Rows: one CE and one PE per strike.
+
+        Returns:
+            DataFrame with strike, option_type, ltp, iv, delta, gamma, theta
+            (per day), vega (per 1% IV), oi, volume
+        """
+        gap = strike_gap or INDEX_STRIKE_GAPS.get(underlying.upper(), 50)
+        atm = round(spot / gap) * gap
+        strikes = atm + gap * np.arange(-strikes_each_side, strikes_each_side + 1, dtype=float)
+        strikes = strikes[strikes > 0]
+
+        as_of = pd.Timestamp(as_of or datetime.now())
+        expiry_close = pd.Timestamp(expiry).normalize() + pd.Timedelta(hours=15, minutes=30)
+        t = max((expiry_close - as_of).total_seconds(), 60.0) / (365.0 * 86400)
+
+        moneyness = np.log(strikes / spot)
+        base_iv = atm_iv or self.annual_vol
+        iv = np.maximum(base_iv * (1.0 - 0.8 * moneyness + 4.0 * moneyness ** 2), 0.01)
+
+        sqrt_t = np.sqrt(t)
+        d1 = (np.log(spot / strikes) + (rate + 0.5 * iv ** 2) * t) / (iv * sqrt_t)
+        d2 = d1 - iv * sqrt_t
+        discount = np.exp(-rate * t)
+
+        call = spot * _norm_cdf(d1) - strikes * discount * _norm_cdf(d2)
+        put = strikes * discount * _norm_cdf(-d2) - spot * _norm_cdf(-d1)
+        gamma = _norm_pdf(d1) / (spot * iv * sqrt_t)
+        vega = spot * _norm_pdf(d1) * sqrt_t / 100
+        decay = -spot * _norm_pdf(d1) * iv / (2 * sqrt_t)
+        call_theta = (decay - rate * strikes * discount * _norm_cdf(d2)) / 365
+        put_theta = (decay + rate * strikes * discount * _norm_cdf(-d2)) / 365
+
+        rng = self._rng(underlying, 'chain', pd.Timestamp(expiry).date(), as_of.date())
+        weight = np.exp(-0.5 * (moneyness / (base_iv * sqrt_t + 0.02)) ** 2)
+        oi = np.round(rng.lognormal(0.0, 0.3, (2, len(strikes))) * weight * 1e6).astype(np.int64)
+        volume = np.round(oi * rng.uniform(0.5, 3.0, (2, len(strikes)))).astype(np.int64)
+
+        tick = self.tick_size
+        chain = pd.DataFrame({
+            'strike': np.concatenate([strikes, strikes]),
+            'option_type': ['CE'] * len(strikes) + ['PE'] * len(strikes),
+            'ltp': np.maximum(np.round(np.concatenate([call, put]) / tick) * tick, tick),
+            'iv': np.concatenate([iv, iv]),
+            'delta': np.concatenate([_norm_cdf(d1), _norm_cdf(d1) - 1.0]),
+            'gamma': np.concatenate([gamma, gamma]),
+            'theta': np.concatenate([call_theta, put_theta]),
+            'vega': np.concatenate([vega, vega]),
+            'oi': oi.ravel(),
+            'volume': volume.ravel(),
+        })
+        return chain.sort_values(['strike', 'option_type'], kind='stable').reset_index(drop=True)
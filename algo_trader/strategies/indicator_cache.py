@@ -0,0 +1,92 @@
+"""
+Indicator Cache
+Memo of indicator results keyed by canonical call signature
+"""
+from typing import Dict, Any, Callable, Hashable, Optional
+
+
+class IndicatorCache:
+    """
+    Hash-consing memo for indicator series
+
+    Keys are canonical signatures: function name, resolved scalar params
+    and the signatures of the series they are applied to (e.g.
+    ('ta.ema', ('src', 'close'), 20)). Values are only valid for the data
+    they were computed on - call clear() whenever the bars change.
+    One cache can be shared by several strategies running on the same
+    symbol; use scoped() to separate differently sized bar windows.
+    With `max_entries` set, the oldest entries are evicted first.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._values: Dict[Hashable, Any] = {}
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def get_or_compute(self, key: Optional[Hashable], compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss"""
+        if key is None:
+            return compute()
+
+        try:
+            return self._hit(self._values[key])
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable signature (e.g. a list-valued input)
+            return compute()
+
+        self.misses += 1
+        value = compute()
+        if self.max_entries is not None and self._values and len(self._values) >= self.max_entries:
+            # Dicts keep insertion order: drop the oldest entry
+            del self._values[next(iter(self._values))]
+        self._values[key] = value
+        return value
+
+    def _hit(self, value: Any) -> Any:
+        self.hits += 1
+        return value
+
+    def scoped(self, scope: Hashable) -> 'ScopedIndicatorCache':
+        """View of this cache whose keys are prefixed with `scope`"""
+        return ScopedIndicatorCache(self, scope)
+
+    def clear(self):
+        """Drop cached values (counters are kept)"""
+        self._values.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'cached': len(self._values),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ScopedIndicatorCache:
+    """Key-prefixing view of an IndicatorCache (shares storage and counters)"""
+
+    def __init__(self, cache: IndicatorCache, scope: Hashable):
+        self.cache = cache
+        self.scope = scope
+
+    def __contains__(self, key: Hashable) -> bool:
+        return (self.scope, key) in self.cache
+
+    def get_or_compute(self, key: Optional[Hashable], compute: Callable[[], Any]) -> Any:
+        return self.cache.get_or_compute(None if key is None else (self.scope, key), compute)
@@ -4,14 +4,88 @@ Implements common indicators used in Pine Script
 """
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Union, List
 from loguru import logger
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Rows of sliding windows materialized at once by the block-wise kernels
+_WINDOW_BLOCK = 65536
+
+
+def _supertrend_kernel(hl2: np.ndarray, atr: np.ndarray, close: np.ndarray, mult: float):
+    """
+    SuperTrend recursion with TradingView band ratcheting
+
+    The lower band only rises (and the upper band only falls) while the
+    previous close stays on the trend side of it. Direction: 1 = up, -1 = down.
+    """
+    n = len(close)
+    supertrend = np.full(n, np.nan)
+    direction = np.full(n, np.nan)
+    prev_upper = np.nan
+    prev_lower = np.nan
+    prev_supertrend = np.nan
+
+    for i in range(n):
+        upper = hl2[i] + mult * atr[i]
+        lower = hl2[i] - mult * atr[i]
+        if upper != upper:
+            prev_upper = np.nan
+            prev_lower = np.nan
+            prev_supertrend = np.nan
+            continue
+
+        if prev_lower == prev_lower and not (lower > prev_lower or close[i - 1] < prev_lower):
+            lower = prev_lower
+        if prev_upper == prev_upper and not (upper < prev_upper or close[i - 1] > prev_upper):
+            upper = prev_upper
+
+        if prev_supertrend != prev_supertrend:
+            d = -1.0  # No previous bar: start in a downtrend
+        elif prev_supertrend == prev_upper:
+            d = 1.0 if close[i] > upper else -1.0
+        else:
+            d = -1.0 if close[i] < lower else 1.0
+
+        supertrend[i] = lower if d == 1.0 else upper
+        direction[i] = d
+        prev_upper = upper
+        prev_lower = lower
+        prev_supertrend = supertrend[i]
+
+    return supertrend, direction
+
+
+if NUMBA_AVAILABLE:
+    _supertrend_kernel = njit(cache=True)(_supertrend_kernel)
+
+
+def _rolling_mad(values: np.ndarray, length: int) -> np.ndarray:
+    """Rolling mean absolute deviation (NaN until the window is full or if it holds a NaN)"""
+    result = np.full(len(values), np.nan)
+    if len(values) < length:
+        return result
+
+    windows = sliding_window_view(values, length)
+    for start in range(0, len(windows), _WINDOW_BLOCK):
+        block = windows[start:start + _WINDOW_BLOCK]
+        mean = block.mean(axis=1)
+        result[start + length - 1:start + length - 1 + len(block)] = \
+            np.abs(block - mean[:, None]).mean(axis=1)
+    return result
+
 
 class Indicators:
     """
     Technical indicators implementation compatible with Pine Script functions
-    All functions work with pandas Series or numpy arrays
+    All functions work with pandas Series or numpy arrays (Bars columns: bars['close'])
     """
 
     @staticmethod
@@ -27,10 +101,13 @@ class Indicators:
     @staticmethod
     def wma(source: pd.Series, length: int) -> pd.Series:
         """Weighted Moving Average - ta.wma()"""
-        weights = np.arange(1, length + 1)
-        return source.rolling(window=length).apply(
-            lambda x: np.dot(x, weights) / weights.sum(), raw=True
-        )
+        weights = np.arange(1, length + 1, dtype=float)
+        values = source.to_numpy(dtype=float)
+        result = np.full(len(values), np.nan)
+        if len(values) >= length:
+            # Convolution flips the kernel: newest bar gets the largest weight
+            result[length - 1:] = np.convolve(values, weights[::-1], mode='valid') / weights.sum()
+        return pd.Series(result, index=source.index)
 
     @staticmethod
     def vwma(source: pd.Series, volume: pd.Series, length: int) -> pd.Series:
@@ -73,9 +150,11 @@ class Indicators:
         return upper, basis, lower
 
     @staticmethod
-    def atr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) -> pd.Series:
-        """Average True Range - ta.atr()"""
-        tr = Indicators.tr(high, low, close)
+    def atr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14,
+            tr: pd.Series = None) -> pd.Series:
+        """Average True Range - ta.atr() (pass `tr` to reuse a computed true range)"""
+        if tr is None:
+            tr = Indicators.tr(high, low, close)
         return Indicators.rma(tr, length)
 
     @staticmethod
@@ -103,19 +182,21 @@ class Indicators:
         """Commodity Channel Index - ta.cci()"""
         tp = (high + low + close) / 3
         sma_tp = Indicators.sma(tp, length)
-        mad = tp.rolling(window=length).apply(lambda x: np.mean(np.abs(x - x.mean())), raw=True)
+        mad = pd.Series(_rolling_mad(tp.to_numpy(dtype=float), length), index=tp.index)
         return (tp - sma_tp) / (0.015 * mad)
 
     @staticmethod
-    def adx(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) -> pd.Series:
-        """Average Directional Index - ta.adx()"""
+    def adx(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14,
+            tr: pd.Series = None) -> pd.Series:
+        """Average Directional Index - ta.adx() (pass `tr` to reuse a computed true range)"""
         plus_dm = high.diff()
         minus_dm = -low.diff()
 
         plus_dm = plus_dm.where((plus_dm > minus_dm) & (plus_dm > 0), 0)
         minus_dm = minus_dm.where((minus_dm > plus_dm) & (minus_dm > 0), 0)
 
-        tr = Indicators.tr(high, low, close)
+        if tr is None:
+            tr = Indicators.tr(high, low, close)
         atr = Indicators.rma(tr, length)
 
         plus_di = 100 * Indicators.rma(plus_dm, length) / atr
@@ -126,31 +207,20 @@ class Indicators:
 
     @staticmethod
     def supertrend(high: pd.Series, low: pd.Series, close: pd.Series,
-                   length: int = 10, mult: float = 3.0) -> tuple:
-        """SuperTrend Indicator"""
+                   length: int = 10, mult: float = 3.0, tr: pd.Series = None) -> tuple:
+        """
+        SuperTrend Indicator, returns (supertrend, direction)
+        Bands ratchet as on TradingView; direction 1 = up, -1 = down.
+        Pass `tr` to reuse a computed true range.
+        """
         hl2 = (high + low) / 2
-        atr = Indicators.atr(high, low, close, length)
-
-        upper_band = hl2 + (mult * atr)
-        lower_band = hl2 - (mult * atr)
-
-        supertrend = pd.Series(index=close.index, dtype=float)
-        direction = pd.Series(index=close.index, dtype=int)
+        atr = Indicators.atr(high, low, close, length, tr=tr)
 
-        for i in range(1, len(close)):
-            if close.iloc[i] > upper_band.iloc[i-1]:
-                direction.iloc[i] = 1
-            elif close.iloc[i] < lower_band.iloc[i-1]:
-                direction.iloc[i] = -1
-            else:
-                direction.iloc[i] = direction.iloc[i-1]
-
-            if direction.iloc[i] == 1:
-                supertrend.iloc[i] = lower_band.iloc[i]
-            else:
-                supertrend.iloc[i] = upper_band.iloc[i]
-
-        return supertrend, direction
+        supertrend, direction = _supertrend_kernel(
+            hl2.to_numpy(dtype=float), atr.to_numpy(dtype=float),
+            close.to_numpy(dtype=float), float(mult)
+        )
+        return pd.Series(supertrend, index=close.index), pd.Series(direction, index=close.index)
 
     @staticmethod
     def pivot_points(high: pd.Series, low: pd.Series, close: pd.Series) -> dict:
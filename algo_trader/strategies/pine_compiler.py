@@ -0,0 +1,443 @@
+"""
+Pine Script Compiler
+Compiles a parsed strategy into a flat evaluation plan of NumPy operations
+"""
+import operator
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional, Callable, Tuple
+from dataclasses import dataclass, field
+from loguru import logger
+
+from algo_trader.strategies.pine_parser import ParsedStrategy
+from algo_trader.strategies.indicators import Indicators
+from algo_trader.strategies.indicator_cache import IndicatorCache
+
+
+PRICE_SOURCES = ('open', 'high', 'low', 'close', 'volume', 'hl2', 'hlc3', 'ohlc4', 'hlcc4')
+
+
+def _series(value: Any, data) -> pd.Series:
+    """Coerce an array or scalar to a Series aligned with the data index"""
+    if isinstance(value, pd.Series):
+        return value
+    if isinstance(value, np.ndarray):
+        return pd.Series(value, index=data.index)
+    return pd.Series(value, index=data.index, dtype=float)
+
+
+def _int_param(p: List, i: int, default: int) -> int:
+    return int(p[i]) if len(p) > i else default
+
+
+def _float_param(p: List, i: int, default: float) -> float:
+    return float(p[i]) if len(p) > i else default
+
+
+def _logical_not(value: Any) -> Any:
+    if isinstance(value, (pd.Series, np.ndarray)):
+        # ~ is a bitwise not on int/float series (~1 == -2, truthy)
+        return np.logical_not(value)
+    return not value
+
+
+def _macd(p: List, d) -> tuple:
+    source = _series(p[0], d) if p else d['close']
+    return Indicators.macd(source, _int_param(p, 1, 12), _int_param(p, 2, 26), _int_param(p, 3, 9))
+
+
+def _bb(p: List, d) -> tuple:
+    source = _series(p[0], d) if p else d['close']
+    return Indicators.bollinger_bands(source, _int_param(p, 1, 20), _float_param(p, 2, 2.0))
+
+
+def _input_default(p: List, d) -> Any:
+    """input.*() evaluates to its default value"""
+    return p[0] if p else None
+
+
+# Pine Script function -> implementation taking (resolved params, OHLCV data)
+PINE_FUNCTIONS: Dict[str, Callable[[List, Any], Any]] = {
+    'ta.sma': lambda p, d: Indicators.sma(_series(p[0], d), int(p[1])),
+    'ta.ema': lambda p, d: Indicators.ema(_series(p[0], d), int(p[1])),
+    'ta.wma': lambda p, d: Indicators.wma(_series(p[0], d), int(p[1])),
+    'ta.vwma': lambda p, d: Indicators.vwma(_series(p[0], d), d['volume'], int(p[1])),
+    'ta.rma': lambda p, d: Indicators.rma(_series(p[0], d), int(p[1])),
+    'ta.rsi': lambda p, d: Indicators.rsi(_series(p[0], d), _int_param(p, 1, 14)),
+    'ta.atr': lambda p, d: Indicators.atr(d['high'], d['low'], d['close'], _int_param(p, 0, 14)),
+    'ta.tr': lambda p, d: Indicators.tr(d['high'], d['low'], d['close']),
+    'ta.highest': lambda p, d: Indicators.highest(_series(p[0], d), int(p[1])),
+    'ta.lowest': lambda p, d: Indicators.lowest(_series(p[0], d), int(p[1])),
+    'ta.crossover': lambda p, d: Indicators.crossover(_series(p[0], d), _series(p[1], d)),
+    'ta.crossunder': lambda p, d: Indicators.crossunder(_series(p[0], d), _series(p[1], d)),
+    'ta.change': lambda p, d: Indicators.change(_series(p[0], d), _int_param(p, 1, 1)),
+    'ta.mom': lambda p, d: Indicators.mom(_series(p[0], d), _int_param(p, 1, 10)),
+    'ta.roc': lambda p, d: Indicators.roc(_series(p[0], d), _int_param(p, 1, 10)),
+    'ta.vwap': lambda p, d: Indicators.vwap(d['high'], d['low'], d['close'], d['volume']),
+    'ta.cci': lambda p, d: Indicators.cci(d['high'], d['low'], d['close'], _int_param(p, 0, 20)),
+    'ta.adx': lambda p, d: Indicators.adx(d['high'], d['low'], d['close'], _int_param(p, 0, 14)),
+    'ta.macd': _macd,
+    'ta.bb': _bb,
+    'ta.stoch': lambda p, d: Indicators.stoch(d['high'], d['low'], d['close'], _int_param(p, 0, 14),
+                                              _int_param(p, 1, 1), _int_param(p, 2, 3)),
+    'ta.supertrend': lambda p, d: Indicators.supertrend(d['high'], d['low'], d['close'],
+                                                        _int_param(p, 0, 10), _float_param(p, 1, 3.0)),
+    'input': _input_default,
+    'input.int': _input_default,
+    'input.float': _input_default,
+    'input.bool': _input_default,
+    'input.string': _input_default,
+    'input.source': _input_default,
+}
+
+# Indicators built on the true range; with a cache they share one ta.tr series
+TR_FUNCTIONS: Dict[str, Callable[[List, Any, Any], Any]] = {
+    'ta.atr': lambda p, d, tr: Indicators.atr(d['high'], d['low'], d['close'], _int_param(p, 0, 14), tr=tr),
+    'ta.adx': lambda p, d, tr: Indicators.adx(d['high'], d['low'], d['close'], _int_param(p, 0, 14), tr=tr),
+    'ta.supertrend': lambda p, d, tr: Indicators.supertrend(d['high'], d['low'], d['close'],
+                                                            _int_param(p, 0, 10), _float_param(p, 1, 3.0),
+                                                            tr=tr),
+}
+
+TR_SIGNATURE = ('ta.tr',)
+
+
+def call_pine_function(func_name: str, params: List, data, cache: Optional[IndicatorCache] = None) -> Any:
+    """
+    Call a Pine Script function on resolved params
+
+    With a cache, true-range based indicators reuse the cached ta.tr series.
+    Returns None for unknown functions.
+    """
+    if cache is not None and func_name in TR_FUNCTIONS:
+        tr = cache.get_or_compute(TR_SIGNATURE, lambda: PINE_FUNCTIONS['ta.tr']([], data))
+        return TR_FUNCTIONS[func_name](params, data, tr)
+
+    func = PINE_FUNCTIONS.get(func_name)
+    if func is None:
+        return None
+    return func(params, data)
+
+# Pine Script operator -> implementation (works on scalars, arrays and Series)
+OPERATORS: Dict[str, Callable] = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+    'and': operator.and_,
+    'or': operator.or_,
+    'neg': operator.neg,
+    'not': _logical_not,
+}
+
+
+def select(condition: Any, when_true: Any, when_false: Any) -> Any:
+    """Ternary operator, element-wise for series conditions"""
+    if isinstance(condition, pd.Series):
+        return pd.Series(np.where(condition.fillna(False).astype(bool), when_true, when_false),
+                         index=condition.index)
+    if isinstance(condition, np.ndarray):
+        return np.where(condition.astype(bool), when_true, when_false)
+    return when_true if condition else when_false
+
+
+def history(value: Any, offset: Any) -> Any:
+    """History reference operator - series[offset]"""
+    if isinstance(value, pd.Series):
+        return value.shift(int(offset))
+    if isinstance(value, np.ndarray):
+        shifted = np.full(len(value), np.nan)
+        offset = int(offset)
+        if offset < len(value):
+            shifted[offset:] = value[:len(value) - offset]
+        return shifted
+    return value
+
+
+@dataclass
+class PlanStep:
+    """One operation of an evaluation plan: slots[out] = func(*slots[args])"""
+    func: Callable
+    args: Tuple[int, ...]
+    out: int
+    name: str = ""
+    cached: bool = False  # Result may be memoized by call signature
+
+
+@dataclass
+class CompiledStrategy:
+    """
+    Flat evaluation plan for a parsed strategy
+
+    Slots hold constants, price sources, inputs and intermediate results.
+    Executing the plan is a single loop over prebuilt steps. Identical
+    subexpressions share one step (`shared_steps` counts the duplicates).
+    """
+    steps: List[PlanStep] = field(default_factory=list)
+    constants: Dict[int, Any] = field(default_factory=dict)
+    source_slots: Dict[str, int] = field(default_factory=dict)
+    input_slots: Dict[str, int] = field(default_factory=dict)
+    indicator_slots: List[int] = field(default_factory=list)
+    entry_slots: List[Optional[int]] = field(default_factory=list)
+    exit_slots: List[Optional[int]] = field(default_factory=list)
+    num_slots: int = 0
+    shared_steps: int = 0
+
+    def execute(self, data, context: Any = None, inputs: Dict[str, Any] = None,
+                position: int = 0, bar_offset: int = 0,
+                cache: Optional[IndicatorCache] = None) -> List[Any]:
+        """
+        Run the plan over OHLCV data
+
+        Args:
+            data: DataFrame with price source columns
+            context: Object with apply_indicator(func_name, params, resolved_params);
+                     defaults to calling PINE_FUNCTIONS directly
+            inputs: Input overrides by name
+            position: Current strategy.position_size
+            bar_offset: bar_index of the first row
+            cache: Memo for indicator calls, keyed by call signature; must
+                   only hold results computed on the same data
+
+        Returns:
+            Slot values (NumPy arrays or scalars)
+        """
+        slots: List[Any] = [None] * self.num_slots
+        signatures: List[Any] = [None] * self.num_slots
+        for slot, value in self.constants.items():
+            slots[slot] = value
+            signatures[slot] = _value_signature(value)
+
+        for name, slot in self.source_slots.items():
+            if name == 'bar_index':
+                slots[slot] = np.arange(bar_offset, bar_offset + len(data))
+                signatures[slot] = ('bar_index', bar_offset)
+            elif name == 'strategy.position_size':
+                slots[slot] = position
+                signatures[slot] = position
+            else:
+                slots[slot] = np.asarray(data[name], dtype=float)
+                signatures[slot] = ('src', name)
+
+        if inputs:
+            for name, value in inputs.items():
+                if name in self.input_slots:
+                    slots[self.input_slots[name]] = value
+                    signatures[self.input_slots[name]] = _value_signature(value)
+
+        frame = _ExecutionFrame(data, context, cache)
+        for step in self.steps:
+            args = [slots[i] for i in step.args]
+            if any(a is None for a in args):
+                continue
+
+            arg_signatures = [signatures[i] for i in step.args]
+            if all(s is not None for s in arg_signatures):
+                signatures[step.out] = (step.name, *arg_signatures)
+
+            try:
+                if step.cached and cache is not None:
+                    value = cache.get_or_compute(signatures[step.out], lambda: step.func(frame, *args))
+                else:
+                    value = step.func(frame, *args)
+                slots[step.out] = _to_array(value)
+            except Exception as e:
+                logger.error(f"Error evaluating {step.name}: {e}")
+
+        return slots
+
+    def conditions(self, slots: List[Any]) -> Tuple[List[Any], List[Any]]:
+        """Entry and exit `when` values (True where no condition is given)"""
+        entries = [slots[s] if s is not None else True for s in self.entry_slots]
+        exits = [slots[s] if s is not None else True for s in self.exit_slots]
+        return entries, exits
+
+
+class _ExecutionFrame:
+    """Per-execution state handed to plan steps"""
+
+    def __init__(self, data, context: Any, cache: Optional[IndicatorCache] = None):
+        self.data = data
+        self.context = context
+        self.cache = cache
+
+    def call(self, func_name: str, params: List, resolved_params: List) -> Any:
+        if self.context is not None:
+            return self.context.apply_indicator(func_name, params, resolved_params)
+        return call_pine_function(func_name, resolved_params, self.data, self.cache)
+
+
+def _value_signature(value: Any) -> Any:
+    """Signature of a scalar slot value (None when it cannot be keyed)"""
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    return None
+
+
+def _to_array(value: Any) -> Any:
+    if isinstance(value, pd.Series):
+        return value.to_numpy()
+    if isinstance(value, tuple):
+        return tuple(_to_array(v) for v in value)
+    return value
+
+
+def _operator_step(op: Callable) -> Callable:
+    return lambda frame, *args: op(*args)
+
+
+def _call_step(func_name: str, params: List) -> Callable:
+    return lambda frame, *args: frame.call(func_name, params, list(args))
+
+
+class PineCompiler:
+    """
+    Compiles a ParsedStrategy into a CompiledStrategy
+    Variable references are resolved once at compile time; named inputs
+    (and any names in `overrides`) become slots bound at execution.
+    """
+
+    def __init__(self, strategy: ParsedStrategy, overrides: Optional[set] = None):
+        self.strategy = strategy
+        self.overrides = set(overrides or ())
+        self.plan = CompiledStrategy()
+        self._var_slots: Dict[str, int] = {}
+        self._constant_slots: Dict[tuple, int] = {}
+        self._step_slots: Dict[tuple, int] = {}
+        self._compiling: set = set()
+
+    def compile(self) -> CompiledStrategy:
+        plan = self.plan
+
+        for indicator in self.strategy.indicators:
+            plan.indicator_slots.append(self._compile_node(indicator))
+
+        for entry in self.strategy.entry_conditions:
+            when = entry.get('params', {}).get('when')
+            plan.entry_slots.append(self._compile_node(when) if when else None)
+
+        for exit_cond in self.strategy.exit_conditions:
+            when = exit_cond.get('params', {}).get('when')
+            plan.exit_slots.append(self._compile_node(when) if when else None)
+
+        logger.debug(f"Compiled strategy '{self.strategy.name}' into {len(plan.steps)} steps")
+        return plan
+
+    def _new_slot(self) -> int:
+        slot = self.plan.num_slots
+        self.plan.num_slots += 1
+        return slot
+
+    def _constant(self, value: Any) -> int:
+        key = (type(value), value) if _value_signature(value) is not None or value is None else None
+        if key in self._constant_slots:
+            return self._constant_slots[key]
+
+        slot = self._new_slot()
+        self.plan.constants[slot] = value
+        if key is not None:
+            self._constant_slots[key] = slot
+        return slot
+
+    def _add_step(self, func: Callable, args: List[int], name: str, cached: bool = False) -> int:
+        # Hash-consing: an identical operation on identical slots reuses its step
+        key = (name, tuple(args))
+        if key in self._step_slots:
+            self.plan.shared_steps += 1
+            return self._step_slots[key]
+
+        out = self._new_slot()
+        self.plan.steps.append(PlanStep(func=func, args=tuple(args), out=out, name=name, cached=cached))
+        self._step_slots[key] = out
+        return out
+
+    def _compile_node(self, node: Any) -> int:
+        if node is None or isinstance(node, (int, float, str, bool)):
+            return self._constant(node)
+
+        if not isinstance(node, dict):
+            return self._constant(node)
+
+        if 'var' in node:
+            slot = self._compile_var(node['var'])
+            if 'index' in node:
+                offset = self._compile_node(node['index'])
+                slot = self._add_step(_operator_step(history), [slot, offset], f"{node['var']}[]")
+            return slot
+
+        if 'function' in node:
+            params = node.get('params', [])
+            args = [self._compile_node(p) for p in params]
+            return self._add_step(_call_step(node['function'], params), args, node['function'], cached=True)
+
+        if 'op' in node:
+            op = node['op']
+            if op not in OPERATORS:
+                return self._constant(None)
+            if op in ('neg', 'not'):
+                args = [self._compile_node(node['value'])]
+            else:
+                args = [self._compile_node(node['left']), self._compile_node(node['right'])]
+            return self._add_step(_operator_step(OPERATORS[op]), args, op)
+
+        if 'ternary' in node:
+            args = [self._compile_node(node['condition']),
+                    self._compile_node(node['true']),
+                    self._compile_node(node['false'])]
+            return self._add_step(_operator_step(select), args, '?:')
+
+        return self._constant(node)
+
+    def _compile_var(self, name: str) -> int:
+        if name in self._var_slots:
+            return self._var_slots[name]
+
+        # Built-in series and runtime values
+        if name in PRICE_SOURCES or name in ('bar_index', 'strategy.position_size'):
+            slot = self._new_slot()
+            self.plan.source_slots[name] = slot
+            self._var_slots[name] = slot
+            return slot
+
+        variables = self.strategy.variables
+        inputs = self.strategy.inputs
+
+        if name in self.overrides or name in inputs:
+            default = inputs[name].get('defval', 0) if name in inputs else None
+            slot = self._bind_input(name, default)
+        elif name in variables:
+            value = variables[name]
+            if isinstance(value, dict) and str(value.get('function', '')).startswith('input'):
+                params = value.get('params', [])
+                slot = self._bind_input(name, params[0] if params else None)
+            elif name in self._compiling:
+                # Self-referencing assignment (e.g. x := x + 1) is not supported
+                return self._constant(None)
+            else:
+                self._compiling.add(name)
+                slot = self._compile_node(value)
+                self._compiling.discard(name)
+        else:
+            slot = self._constant(None)
+
+        self._var_slots[name] = slot
+        return slot
+
+    def _bind_input(self, name: str, default: Any) -> int:
+        # Inputs get their own slot: the value is bound at execution time
+        slot = self._new_slot()
+        self.plan.constants[slot] = default
+        self.plan.input_slots[name] = slot
+        return slot
+
+
+def compile_strategy(strategy: ParsedStrategy, overrides: Optional[set] = None) -> CompiledStrategy:
+    """Compile a parsed strategy into an evaluation plan"""
+    return PineCompiler(strategy, overrides).compile()
@@ -4,12 +4,19 @@ Executes parsed Pine Script strategies
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 from loguru import logger
 
 from algo_trader.strategies.pine_parser import ParsedStrategy
 from algo_trader.strategies.indicators import Indicators
+from algo_trader.strategies.streaming_indicators import STREAMING_INDICATORS, create_streaming_indicator
+from algo_trader.strategies.pine_compiler import (
+    CompiledStrategy, PINE_FUNCTIONS, OPERATORS, compile_strategy, call_pine_function, select, history
+)
+from algo_trader.strategies.indicator_cache import IndicatorCache
+from algo_trader.data.bar_buffer import BarBuffer
+from algo_trader.data.bars import Bars, as_frame
 from algo_trader.core.strategy_engine import Signal, SignalType
 
 
@@ -19,7 +26,10 @@ class PineScriptInterpreter:
     Converts parsed strategy into trading signals
     """
 
-    def __init__(self, strategy: ParsedStrategy):
+    # Minimum number of bars kept in the live ring buffer
+    MIN_BUFFER_BARS = 100
+
+    def __init__(self, strategy: ParsedStrategy, indicator_cache: Optional[IndicatorCache] = None):
         self.strategy = strategy
         self.indicators = Indicators()
         self.variables = {}
@@ -27,6 +37,22 @@ class PineScriptInterpreter:
         self.current_bar = 0
         self.position = 0  # Current position: 1 = long, -1 = short, 0 = flat
 
+        # Live mode state: ring buffer of recent bars + streaming indicators
+        self._bars: Optional[BarBuffer] = None
+        self._streams: Dict[tuple, Dict] = {}
+        self._data_offset = 0  # bar_index of the first loaded bar (before live mode)
+
+        # Compiled evaluation plan (built lazily, rebuilt when new inputs are overridden)
+        self._plan: Optional[CompiledStrategy] = None
+        self._overrides: set = set()
+        self._conditions = ([], [])
+        self._resolving: set = set()
+
+        # Indicator results for the current bars, keyed by call signature.
+        # A cache passed in is shared (e.g. per symbol) and cleared by its owner.
+        self._owns_cache = indicator_cache is None
+        self.indicator_cache = indicator_cache if indicator_cache is not None else IndicatorCache()
+
         # Initialize variables from strategy
         self._init_variables()
 
@@ -43,21 +69,46 @@ class PineScriptInterpreter:
     def set_input(self, name: str, value: Any):
         """Set input parameter value"""
         self.variables[name] = value
+        if self._plan is not None and name not in self._plan.input_slots:
+            self._plan = None
+        self._overrides.add(name)
+
+    @property
+    def plan(self) -> CompiledStrategy:
+        """Compiled evaluation plan for the strategy"""
+        if self._plan is None:
+            self._plan = compile_strategy(self.strategy, self._overrides)
+        return self._plan
+
+    def _plan_inputs(self) -> Dict[str, Any]:
+        """Current values for the plan's input slots"""
+        return {
+            name: self.variables[name] for name in self.plan.input_slots
+            if name in self.variables and not isinstance(self.variables[name], (dict, list))
+        }
 
-    def load_data(self, data: pd.DataFrame):
+    def load_data(self, data: Union[pd.DataFrame, Bars], bar_offset: int = 0):
         """
         Load OHLCV data for strategy execution
         DataFrame must have columns: open, high, low, close, volume
-        Index should be datetime
+        Index should be datetime; `bar_offset` is the bar_index of its first
+        row when it is a window of a longer history.
         """
+        data = as_frame(data)
         required_columns = ['open', 'high', 'low', 'close', 'volume']
         for col in required_columns:
             if col not in data.columns:
                 raise ValueError(f"Missing required column: {col}")
 
-        self.data = data.copy()
+        # One float64 copy: Bars arrive as float32 views, indicators need full precision
+        self.data = data.astype({col: float for col in required_columns})
         self.data.columns = self.data.columns.str.lower()
 
+        # Reloading history leaves live mode
+        self.stop_live()
+        self._data_offset = bar_offset
+        self._invalidate_cache()
+
         # Add calculated price columns
         self.data['hl2'] = (self.data['high'] + self.data['low']) / 2
         self.data['hlc3'] = (self.data['high'] + self.data['low'] + self.data['close']) / 3
@@ -67,85 +118,59 @@ class PineScriptInterpreter:
         # Calculate all indicators
         self._calculate_indicators()
 
+    def _invalidate_cache(self):
+        """Drop cached indicator results after the bars changed"""
+        if self._owns_cache:
+            self.indicator_cache.clear()
+
+    def _bar_offset(self) -> int:
+        """bar_index of the first row of self.data"""
+        return self._bars.total - len(self.data) if self._bars is not None else self._data_offset
+
+    def _scoped_cache(self):
+        """Indicator cache view for the current bars, keyed by their absolute positions"""
+        start = self._bar_offset()
+        return self.indicator_cache.scoped((start, start + len(self.data)))
+
     def _calculate_indicators(self):
-        """Pre-calculate all indicators used in strategy"""
-        for indicator in self.strategy.indicators:
-            func_name = indicator['function']
-            params = indicator['params']
+        """Evaluate the compiled plan: all indicators plus entry/exit conditions"""
+        slots = self.plan.execute(self.data, context=self, inputs=self._plan_inputs(),
+                                  position=self.position, bar_offset=self._bar_offset(),
+                                  cache=self._scoped_cache())
 
-            try:
-                result = self._call_indicator(func_name, params)
-                if result is not None:
-                    # Store result in variables
-                    var_name = f"_ind_{len(self.variables)}"
-                    self.variables[var_name] = result
-            except Exception as e:
-                logger.error(f"Error calculating indicator {func_name}: {e}")
+        for i, slot in enumerate(self.plan.indicator_slots):
+            if slots[slot] is not None:
+                # Store result in variables
+                self.variables[f"_ind_{i}"] = slots[slot]
+
+        self._conditions = self.plan.conditions(slots)
 
     def _call_indicator(self, func_name: str, params: List) -> Any:
         """Call an indicator function"""
         # Resolve parameters
         resolved_params = [self._resolve_value(p) for p in params]
+        return self.apply_indicator(func_name, params, resolved_params)
 
-        # Map Pine Script function to our implementation
-        indicator_map = {
-            'ta.sma': lambda p: self.indicators.sma(p[0], int(p[1])),
-            'ta.ema': lambda p: self.indicators.ema(p[0], int(p[1])),
-            'ta.wma': lambda p: self.indicators.wma(p[0], int(p[1])),
-            'ta.vwma': lambda p: self.indicators.vwma(p[0], self.data['volume'], int(p[1])),
-            'ta.rma': lambda p: self.indicators.rma(p[0], int(p[1])),
-            'ta.rsi': lambda p: self.indicators.rsi(p[0], int(p[1]) if len(p) > 1 else 14),
-            'ta.atr': lambda p: self.indicators.atr(self.data['high'], self.data['low'], self.data['close'], int(p[0]) if p else 14),
-            'ta.tr': lambda p: self.indicators.tr(self.data['high'], self.data['low'], self.data['close']),
-            'ta.highest': lambda p: self.indicators.highest(p[0], int(p[1])),
-            'ta.lowest': lambda p: self.indicators.lowest(p[0], int(p[1])),
-            'ta.crossover': lambda p: self.indicators.crossover(p[0], p[1]),
-            'ta.crossunder': lambda p: self.indicators.crossunder(p[0], p[1]),
-            'ta.change': lambda p: self.indicators.change(p[0], int(p[1]) if len(p) > 1 else 1),
-            'ta.mom': lambda p: self.indicators.mom(p[0], int(p[1]) if len(p) > 1 else 10),
-            'ta.roc': lambda p: self.indicators.roc(p[0], int(p[1]) if len(p) > 1 else 10),
-            'ta.vwap': lambda p: self.indicators.vwap(self.data['high'], self.data['low'], self.data['close'], self.data['volume']),
-            'ta.cci': lambda p: self.indicators.cci(self.data['high'], self.data['low'], self.data['close'], int(p[0]) if p else 20),
-            'ta.adx': lambda p: self.indicators.adx(self.data['high'], self.data['low'], self.data['close'], int(p[0]) if p else 14),
-        }
-
-        # Handle MACD (returns tuple)
-        if func_name == 'ta.macd':
-            source = resolved_params[0] if resolved_params else self.data['close']
-            fast = int(resolved_params[1]) if len(resolved_params) > 1 else 12
-            slow = int(resolved_params[2]) if len(resolved_params) > 2 else 26
-            signal = int(resolved_params[3]) if len(resolved_params) > 3 else 9
-            return self.indicators.macd(source, fast, slow, signal)
-
-        # Handle Bollinger Bands (returns tuple)
-        if func_name == 'ta.bb':
-            source = resolved_params[0] if resolved_params else self.data['close']
-            length = int(resolved_params[1]) if len(resolved_params) > 1 else 20
-            mult = float(resolved_params[2]) if len(resolved_params) > 2 else 2.0
-            return self.indicators.bollinger_bands(source, length, mult)
-
-        # Handle Stochastic (returns tuple)
-        if func_name == 'ta.stoch':
-            k_len = int(resolved_params[0]) if resolved_params else 14
-            k_smooth = int(resolved_params[1]) if len(resolved_params) > 1 else 1
-            d_smooth = int(resolved_params[2]) if len(resolved_params) > 2 else 3
-            return self.indicators.stoch(self.data['high'], self.data['low'], self.data['close'],
-                                        k_len, k_smooth, d_smooth)
-
-        # Handle SuperTrend (returns tuple)
-        if func_name == 'ta.supertrend':
-            length = int(resolved_params[0]) if resolved_params else 10
-            mult = float(resolved_params[1]) if len(resolved_params) > 1 else 3.0
-            return self.indicators.supertrend(self.data['high'], self.data['low'], self.data['close'],
-                                             length, mult)
+    def apply_indicator(self, func_name: str, params: List, resolved_params: List) -> Any:
+        """Apply an indicator function to already-resolved parameters"""
+        # Live mode: update streaming state with the newest bar only
+        if self._bars is not None and func_name in STREAMING_INDICATORS:
+            result = self._call_streaming(func_name, params, resolved_params)
+            if result is not None:
+                return result
 
-        # Call mapped indicator
-        if func_name in indicator_map:
-            return indicator_map[func_name](resolved_params)
+        if func_name in PINE_FUNCTIONS:
+            return call_pine_function(func_name, resolved_params, self.data, self._scoped_cache())
 
         logger.warning(f"Unknown indicator: {func_name}")
         return None
 
+    def get_indicator_stats(self) -> Dict:
+        """Indicator cache hit/miss counters and subexpressions shared at compile time"""
+        stats = self.indicator_cache.stats()
+        stats['shared_steps'] = self.plan.shared_steps
+        return stats
+
     def _resolve_value(self, value: Any) -> Any:
         """Resolve a value (variable reference, literal, or expression)"""
         if value is None:
@@ -164,6 +189,12 @@ class PineScriptInterpreter:
             # Variable reference
             if 'var' in value:
                 var_name = value['var']
+
+                # History reference (e.g. close[1])
+                if 'index' in value:
+                    return history(self._resolve_value({'var': var_name}),
+                                   self._resolve_value(value['index']))
+
                 # Built-in price variables
                 if var_name in ('open', 'high', 'low', 'close', 'volume',
                                'hl2', 'hlc3', 'ohlc4', 'hlcc4'):
@@ -171,15 +202,25 @@ class PineScriptInterpreter:
 
                 # Built-in variables
                 if var_name == 'bar_index':
-                    return pd.Series(range(len(self.data)), index=self.data.index)
+                    start = self._bar_offset()
+                    return pd.Series(range(start, start + len(self.data)), index=self.data.index)
 
                 # Strategy position
                 if var_name == 'strategy.position_size':
                     return self.position
 
-                # User variables
+                # User variables (expressions are evaluated on reference)
                 if var_name in self.variables:
-                    return self.variables[var_name]
+                    var_value = self.variables[var_name]
+                    if isinstance(var_value, (dict, list)):
+                        if var_name in self._resolving:
+                            return None  # Self-referencing assignment
+                        self._resolving.add(var_name)
+                        try:
+                            return self._resolve_value(var_value)
+                        finally:
+                            self._resolving.discard(var_name)
+                    return var_value
 
                 return None
 
@@ -193,70 +234,245 @@ class PineScriptInterpreter:
 
             # Ternary
             if 'ternary' in value:
-                condition = self._resolve_value(value['condition'])
-                if self._is_true(condition):
-                    return self._resolve_value(value['true'])
-                else:
-                    return self._resolve_value(value['false'])
+                return select(self._resolve_value(value['condition']),
+                              self._resolve_value(value['true']),
+                              self._resolve_value(value['false']))
 
         return value
 
     def _eval_operation(self, expr: Dict) -> Any:
         """Evaluate a binary or unary operation"""
-        op = expr['op']
+        op = OPERATORS.get(expr['op'])
+        if op is None:
+            return None
 
         # Unary operations
-        if op == 'neg':
-            return -self._resolve_value(expr['value'])
-        if op == 'not':
-            return ~self._resolve_value(expr['value'])
+        if expr['op'] in ('neg', 'not'):
+            return op(self._resolve_value(expr['value']))
 
         # Binary operations
-        left = self._resolve_value(expr['left'])
-        right = self._resolve_value(expr['right'])
-
-        # Arithmetic
-        if op == '+':
-            return left + right
-        if op == '-':
-            return left - right
-        if op == '*':
-            return left * right
-        if op == '/':
-            return left / right
-        if op == '%':
-            return left % right
-
-        # Comparison
-        if op == '==':
-            return left == right
-        if op == '!=':
-            return left != right
-        if op == '>':
-            return left > right
-        if op == '<':
-            return left < right
-        if op == '>=':
-            return left >= right
-        if op == '<=':
-            return left <= right
-
-        # Logical
-        if op == 'and':
-            return left & right
-        if op == 'or':
-            return left | right
-
-        return None
+        return op(self._resolve_value(expr['left']), self._resolve_value(expr['right']))
 
     def _is_true(self, value: Any) -> bool:
         """Check if a value is truthy"""
         if isinstance(value, pd.Series):
             return value.iloc[-1] if len(value) > 0 else False
+        if isinstance(value, np.ndarray):
+            return bool(value[-1]) if len(value) > 0 else False
         if isinstance(value, (np.bool_, bool)):
             return bool(value)
         return bool(value)
 
+    @property
+    def buffer_capacity(self) -> int:
+        """Bars the live ring buffer needs to hold (twice the longest indicator lookback)"""
+        return max(self.MIN_BUFFER_BARS, 2 * self._max_lookback())
+
+    @property
+    def is_live(self) -> bool:
+        return self._bars is not None
+
+    def start_live(self, bars: Optional[BarBuffer] = None):
+        """
+        Switch to live mode: prime streaming indicators and fill the ring buffer
+
+        `bars` is a buffer shared with other strategies on the symbol; its
+        newest bar must be the last bar of the loaded data. Without it the
+        interpreter creates its own buffer from the loaded data.
+        """
+        history = self.data
+        self._streams = {}
+
+        # Prime streaming indicators over the full loaded history
+        for node in self._iter_indicator_calls():
+            try:
+                resolved_params = [self._resolve_value(p) for p in node.get('params', [])]
+                self._call_streaming(node['function'], node.get('params', []),
+                                     resolved_params, prime=True)
+            except Exception as e:
+                logger.error(f"Error priming indicator {node.get('function')}: {e}")
+
+        if bars is None:
+            bars = BarBuffer(self.buffer_capacity)
+            bars.load(history)
+            bars.total += self._data_offset
+        self._bars = bars
+
+        for key, stream in self._streams.items():
+            for column, values in zip(stream['columns'], stream['history']):
+                self._bars.load_column(column, values)
+            stream['history'] = None
+            stream['bar'] = self._bars.total
+
+        logger.debug(f"Live mode started with {self._bars.capacity}-bar buffer, "
+                     f"{len(self._streams)} streaming indicators")
+
+    def _iter_indicator_calls(self):
+        """Yield every indicator call node in the strategy"""
+        roots = list(self.strategy.indicators)
+        roots += list(self.strategy.variables.values())
+        roots += list(self.strategy.conditions.values())
+        roots += [c.get('params', {}) for c in self.strategy.entry_conditions]
+        roots += [c.get('params', {}) for c in self.strategy.exit_conditions]
+        for root in roots:
+            yield from self._walk_indicator_calls(root)
+
+    def _walk_indicator_calls(self, node: Any):
+        if isinstance(node, dict):
+            if isinstance(node.get('function'), str) and node['function'].startswith('ta.'):
+                yield node
+            for child in node.values():
+                yield from self._walk_indicator_calls(child)
+        elif isinstance(node, list):
+            for child in node:
+                yield from self._walk_indicator_calls(child)
+
+    def _max_lookback(self) -> int:
+        """Largest bar lookback of any indicator call (nested lengths add up)"""
+        def lookback(node: Any) -> int:
+            if isinstance(node, list):
+                return max((lookback(n) for n in node), default=0)
+            if not isinstance(node, dict):
+                return 0
+            if 'function' in node:
+                own = 0
+                for p in node.get('params', []):
+                    value = self._resolve_value(p) if isinstance(p, dict) and 'var' in p else p
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        own += int(value)
+                return own + lookback(node.get('params', []))
+            return max((lookback(v) for v in node.values()), default=0)
+
+        return max((lookback(n) for n in self._iter_indicator_calls()), default=0)
+
+    def _node_key(self, node: Any) -> Any:
+        """Hashable structural key for an AST node"""
+        if isinstance(node, dict):
+            return tuple(sorted((k, self._node_key(v)) for k, v in node.items()))
+        if isinstance(node, list):
+            return tuple(self._node_key(v) for v in node)
+        return node
+
+    def _streaming_setup(self, func_name: str, p: List) -> Optional[tuple]:
+        """Constructor args and per-bar input series for a streaming indicator"""
+        hlc = [self.data['high'], self.data['low'], self.data['close']]
+
+        if func_name in ('ta.sma', 'ta.ema', 'ta.wma', 'ta.rma', 'ta.highest', 'ta.lowest'):
+            return (int(p[1]),), [p[0]]
+        if func_name == 'ta.vwma':
+            return (int(p[1]),), [p[0], self.data['volume']]
+        if func_name == 'ta.rsi':
+            return (int(p[1]) if len(p) > 1 else 14,), [p[0]]
+        if func_name == 'ta.atr':
+            return (int(p[0]) if p else 14,), hlc
+        if func_name == 'ta.tr':
+            return (), hlc
+        if func_name == 'ta.adx':
+            return (int(p[0]) if p else 14,), hlc
+        if func_name == 'ta.cci':
+            return (int(p[0]) if p else 20,), hlc
+        if func_name == 'ta.vwap':
+            return (), hlc + [self.data['volume']]
+        if func_name == 'ta.macd':
+            source = p[0] if p else self.data['close']
+            fast = int(p[1]) if len(p) > 1 else 12
+            slow = int(p[2]) if len(p) > 2 else 26
+            signal = int(p[3]) if len(p) > 3 else 9
+            return (fast, slow, signal), [source]
+        if func_name == 'ta.bb':
+            source = p[0] if p else self.data['close']
+            length = int(p[1]) if len(p) > 1 else 20
+            mult = float(p[2]) if len(p) > 2 else 2.0
+            return (length, mult), [source]
+        if func_name == 'ta.stoch':
+            k_len = int(p[0]) if p else 14
+            k_smooth = int(p[1]) if len(p) > 1 else 1
+            d_smooth = int(p[2]) if len(p) > 2 else 3
+            return (k_len, k_smooth, d_smooth), hlc
+        if func_name == 'ta.supertrend':
+            length = int(p[0]) if p else 10
+            mult = float(p[1]) if len(p) > 1 else 3.0
+            return (length, mult), hlc
+
+        return None
+
+    def _call_streaming(self, func_name: str, params: List, resolved_params: List,
+                        prime: bool = False) -> Any:
+        """
+        Evaluate an indicator through its streaming state
+        Each distinct call is updated once per bar; its outputs are kept in
+        the bar buffer so the returned Series cover the whole window.
+        """
+        setup = self._streaming_setup(func_name, resolved_params)
+        if setup is None:
+            return None
+        ctor_args, inputs = setup
+        if not all(isinstance(s, (pd.Series, np.ndarray)) for s in inputs):
+            return None
+
+        key = (func_name, self._node_key(params), ctor_args)
+        stream = self._streams.get(key)
+        if stream is not None and prime:
+            return None  # Repeated call, already primed
+
+        if stream is None:
+            indicator = create_streaming_indicator(func_name, *ctor_args)
+            stream = {'indicator': indicator, 'columns': None, 'history': None, 'bar': 0}
+            self._streams[key] = stream
+
+            # Feed history (all bars when priming, all but the newest when live)
+            arrays = [np.asarray(s, dtype=float) for s in inputs]
+            count = len(arrays[0]) if prime else len(arrays[0]) - 1
+            outputs = [self._as_tuple(indicator.update(*(a[i] for a in arrays)))
+                       for i in range(count)]
+            width = len(self._as_tuple(indicator.value))
+            # Columns are per interpreter: a shared buffer holds other strategies' streams too
+            stream['columns'] = [(id(self), key, j) for j in range(width)]
+            history = [np.array([o[j] for o in outputs], dtype=float) for j in range(width)]
+
+            if prime:
+                stream['history'] = history
+                return None
+
+            for column, values in zip(stream['columns'], history):
+                self._bars.load_column(column, values)
+            stream['bar'] = self._bars.total - 1
+
+        # Consume each bar exactly once (normally just the newest one; more when
+        # the results of earlier bars came from a shared cache)
+        missed = min(self._bars.total - stream['bar'], len(self._bars))
+        if missed == 1:
+            values = self._as_tuple(stream['indicator'].update(
+                *(float(np.asarray(s)[-1]) for s in inputs)))
+            for column, value in zip(stream['columns'], values):
+                self._bars.set_last(column, value)
+        elif missed > 1:
+            arrays = [np.asarray(s, dtype=float)[-missed:] for s in inputs]
+            outputs = [self._as_tuple(stream['indicator'].update(*(a[i] for a in arrays)))
+                       for i in range(missed)]
+            for j, column in enumerate(stream['columns']):
+                values = self._bars.view(column).copy()
+                values[-missed:] = [o[j] for o in outputs]
+                self._bars.load_column(column, values)
+        stream['bar'] = self._bars.total
+
+        series = [pd.Series(self._bars.view(column), index=self.data.index)
+                  for column in stream['columns']]
+        return tuple(series) if len(series) > 1 else series[0]
+
+    def stop_live(self):
+        """Leave live mode, removing this interpreter's columns from the bar buffer"""
+        if self._bars is not None:
+            for stream in self._streams.values():
+                for column in stream['columns'] or ():
+                    self._bars.remove_column(column)
+        self._bars = None
+        self._streams = {}
+
+    @staticmethod
+    def _as_tuple(value: Any) -> tuple:
+        return value if isinstance(value, tuple) else (value,)
+
     def process_candle(self, symbol: str, candle: Dict) -> Optional[Signal]:
         """
         Process a new candle and generate signals
@@ -266,50 +482,57 @@ class PineScriptInterpreter:
         if self.data is None:
             return None
 
-        # Append new candle to data
-        new_row = pd.DataFrame([{
-            'open': candle['open'],
-            'high': candle['high'],
-            'low': candle['low'],
-            'close': candle['close'],
-            'volume': candle['volume']
-        }], index=[candle.get('time', datetime.now())])
+        # First live candle: move history into the ring buffer
+        if self._bars is None:
+            self.start_live()
 
-        self.data = pd.concat([self.data, new_row])
+        # Append new candle; work on the fixed-size window only
+        self._bars.append(
+            candle.get('time', datetime.now()),
+            candle['open'], candle['high'], candle['low'],
+            candle['close'], candle['volume']
+        )
+        return self.evaluate_bar(symbol)
 
-        # Recalculate price columns
-        self.data['hl2'] = (self.data['high'] + self.data['low']) / 2
-        self.data['hlc3'] = (self.data['high'] + self.data['low'] + self.data['close']) / 3
-        self.data['ohlc4'] = (self.data['open'] + self.data['high'] + self.data['low'] + self.data['close']) / 4
+    def evaluate_bar(self, symbol: str, window: Optional[pd.DataFrame] = None) -> Signal:
+        """
+        Generate the signal for the newest bar in the live buffer
+
+        Used directly when the buffer is shared and its owner appends the
+        candle; `window` is the buffer's to_frame() if already built.
+        """
+        self.data = window if window is not None else self._bars.to_frame()
+        self._invalidate_cache()
 
-        # Recalculate indicators
+        # Recalculate indicators (streaming ones update incrementally)
         self._calculate_indicators()
 
-        self.current_bar = len(self.data) - 1
+        self.current_bar = self._bars.total - 1
+
+        entry_values, exit_values = self._conditions
 
         # Check entry conditions
-        for entry in self.strategy.entry_conditions:
-            signal = self._check_entry(entry, symbol)
+        for entry, condition in zip(self.strategy.entry_conditions, entry_values):
+            signal = self._check_entry(entry, symbol, condition)
             if signal:
                 return signal
 
         # Check exit conditions
-        for exit_cond in self.strategy.exit_conditions:
-            signal = self._check_exit(exit_cond, symbol)
+        for exit_cond, condition in zip(self.strategy.exit_conditions, exit_values):
+            signal = self._check_exit(exit_cond, symbol, condition)
             if signal:
                 return signal
 
         return Signal(signal_type=SignalType.NONE, symbol=symbol)
 
-    def _check_entry(self, entry: Dict, symbol: str) -> Optional[Signal]:
-        """Check entry condition and generate signal"""
+    def _check_entry(self, entry: Dict, symbol: str, condition: Any = True) -> Optional[Signal]:
+        """Check entry condition (evaluated `when` value) and generate signal"""
         params = entry.get('params', {})
         direction = params.get('direction', 'long')
 
         # Check when condition if present
-        when_cond = params.get('when')
-        if when_cond:
-            if not self._is_true(self._resolve_value(when_cond)):
+        if params.get('when'):
+            if not self._is_true(condition):
                 return None
 
         # Determine signal type
@@ -339,15 +562,14 @@ class PineScriptInterpreter:
             target=params.get('limit')
         )
 
-    def _check_exit(self, exit_cond: Dict, symbol: str) -> Optional[Signal]:
-        """Check exit condition and generate signal"""
+    def _check_exit(self, exit_cond: Dict, symbol: str, condition: Any = True) -> Optional[Signal]:
+        """Check exit condition (evaluated `when` value) and generate signal"""
         func_name = exit_cond.get('function', '')
         params = exit_cond.get('params', {})
 
         # Check when condition if present
-        when_cond = params.get('when')
-        if when_cond:
-            if not self._is_true(self._resolve_value(when_cond)):
+        if params.get('when'):
+            if not self._is_true(condition):
                 return None
 
         # strategy.close_all
@@ -381,14 +603,23 @@ class PineScriptInterpreter:
 
         return None
 
-    def run_backtest(self, initial_capital: float = 100000) -> Dict:
+    def run_backtest(self, initial_capital: float = 100000, vectorized: bool = True) -> Dict:
         """
         Run backtest on loaded data
         Returns backtest results
+
+        Args:
+            initial_capital: Starting capital
+            vectorized: Evaluate every condition once into boolean arrays and
+                        step a position state machine over them (default).
+                        False re-evaluates conditions bar by bar.
         """
         if self.data is None:
             return {'error': 'No data loaded'}
 
+        if vectorized:
+            return self._run_vectorized_backtest(initial_capital)
+
         trades = []
         equity = initial_capital
         equity_curve = [initial_capital]
@@ -462,6 +693,127 @@ class PineScriptInterpreter:
 
             equity_curve.append(equity)
 
+        return self._backtest_metrics(trades, equity, equity_curve, initial_capital)
+
+    def _condition_array(self, value: Any, length: int) -> np.ndarray:
+        """Evaluated `when` value as a boolean array (scalars broadcast)"""
+        if isinstance(value, (pd.Series, np.ndarray)):
+            values = np.asarray(value)
+            mask = np.zeros(length, dtype=bool)
+            count = min(len(values), length)
+            mask[:count] = values[:count].astype(bool)
+            return mask
+        return np.full(length, bool(value))
+
+    def _signal_arrays(self) -> tuple:
+        """
+        Per-bar entry/exit arrays from the evaluated conditions
+        Returns (entry_any, entry_dir, directions, exit_any); entry_dir is the
+        direction code (1 long, -1 short) of the first entry that holds.
+        """
+        entry_values, exit_values = self._conditions
+        n = len(self.data)
+
+        entry_any = np.zeros(n, dtype=bool)
+        entry_dir = np.zeros(n, dtype=int)
+        directions = {}
+        entries = list(zip(self.strategy.entry_conditions, entry_values))
+        for entry, value in reversed(entries):
+            params = entry.get('params', {})
+            direction = params.get('direction', 'long')
+            mask = self._condition_array(value, n)
+            code = 1 if direction == 'long' else -1
+            directions[code] = direction
+            entry_any |= mask
+            entry_dir = np.where(mask, code, entry_dir)
+
+        exit_any = np.zeros(n, dtype=bool)
+        for value in exit_values:
+            exit_any |= self._condition_array(value, n)
+
+        return entry_any, entry_dir, directions, exit_any
+
+    def generate_signals(self) -> pd.Series:
+        """
+        Per-bar signals for BacktestSimulator: 'BUY' / 'SELL' where an entry
+        holds, else 'EXIT' where an exit holds, else None
+        """
+        if self.data is None:
+            return pd.Series(dtype=object)
+
+        self._calculate_indicators()
+        entry_any, entry_dir, directions, exit_any = self._signal_arrays()
+
+        signals = np.full(len(self.data), None, dtype=object)
+        signals[exit_any] = 'EXIT'
+        signals[entry_any & (entry_dir == 1)] = 'BUY'
+        signals[entry_any & (entry_dir == -1)] = 'SELL'
+        return pd.Series(signals, index=self.data.index)
+
+    def _run_vectorized_backtest(self, initial_capital: float) -> Dict:
+        """
+        Backtest from precomputed condition arrays
+        Same entry/exit rules as the bar loop: enter on the first true entry
+        while flat, exit (possibly on the entry bar) on any true exit.
+        """
+        self._calculate_indicators()
+        entry_any, entry_dir, directions, exit_any = self._signal_arrays()
+
+        n = len(self.data)
+        close = self.data['close'].to_numpy()
+        index = self.data.index
+
+        # Bar 0 is never traded
+        entry_bars = np.flatnonzero(entry_any[1:]) + 1
+        exit_bars = np.flatnonzero(exit_any[1:]) + 1
+
+        trades = []
+        pnl_by_bar = np.zeros(n)
+        bar = 1
+        while bar < n:
+            k = np.searchsorted(entry_bars, bar)
+            if k >= len(entry_bars):
+                break
+            entry_bar = entry_bars[k]
+            position = entry_dir[entry_bar]
+            entry_price = close[entry_bar]
+            trades.append({
+                'type': 'entry',
+                'direction': directions[position],
+                'price': entry_price,
+                'time': index[entry_bar],
+                'bar': int(entry_bar)
+            })
+
+            # Exit can fire on the entry bar itself
+            k = np.searchsorted(exit_bars, entry_bar)
+            if k >= len(exit_bars):
+                break
+            exit_bar = exit_bars[k]
+            exit_price = close[exit_bar]
+            pnl = (exit_price - entry_price) * position
+            pnl_by_bar[exit_bar] += pnl
+            trades.append({
+                'type': 'exit',
+                'price': exit_price,
+                'pnl': pnl,
+                'time': index[exit_bar],
+                'bar': int(exit_bar)
+            })
+            bar = exit_bar + 1
+
+        self.current_bar = n - 1
+
+        # Running sum seeded with the capital adds P&L in the same order as the bar loop
+        pnl_by_bar[:1] = initial_capital
+        equity_curve = [initial_capital] + list(np.cumsum(pnl_by_bar)[1:])
+        equity = equity_curve[-1]
+
+        return self._backtest_metrics(trades, equity, equity_curve, initial_capital)
+
+    def _backtest_metrics(self, trades: List[Dict], equity: float,
+                          equity_curve: List[float], initial_capital: float) -> Dict:
+        """Summary statistics for a backtest run"""
         # Calculate metrics
         winning_trades = [t for t in trades if t.get('pnl', 0) > 0]
         losing_trades = [t for t in trades if t.get('pnl', 0) < 0]
@@ -661,6 +661,12 @@ class PineScriptParser:
         # Built-in variable
         if token.type == TokenType.BUILTIN_VAR:
             self._advance()
+            # Check for history access (e.g. close[1])
+            if self._current().type == TokenType.LBRACKET:
+                self._advance()
+                index = self._parse_expression()
+                self._expect(TokenType.RBRACKET)
+                return {'var': token.value, 'index': index}
             return {'var': token.value}
 
         # Built-in function
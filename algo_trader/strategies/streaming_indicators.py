@@ -0,0 +1,693 @@
+"""
+Streaming Technical Indicators
+Incremental versions of the Indicators library for live candle processing
+"""
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple, Type
+
+
+NAN = float('nan')
+
+
+def _is_nan(value: float) -> bool:
+    return value != value
+
+
+def _div(numerator: float, denominator: float) -> float:
+    """Division with pandas/NumPy semantics (x/0 -> inf, 0/0 -> nan)"""
+    if denominator == 0:
+        if numerator == 0 or _is_nan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+def _max_skipna(*values: float) -> float:
+    """Max ignoring NaN (pandas max(axis=1) semantics)"""
+    valid = [v for v in values if not _is_nan(v)]
+    return max(valid) if valid else NAN
+
+
+class StreamingIndicator:
+    """
+    Base class for streaming indicators
+
+    Each indicator consumes one bar per update() call and returns the new
+    value in constant time. Outputs match the batch Indicators functions
+    bar-for-bar, including the NaN warm-up period.
+    """
+
+    def __init__(self):
+        self.value = NAN
+
+    def update(self, *args):
+        raise NotImplementedError
+
+    def reset(self):
+        """Reset the indicator to its initial state"""
+        self.__init__(*self._init_args())
+
+    def _init_args(self) -> tuple:
+        return ()
+
+
+class _RollingWindow:
+    """
+    Fixed-length window with running sum and variance
+    Follows pandas rolling(window=length) semantics: a value is only
+    available once the window is full and contains no NaN, and a window of
+    identical values (e.g. all zeros) sums exactly, without running-sum drift.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.values = deque()
+        self.nan_count = 0
+        self.count = 0  # Non-NaN values in window
+        self.sum = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._pushes = 0
+        self._last = NAN
+        self._same = 0  # Trailing run of values equal to _last
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.length and self.nan_count == 0
+
+    def push(self, x: float) -> float:
+        """Add a value, returns the value dropped from the window (or NaN)"""
+        removed = NAN
+        if len(self.values) == self.length:
+            removed = self.values.popleft()
+            if _is_nan(removed):
+                self.nan_count -= 1
+            else:
+                self._remove(removed)
+
+        self.values.append(x)
+        if _is_nan(x):
+            self.nan_count += 1
+        else:
+            self._add(x)
+
+        if x == self._last:
+            self._same += 1
+        else:
+            self._last = x
+            self._same = 1
+
+        # Resync running sums every time the window wraps to stop floating point drift
+        self._pushes += 1
+        if self._pushes >= self.length:
+            self._resync()
+
+        return removed
+
+    def _add(self, x: float):
+        self.count += 1
+        self.sum += x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def _remove(self, x: float):
+        self.count -= 1
+        self.sum -= x
+        if self.count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (x - self.mean)
+
+    def _resync(self):
+        valid = [v for v in self.values if not _is_nan(v)]
+        self.count = len(valid)
+        self.sum = math.fsum(valid)
+        self.mean = self.sum / self.count if self.count else 0.0
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in valid)
+        self._pushes = 0
+
+    @property
+    def flat(self) -> bool:
+        """Every value in the window is the same"""
+        return self._same >= self.length
+
+    def window_mean(self) -> float:
+        if not self.ready:
+            return NAN
+        return self._last if self.flat else self.sum / self.length
+
+    def window_sum(self) -> float:
+        if not self.ready:
+            return NAN
+        return self._last * self.length if self.flat else self.sum
+
+    def window_std(self) -> float:
+        """Sample standard deviation (ddof=1)"""
+        if not self.ready or self.length < 2:
+            return NAN
+        # Running M2 loses precision on near-flat windows; recompute exactly there
+        if self.m2 <= 1e-8 * self.mean * self.mean * self.length:
+            mean = math.fsum(self.values) / self.length
+            self.m2 = math.fsum((v - mean) ** 2 for v in self.values)
+        return math.sqrt(max(self.m2, 0.0) / (self.length - 1))
+
+
+class _RollingExtreme:
+    """Rolling max/min using a monotonic deque (amortized O(1))"""
+
+    def __init__(self, length: int, is_max: bool = True):
+        self.length = length
+        self.is_max = is_max
+        self._deque = deque()  # (index, value), monotonic
+        self._nans = deque()  # indices of NaN values inside the window
+        self._index = -1
+
+    def update(self, x: float) -> float:
+        self._index += 1
+        start = self._index - self.length + 1
+
+        while self._deque and self._deque[0][0] < start:
+            self._deque.popleft()
+        while self._nans and self._nans[0] < start:
+            self._nans.popleft()
+
+        if _is_nan(x):
+            self._nans.append(self._index)
+        else:
+            if self.is_max:
+                while self._deque and self._deque[-1][1] <= x:
+                    self._deque.pop()
+            else:
+                while self._deque and self._deque[-1][1] >= x:
+                    self._deque.pop()
+            self._deque.append((self._index, x))
+
+        if start < 0 or self._nans or not self._deque:
+            return NAN
+        return self._deque[0][1]
+
+
+class StreamingSMA(StreamingIndicator):
+    """Simple Moving Average - ta.sma()"""
+
+    def __init__(self, length: int):
+        super().__init__()
+        self.length = length
+        self._window = _RollingWindow(length)
+
+    def _init_args(self):
+        return (self.length,)
+
+    def update(self, x: float) -> float:
+        self._window.push(x)
+        self.value = self._window.window_mean()
+        return self.value
+
+
+class _StreamingEWM(StreamingIndicator):
+    """
+    Exponentially weighted mean matching pandas ewm(adjust=False)
+    NaN inputs hold the previous value and decay its weight.
+    """
+
+    def __init__(self, alpha: float):
+        super().__init__()
+        self.alpha = alpha
+        self._old_wt = 1.0
+
+    def update(self, x: float) -> float:
+        if _is_nan(self.value):
+            if not _is_nan(x):
+                self.value = x
+                self._old_wt = 1.0
+            return self.value
+
+        self._old_wt *= 1 - self.alpha
+        if not _is_nan(x):
+            if self.value != x:
+                self.value = (self._old_wt * self.value + self.alpha * x) / (self._old_wt + self.alpha)
+            self._old_wt = 1.0
+        return self.value
+
+
+class StreamingEMA(_StreamingEWM):
+    """Exponential Moving Average - ta.ema()"""
+
+    def __init__(self, length: int):
+        super().__init__(2 / (length + 1))
+        self.length = length
+
+    def _init_args(self):
+        return (self.length,)
+
+
+class StreamingRMA(_StreamingEWM):
+    """Running Moving Average (Wilder's smoothing) - ta.rma()"""
+
+    def __init__(self, length: int):
+        super().__init__(1 / length)
+        self.length = length
+
+    def _init_args(self):
+        return (self.length,)
+
+
+class StreamingWMA(StreamingIndicator):
+    """Weighted Moving Average - ta.wma()"""
+
+    def __init__(self, length: int):
+        super().__init__()
+        self.length = length
+        self._window = _RollingWindow(length)
+        self._weight_sum = length * (length + 1) / 2
+        self._weighted = NAN  # Sum of i * x_i over the current window
+
+    def _init_args(self):
+        return (self.length,)
+
+    def update(self, x: float) -> float:
+        prev_sum = self._window.sum if self._window.ready else NAN
+        self._window.push(x)
+
+        if not self._window.ready:
+            self._weighted = NAN
+        elif _is_nan(self._weighted) or _is_nan(prev_sum) or self._window._pushes == 0:
+            # Window just became valid (or was resynced) - compute from scratch
+            self._weighted = math.fsum(
+                (i + 1) * v for i, v in enumerate(self._window.values)
+            )
+        else:
+            # Every weight drops by one and the new value gets the top weight
+            self._weighted += self.length * x - prev_sum
+
+        self.value = self._weighted / self._weight_sum if self._window.ready else NAN
+        return self.value
+
+
+class StreamingVWMA(StreamingIndicator):
+    """Volume Weighted Moving Average - ta.vwma()"""
+
+    def __init__(self, length: int):
+        super().__init__()
+        self.length = length
+        self._pv = _RollingWindow(length)
+        self._volume = _RollingWindow(length)
+
+    def _init_args(self):
+        return (self.length,)
+
+    def update(self, x: float, volume: float) -> float:
+        self._pv.push(x * volume)
+        self._volume.push(volume)
+        self.value = _div(self._pv.window_sum(), self._volume.window_sum())
+        return self.value
+
+
+class StreamingRSI(StreamingIndicator):
+    """Relative Strength Index - ta.rsi()"""
+
+    def __init__(self, length: int = 14):
+        super().__init__()
+        self.length = length
+        self._prev = NAN
+        self._gain = _RollingWindow(length)
+        self._loss = _RollingWindow(length)
+
+    def _init_args(self):
+        return (self.length,)
+
+    def update(self, x: float) -> float:
+        delta = x - self._prev
+        self._prev = x
+        # NaN deltas count as zero gain/loss, same as Series.where(..., 0)
+        self._gain.push(delta if delta > 0 else 0.0)
+        self._loss.push(-delta if delta < 0 else 0.0)
+
+        rs = _div(self._gain.window_mean(), self._loss.window_mean())
+        self.value = 100 - _div(100, 1 + rs) if not _is_nan(rs) else NAN
+        return self.value
+
+
+class StreamingTR(StreamingIndicator):
+    """True Range - ta.tr()"""
+
+    def __init__(self):
+        super().__init__()
+        self._prev_close = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev_close = self._prev_close
+        self._prev_close = close
+        self.value = _max_skipna(high - low, abs(high - prev_close), abs(low - prev_close))
+        return self.value
+
+
+class StreamingATR(StreamingIndicator):
+    """Average True Range - ta.atr()"""
+
+    def __init__(self, length: int = 14):
+        super().__init__()
+        self.length = length
+        self._tr = StreamingTR()
+        self._rma = StreamingRMA(length)
+
+    def _init_args(self):
+        return (self.length,)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self.value = self._rma.update(self._tr.update(high, low, close))
+        return self.value
+
+
+class StreamingADX(StreamingIndicator):
+    """Average Directional Index - ta.adx()"""
+
+    def __init__(self, length: int = 14):
+        super().__init__()
+        self.length = length
+        self._prev_high = NAN
+        self._prev_low = NAN
+        self._tr = StreamingTR()
+        self._atr = StreamingRMA(length)
+        self._plus = StreamingRMA(length)
+        self._minus = StreamingRMA(length)
+        self._adx = StreamingRMA(length)
+
+    def _init_args(self):
+        return (self.length,)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        up_move = high - self._prev_high
+        down_move = self._prev_low - low
+        self._prev_high = high
+        self._prev_low = low
+
+        # minus_dm is filtered against the already-filtered plus_dm, as in Indicators.adx
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > plus_dm and down_move > 0) else 0.0
+
+        atr = self._atr.update(self._tr.update(high, low, close))
+        plus_di = 100 * _div(self._plus.update(plus_dm), atr)
+        minus_di = 100 * _div(self._minus.update(minus_dm), atr)
+
+        dx = 100 * _div(abs(plus_di - minus_di), plus_di + minus_di)
+        self.value = self._adx.update(dx)
+        return self.value
+
+
+class StreamingMACD(StreamingIndicator):
+    """MACD - ta.macd(), returns (macd, signal, histogram)"""
+
+    def __init__(self, fast_length: int = 12, slow_length: int = 26, signal_length: int = 9):
+        super().__init__()
+        self.fast_length = fast_length
+        self.slow_length = slow_length
+        self.signal_length = signal_length
+        self._fast = StreamingEMA(fast_length)
+        self._slow = StreamingEMA(slow_length)
+        self._signal = StreamingEMA(signal_length)
+        self.value = (NAN, NAN, NAN)
+
+    def _init_args(self):
+        return (self.fast_length, self.slow_length, self.signal_length)
+
+    def update(self, x: float) -> Tuple[float, float, float]:
+        macd_line = self._fast.update(x) - self._slow.update(x)
+        signal_line = self._signal.update(macd_line)
+        self.value = (macd_line, signal_line, macd_line - signal_line)
+        return self.value
+
+
+class StreamingBollingerBands(StreamingIndicator):
+    """Bollinger Bands - ta.bb(), returns (upper, basis, lower)"""
+
+    def __init__(self, length: int = 20, mult: float = 2.0):
+        super().__init__()
+        self.length = length
+        self.mult = mult
+        self._window = _RollingWindow(length)
+        self.value = (NAN, NAN, NAN)
+
+    def _init_args(self):
+        return (self.length, self.mult)
+
+    def update(self, x: float) -> Tuple[float, float, float]:
+        self._window.push(x)
+        basis = self._window.window_mean()
+        dev = self.mult * self._window.window_std()
+        self.value = (basis + dev, basis, basis - dev)
+        return self.value
+
+
+class StreamingStoch(StreamingIndicator):
+    """Stochastic Oscillator - ta.stoch(), returns (k, d)"""
+
+    def __init__(self, k_length: int = 14, k_smooth: int = 1, d_smooth: int = 3):
+        super().__init__()
+        self.k_length = k_length
+        self.k_smooth = k_smooth
+        self.d_smooth = d_smooth
+        self._lowest = _RollingExtreme(k_length, is_max=False)
+        self._highest = _RollingExtreme(k_length, is_max=True)
+        self._k = StreamingSMA(k_smooth)
+        self._d = StreamingSMA(d_smooth)
+        self.value = (NAN, NAN)
+
+    def _init_args(self):
+        return (self.k_length, self.k_smooth, self.d_smooth)
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        lowest_low = self._lowest.update(low)
+        highest_high = self._highest.update(high)
+        raw_k = 100 * _div(close - lowest_low, highest_high - lowest_low)
+        k = self._k.update(raw_k)
+        d = self._d.update(k)
+        self.value = (k, d)
+        return self.value
+
+
+class StreamingCCI(StreamingIndicator):
+    """
+    Commodity Channel Index - ta.cci()
+    Mean absolute deviation needs a pass over the window, so each update
+    costs O(length) - still independent of how much history has been seen.
+    """
+
+    def __init__(self, length: int = 20):
+        super().__init__()
+        self.length = length
+        self._window = _RollingWindow(length)
+
+    def _init_args(self):
+        return (self.length,)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tp = (high + low + close) / 3
+        self._window.push(tp)
+
+        if not self._window.ready:
+            self.value = NAN
+            return self.value
+
+        values = self._window.values
+        mean = math.fsum(values) / self.length
+        mad = math.fsum(abs(v - mean) for v in values) / self.length
+        self.value = _div(tp - mean, 0.015 * mad)
+        return self.value
+
+
+class StreamingSuperTrend(StreamingIndicator):
+    """
+    SuperTrend Indicator, returns (supertrend, direction)
+    Bands ratchet as on TradingView; direction 1 = up, -1 = down.
+    """
+
+    def __init__(self, length: int = 10, mult: float = 3.0):
+        super().__init__()
+        self.length = length
+        self.mult = mult
+        self._atr = StreamingATR(length)
+        self._prev_upper = NAN
+        self._prev_lower = NAN
+        self._prev_close = NAN
+        self._prev_supertrend = NAN
+        self.value = (NAN, NAN)
+
+    def _init_args(self):
+        return (self.length, self.mult)
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        hl2 = (high + low) / 2
+        atr = self._atr.update(high, low, close)
+        upper = hl2 + self.mult * atr
+        lower = hl2 - self.mult * atr
+        prev_close = self._prev_close
+        self._prev_close = close
+
+        if _is_nan(upper):
+            self._prev_upper = self._prev_lower = self._prev_supertrend = NAN
+            self.value = (NAN, NAN)
+            return self.value
+
+        prev_upper, prev_lower = self._prev_upper, self._prev_lower
+        if not _is_nan(prev_lower) and not (lower > prev_lower or prev_close < prev_lower):
+            lower = prev_lower
+        if not _is_nan(prev_upper) and not (upper < prev_upper or prev_close > prev_upper):
+            upper = prev_upper
+
+        if _is_nan(self._prev_supertrend):
+            direction = -1.0  # No previous bar: start in a downtrend
+        elif self._prev_supertrend == prev_upper:
+            direction = 1.0 if close > upper else -1.0
+        else:
+            direction = -1.0 if close < lower else 1.0
+
+        supertrend = lower if direction == 1.0 else upper
+        self._prev_upper = upper
+        self._prev_lower = lower
+        self._prev_supertrend = supertrend
+        self.value = (supertrend, direction)
+        return self.value
+
+
+class StreamingHighest(StreamingIndicator):
+    """Highest value over period - ta.highest()"""
+
+    def __init__(self, length: int):
+        super().__init__()
+        self.length = length
+        self._extreme = _RollingExtreme(length, is_max=True)
+
+    def _init_args(self):
+        return (self.length,)
+
+    def update(self, x: float) -> float:
+        self.value = self._extreme.update(x)
+        return self.value
+
+
+class StreamingLowest(StreamingIndicator):
+    """Lowest value over period - ta.lowest()"""
+
+    def __init__(self, length: int):
+        super().__init__()
+        self.length = length
+        self._extreme = _RollingExtreme(length, is_max=False)
+
+    def _init_args(self):
+        return (self.length,)
+
+    def update(self, x: float) -> float:
+        self.value = self._extreme.update(x)
+        return self.value
+
+
+class StreamingVWAP(StreamingIndicator):
+    """Volume Weighted Average Price - ta.vwap()"""
+
+    def __init__(self):
+        super().__init__()
+        self._cum_pv = 0.0
+        self._cum_volume = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        pv = (high + low + close) / 3 * volume
+        # cumsum() skips NaN entries but keeps NaN at that position
+        if _is_nan(pv) or _is_nan(volume):
+            self.value = NAN
+            if not _is_nan(pv):
+                self._cum_pv += pv
+            if not _is_nan(volume):
+                self._cum_volume += volume
+            return self.value
+
+        self._cum_pv += pv
+        self._cum_volume += volume
+        self.value = _div(self._cum_pv, self._cum_volume)
+        return self.value
+
+
+class StreamingOBV(StreamingIndicator):
+    """On Balance Volume - ta.obv()"""
+
+    def __init__(self):
+        super().__init__()
+        self._prev_close = NAN
+        self._total = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        delta = close - self._prev_close
+        self._prev_close = close
+
+        if _is_nan(delta) or _is_nan(volume):
+            self.value = NAN
+            return self.value
+
+        sign = 1.0 if delta > 0 else (-1.0 if delta < 0 else 0.0)
+        self._total += sign * volume
+        self.value = self._total
+        return self.value
+
+
+class StreamingMFI(StreamingIndicator):
+    """Money Flow Index - ta.mfi()"""
+
+    def __init__(self, length: int = 14):
+        super().__init__()
+        self.length = length
+        self._prev_tp = NAN
+        self._positive = _RollingWindow(length)
+        self._negative = _RollingWindow(length)
+
+    def _init_args(self):
+        return (self.length,)
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        tp = (high + low + close) / 3
+        mf = tp * volume
+        prev_tp = self._prev_tp
+        self._prev_tp = tp
+
+        self._positive.push(mf if tp > prev_tp else 0.0)
+        self._negative.push(mf if tp < prev_tp else 0.0)
+
+        ratio = _div(self._positive.window_sum(), self._negative.window_sum())
+        self.value = 100 - _div(100, 1 + ratio) if not _is_nan(ratio) else NAN
+        return self.value
+
+
+# Pine Script function name -> streaming implementation
+STREAMING_INDICATORS: Dict[str, Type[StreamingIndicator]] = {
+    'ta.sma': StreamingSMA,
+    'ta.ema': StreamingEMA,
+    'ta.wma': StreamingWMA,
+    'ta.vwma': StreamingVWMA,
+    'ta.rma': StreamingRMA,
+    'ta.rsi': StreamingRSI,
+    'ta.atr': StreamingATR,
+    'ta.tr': StreamingTR,
+    'ta.adx': StreamingADX,
+    'ta.macd': StreamingMACD,
+    'ta.bb': StreamingBollingerBands,
+    'ta.stoch': StreamingStoch,
+    'ta.cci': StreamingCCI,
+    'ta.supertrend': StreamingSuperTrend,
+    'ta.highest': StreamingHighest,
+    'ta.lowest': StreamingLowest,
+    'ta.vwap': StreamingVWAP,
+    'ta.obv': StreamingOBV,
+    'ta.mfi': StreamingMFI,
+}
+
+
+def create_streaming_indicator(func_name: str, *params) -> Optional[StreamingIndicator]:
+    """Create a streaming indicator for a Pine Script function name"""
+    indicator_cls = STREAMING_INDICATORS.get(func_name)
+    if indicator_cls is None:
+        return None
+    return indicator_cls(*params)
@@ -3,7 +3,7 @@ Advanced Interactive Chart Widget with Order Placement
 """
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Union
 from loguru import logger
 
 from PyQt6.QtWidgets import (
@@ -26,6 +26,8 @@ from matplotlib.lines import Line2D
 import matplotlib.dates as mdates
 import mplfinance as mpf
 
+from algo_trader.data.bars import Bars
+
 
 class OrderDialog(QDialog):
     """Dialog for placing orders from chart"""
@@ -515,8 +517,10 @@ class InteractiveChart(FigureCanvas):
 
         self.fig.tight_layout()
 
-    def plot_candlestick(self, data: List[Dict], symbol: str):
-        """Plot candlestick chart from OHLCV data"""
+    def plot_candlestick(self, data: Union[List[Dict], Bars], symbol: str):
+        """Plot candlestick chart from OHLCV data (candle dicts or Bars)"""
+        if isinstance(data, Bars):
+            data = data.to_candles()
         if not data:
             return
 
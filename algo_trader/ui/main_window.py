@@ -62,6 +62,9 @@ class MainWindow(QMainWindow):
         # Alert manager
         self.alert_manager = None
 
+        # Backtest results by content hash (created on first backtest)
+        self.backtest_cache = None
+
         self._init_ui()
         self._load_configured_brokers()
         self._setup_timers()
@@ -1008,31 +1011,34 @@ class MainWindow(QMainWindow):
     def _run_mtf_analysis(self, symbol: str):
         """Run MTF analysis in background thread"""
         try:
-            import yfinance as yf
-            import numpy as np
-
-            # Add .NS suffix for NSE stocks
-            yf_symbol = f"{symbol}.NS" if not symbol.endswith(('.NS', '.BSE')) else symbol
+            import pandas as pd
+            from algo_trader.data.historical import HistoricalDataManager
 
             self._mtf_log(f"Fetching data for {symbol}...")
 
-            # Fetch data for different timeframes
+            # Timeframes are derived from two cached Yahoo downloads: 5-minute bars
+            # (Yahoo keeps ~60 days) for intraday and daily bars for daily/weekly
             timeframes = {
-                "5 Min": ("5d", "5m"),
-                "15 Min": ("10d", "15m"),
-                "1 Hour": ("30d", "1h"),
-                "4 Hour": ("60d", "1h"),  # Approximate with 1h
-                "Daily": ("180d", "1d"),
-                "Weekly": ("2y", "1wk")
+                "5 Min": ("5minute", "5m", 5),
+                "15 Min": ("15minute", "5m", 10),
+                "1 Hour": ("60minute", "5m", 30),
+                "4 Hour": ("240minute", "5m", 59),
+                "Daily": ("day", "1d", 180),
+                "Weekly": ("week", "1d", 730)
             }
+            base_days = {"5m": 59, "1d": 730}
 
             results = {}
-            stock = yf.Ticker(yf_symbol)
+            data_manager = HistoricalDataManager()
 
-            for tf_name, (period, interval) in timeframes.items():
+            for tf_name, (timeframe, base_interval, days) in timeframes.items():
                 try:
-                    data = stock.history(period=period, interval=interval)
-                    if len(data) > 0:
+                    data = data_manager.get_timeframe_data(symbol, timeframe, days=base_days[base_interval],
+                                                           base_interval=base_interval, source="yahoo")
+                    if data is not None:
+                        data = data.loc[pd.Timestamp.now() - pd.Timedelta(days=days):]
+                    if data is not None and len(data) > 0:
+                        data = data.rename(columns=str.capitalize)
                         results[tf_name] = self._calculate_indicators(data, tf_name)
                         self._mtf_log(f"✓ {tf_name}: {len(data)} candles analyzed")
                     else:
@@ -5087,6 +5093,10 @@ For accurate Greeks, use live option data."""
         self.run_backtest_btn.clicked.connect(self._run_advanced_backtest)
         control_layout.addWidget(self.run_backtest_btn)
 
+        self.optimize_btn = QPushButton("⚙ Optimize Inputs")
+        self.optimize_btn.clicked.connect(self._run_optimizer)
+        control_layout.addWidget(self.optimize_btn)
+
         self.bt_realtime_mode = QCheckBox("Real-time Mode (Slow)")
         control_layout.addWidget(self.bt_realtime_mode)
 
@@ -5133,6 +5143,9 @@ For accurate Greeks, use live option data."""
         self.bt_stat_dd = QLabel("Max Drawdown: --")
         summary_layout.addWidget(self.bt_stat_dd)
 
+        self.bt_stat_mc = QLabel("Monte Carlo: --")
+        summary_layout.addWidget(self.bt_stat_mc)
+
         layout.addWidget(summary_group)
 
         # Bottom - Trade Log Table
@@ -7190,26 +7203,6 @@ For accurate Greeks, use live option data."""
             self.bt_progress.setText(f"Running backtest on {len(data)} candles...")
             QApplication.processEvents()
 
-            # Create strategy function for simulator
-            interpreter.load_data(data.set_index('datetime') if 'datetime' in data.columns else data)
-
-            def strategy_signal(row, idx, full_data):
-                """Generate strategy signal for each candle"""
-                try:
-                    # Update interpreter with current candle
-                    result = interpreter.process_candle({
-                        'open': row['open'],
-                        'high': row['high'],
-                        'low': row['low'],
-                        'close': row['close'],
-                        'volume': row.get('volume', 0)
-                    })
-                    if result and 'signal' in result:
-                        return result['signal']  # 'BUY' or 'SELL'
-                except Exception:
-                    pass
-                return None
-
             # Create and configure simulator
             simulator = BacktestSimulator(initial_capital=capital)
             simulator.set_risk_params(
@@ -7218,30 +7211,51 @@ For accurate Greeks, use live option data."""
                 trailing_sl=tsl_pct
             )
 
-            # Register progress callback
+            realtime = self.bt_realtime_mode.isChecked()
+
+            # Identical request (same candles, script and settings) - reuse the stored result
+            if self.backtest_cache is None:
+                from algo_trader.backtest.result_cache import BacktestResultCache
+                self.backtest_cache = BacktestResultCache()
+            cache_key = self.backtest_cache.make_key(data, strategy['pine_script'], settings=simulator,
+                                                     symbol=symbol)
+            cached = None if realtime else self.backtest_cache.get(cache_key)
+            if cached is not None:
+                simulator.trades = list(cached.trades)
+                self.bt_simulator = simulator  # Store for export
+                self._display_backtest_results(cached)
+                return
+
+            # Evaluate the strategy over all candles up front
+            interpreter.load_data(data.set_index('datetime') if 'datetime' in data.columns else data)
+            signals = interpreter.generate_signals().to_numpy(dtype=object)
+
+            # Register progress callback (throttled to ~10 updates a second)
             def on_progress(idx, total, time, price, equity, open_trades):
-                if idx % 50 == 0:
-                    self.bt_progress.setText(f"Processing: {idx}/{total} ({time.strftime('%Y-%m-%d') if hasattr(time, 'strftime') else time})")
-                    QApplication.processEvents()
+                self.bt_progress.setText(f"Processing: {idx + 1}/{total} ({time.strftime('%Y-%m-%d') if hasattr(time, 'strftime') else time})")
+                QApplication.processEvents()
 
             simulator.register_progress_callback(on_progress)
+            simulator.set_progress_interval(every_bars=0, every_ms=100)
+            simulator.set_silent(not realtime)
 
             # Get speed setting
             speed_text = self.bt_speed.currentText()
             speed = float(speed_text.replace('x', ''))
 
             # Run backtest
-            realtime = self.bt_realtime_mode.isChecked()
             simulator.set_speed(speed)
 
             self.bt_simulator = simulator  # Store for export
             result = simulator.run_backtest(
                 data=data,
-                strategy_func=strategy_signal,
+                signals=signals,
                 symbol=symbol,
                 strategy_name=strategy_name,
                 realtime_mode=realtime
             )
+            if len(result.equity_curve) == len(data):  # Not stopped early
+                self.backtest_cache.put(cache_key, result)
 
             # Update UI with results
             self._display_backtest_results(result)
@@ -7253,6 +7267,49 @@ For accurate Greeks, use live option data."""
             self.run_backtest_btn.setEnabled(True)
             self.bt_progress.setText("Complete")
 
+    def _run_optimizer(self):
+        """Open the parameter sweep optimizer for the selected strategy"""
+        strategy_name = self.bt_strategy_combo.currentText()
+        if not strategy_name:
+            QMessageBox.warning(self, "Error", "Please select a strategy")
+            return
+
+        symbol = self.bt_symbol.currentText().strip().upper()
+        if not symbol:
+            QMessageBox.warning(self, "Error", "Please enter a symbol")
+            return
+
+        strategy = self.db.get_strategy(strategy_name)
+        if not strategy:
+            QMessageBox.warning(self, "Error", "Strategy not found")
+            return
+
+        interval = "1d"
+        for key in ("1d", "1h", "15m", "5m"):
+            if key in self.bt_interval.currentText():
+                interval = key
+                break
+
+        self.bt_progress.setText("Fetching data...")
+        QApplication.processEvents()
+
+        try:
+            from algo_trader.data.historical import HistoricalDataManager
+            from algo_trader.ui.optimizer_dialog import OptimizerDialog
+
+            data = HistoricalDataManager().get_data_for_backtest(symbol, self.bt_days.value(), interval)
+            if data is None or len(data) == 0:
+                QMessageBox.warning(self, "Error", "Could not fetch historical data")
+                return
+
+            dialog = OptimizerDialog(strategy['pine_script'], data, self.bt_capital.value(), self)
+            self.bt_progress.setText("Ready")
+            dialog.exec()
+        except Exception as e:
+            logger.error(f"Optimizer error: {e}")
+            QMessageBox.warning(self, "Error", f"Optimizer failed: {str(e)}")
+            self.bt_progress.setText("Ready")
+
     def _display_backtest_results(self, result):
         """Display backtest results in UI"""
         # Update summary stats
@@ -7288,6 +7345,36 @@ For accurate Greeks, use live option data."""
         self.export_trades_btn.setEnabled(True)
         logger.info(f"Backtest complete: {result.total_trades} trades, P&L: ₹{result.total_pnl:.2f}")
 
+        self._display_monte_carlo(result)
+
+    def _display_monte_carlo(self, result):
+        """Resample the backtest's trades and show the return/drawdown spread"""
+        from algo_trader.backtest.monte_carlo import run_monte_carlo
+
+        # 10k paths, fewer for very long trade lists so this stays instant
+        n_paths = max(1000, min(10000, 20_000_000 // max(1, result.total_trades)))
+        try:
+            mc = run_monte_carlo(result, n_paths=n_paths, method="bootstrap", seed=0)
+        except Exception as e:
+            logger.error(f"Monte Carlo error: {e}")
+            mc = None
+
+        if mc is None:
+            self.bt_stat_mc.setText("Monte Carlo: --")
+            self.bt_stat_mc.setToolTip("")
+            return
+
+        self.bt_stat_mc.setText(
+            f"MC Return 5-95%: {mc.return_percentiles[5]:.1f}% to {mc.return_percentiles[95]:.1f}% | "
+            f"DD 95%: {mc.drawdown_percentiles[95]:.1f}% | P(loss): {mc.probability_of_loss:.0f}%"
+        )
+        rows = [f"{p:>3}%  return {mc.return_percentiles[p]:7.2f}%   max DD {mc.drawdown_percentiles[p]:6.2f}%"
+                for p in mc.percentiles]
+        self.bt_stat_mc.setToolTip(
+            f"Bootstrap of {mc.n_trades} trades over {mc.n_paths} paths\n" + "\n".join(rows) +
+            f"\nP(drawdown >= {mc.ruin_percent:.0f}%): {mc.probability_of_ruin:.1f}%"
+        )
+
     def _export_backtest_trades(self):
         """Export backtest trades to CSV"""
         if not hasattr(self, 'bt_simulator') or not self.bt_simulator:
@@ -0,0 +1,171 @@
+"""
+Strategy Optimizer Dialog
+"""
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
+    QLabel, QPushButton, QComboBox, QSpinBox, QGroupBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QApplication
+)
+from PyQt6.QtCore import Qt
+
+from loguru import logger
+
+
+class OptimizerDialog(QDialog):
+    """Dialog for sweeping Pine Script inputs and ranking the results"""
+
+    OBJECTIVE_LABELS = {
+        "Sharpe Ratio": "sharpe_ratio",
+        "Profit Factor": "profit_factor",
+        "Max Drawdown (lowest)": "max_drawdown",
+        "Total Return": "total_return",
+    }
+
+    def __init__(self, pine_script: str, data, capital: float, parent=None):
+        super().__init__(parent)
+
+        from algo_trader.backtest.optimizer import StrategyOptimizer
+        self.optimizer = StrategyOptimizer(pine_script, data, initial_capital=capital)
+        self.results = None
+
+        self._init_ui()
+
+    def _init_ui(self):
+        """Initialize dialog UI"""
+        self.setWindowTitle("Optimize Strategy Inputs")
+        self.setMinimumSize(750, 550)
+
+        layout = QVBoxLayout(self)
+
+        # Input ranges
+        inputs_group = QGroupBox("Input Ranges (start / stop / step)")
+        inputs_layout = QVBoxLayout(inputs_group)
+
+        self.inputs_table = QTableWidget()
+        self.inputs_table.setColumnCount(5)
+        self.inputs_table.setHorizontalHeaderLabels(["Input", "Default", "Start", "Stop", "Step"])
+        self.inputs_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+
+        inputs = self.optimizer.get_inputs()
+        self.inputs_table.setRowCount(len(inputs))
+        for i, (name, default) in enumerate(inputs.items()):
+            step = 1 if isinstance(default, int) else round(abs(default) * 0.1, 4) or 0.1
+            start = max(default - 2 * step, step) if default > 0 else default - 2 * step
+            values = [name, default, start, default + 2 * step, step]
+            for j, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if j < 2:
+                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                self.inputs_table.setItem(i, j, item)
+        inputs_layout.addWidget(self.inputs_table)
+
+        if not inputs:
+            inputs_layout.addWidget(QLabel("This strategy has no numeric inputs to optimize."))
+
+        layout.addWidget(inputs_group)
+
+        # Search settings
+        settings_group = QGroupBox("Search")
+        settings_layout = QFormLayout(settings_group)
+
+        self.method_combo = QComboBox()
+        self.method_combo.addItems(["Grid", "Random"])
+        settings_layout.addRow("Method:", self.method_combo)
+
+        self.samples_spin = QSpinBox()
+        self.samples_spin.setRange(1, 100000)
+        self.samples_spin.setValue(200)
+        settings_layout.addRow("Random Samples:", self.samples_spin)
+
+        self.objective_combo = QComboBox()
+        self.objective_combo.addItems(list(self.OBJECTIVE_LABELS))
+        settings_layout.addRow("Rank By:", self.objective_combo)
+
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 256)
+        self.workers_spin.setValue(self.optimizer.max_workers)
+        settings_layout.addRow("Worker Processes:", self.workers_spin)
+
+        layout.addWidget(settings_group)
+
+        # Controls
+        controls = QHBoxLayout()
+        self.run_btn = QPushButton("▶ Run Optimization")
+        self.run_btn.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold;")
+        self.run_btn.clicked.connect(self._run)
+        self.run_btn.setEnabled(bool(inputs))
+        controls.addWidget(self.run_btn)
+
+        self.progress_label = QLabel("Ready")
+        self.progress_label.setStyleSheet("font-weight: bold;")
+        controls.addWidget(self.progress_label)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        # Ranked results
+        results_group = QGroupBox("Ranked Results")
+        results_layout = QVBoxLayout(results_group)
+        self.results_table = QTableWidget()
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        results_layout.addWidget(self.results_table)
+        layout.addWidget(results_group)
+
+    def _param_ranges(self) -> dict:
+        """Read input ranges from the table"""
+        from algo_trader.backtest.optimizer import param_range
+
+        ranges = {}
+        for i in range(self.inputs_table.rowCount()):
+            name = self.inputs_table.item(i, 0).text()
+            default = self.inputs_table.item(i, 1).text()
+            bounds = [self.inputs_table.item(i, j).text().strip() for j in (2, 3, 4)]
+            number = int if '.' not in default and all('.' not in b for b in bounds) else float
+            start, stop, step = (number(b) for b in bounds)
+            ranges[name] = param_range(start, stop, step)
+        return ranges
+
+    def _run(self):
+        """Run the sweep and show the ranked table"""
+        try:
+            param_ranges = self._param_ranges()
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", f"Invalid input range: {e}")
+            return
+
+        method = self.method_combo.currentText().lower()
+        objective = self.OBJECTIVE_LABELS[self.objective_combo.currentText()]
+        self.optimizer.max_workers = self.workers_spin.value()
+
+        def on_progress(done, total):
+            self.progress_label.setText(f"Backtests: {done}/{total}")
+            QApplication.processEvents()
+
+        self.run_btn.setEnabled(False)
+        self.progress_label.setText("Starting workers...")
+        QApplication.processEvents()
+
+        try:
+            self.results = self.optimizer.optimize(
+                param_ranges, method=method, n_samples=self.samples_spin.value(),
+                objective=objective, progress_callback=on_progress
+            )
+            self._show_results(self.results)
+            self.progress_label.setText(f"Complete: {len(self.results)} parameter sets")
+        except Exception as e:
+            logger.error(f"Optimization error: {e}")
+            QMessageBox.warning(self, "Error", f"Optimization failed: {str(e)}")
+            self.progress_label.setText("Failed")
+        finally:
+            self.run_btn.setEnabled(True)
+
+    def _show_results(self, results):
+        """Populate the results table (top 200 rows)"""
+        shown = results.head(200)
+        self.results_table.setColumnCount(len(shown.columns))
+        self.results_table.setHorizontalHeaderLabels([str(c) for c in shown.columns])
+        self.results_table.setRowCount(len(shown))
+
+        for i, row in enumerate(shown.itertuples(index=False)):
+            for j, value in enumerate(row):
+                text = f"{value:.4f}" if isinstance(value, float) else str(value)
+                self.results_table.setItem(i, j, QTableWidgetItem(text))
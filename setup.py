@@ -14,7 +14,7 @@ setup(
         "PyQt6>=6.4.0",
         "requests>=2.28.0",
         "aiohttp>=3.8.0",
-        "pandas>=1.5.0",
+        "pandas>=2.0.0",
         "numpy>=1.23.0",
         "sqlalchemy>=2.0.0",
         "websocket-client>=1.4.0",
@@ -0,0 +1,65 @@
+"""
+Backfill request windows and coverage
+"""
+from datetime import date, datetime
+
+from algo_trader.data.backfill import Backfill, plan_windows
+from algo_trader.data.historical import HistoricalDataManager
+from algo_trader.data.rate_limit import RateLimiters
+
+
+def test_gap_ending_at_midnight_adds_no_extra_day():
+    windows = plan_windows(datetime(2024, 1, 1), datetime(2024, 1, 11), 5)
+
+    assert windows == [(date(2024, 1, 1), date(2024, 1, 5)), (date(2024, 1, 6), date(2024, 1, 10))]
+
+
+def test_gap_ending_during_a_day_includes_it():
+    windows = plan_windows(datetime(2024, 1, 1), datetime(2024, 1, 3, 10, 30), 30)
+
+    assert windows == [(date(2024, 1, 1), date(2024, 1, 3))]
+
+
+class FakeBroker:
+    """Answers historical requests with a fixed result (None: the request failed)"""
+    broker_name = 'fake'
+
+    def __init__(self, candles):
+        self.candles = candles
+        self.calls = 0
+
+    def get_historical_data(self, symbol, exchange, interval, from_date, to_date):
+        self.calls += 1
+        return self.candles
+
+
+def make_manager(tmp_path, broker):
+    manager = HistoricalDataManager(cache_dir=tmp_path, rate_limiters=RateLimiters({'fake': (1000.0, 1000)}))
+    manager.register_broker('fake', broker)
+    return manager
+
+
+def test_failed_requests_are_not_recorded_as_covered(tmp_path):
+    manager = make_manager(tmp_path, FakeBroker(None))
+    backfill = Backfill(manager)
+    start, end = datetime(2024, 1, 6), datetime(2024, 1, 8)
+
+    report = backfill.run(['RELIANCE'], interval='day', start=start, end=end)
+
+    assert not report.complete
+    assert report.failed == [('RELIANCE', date(2024, 1, 6), date(2024, 1, 7))]
+    assert manager.get_cached_ranges('RELIANCE', 'NSE', 'day') == []
+    assert backfill.plan(['RELIANCE'], 'NSE', 'day', start, end)
+
+
+def test_confirmed_empty_windows_are_recorded_as_covered(tmp_path):
+    broker = FakeBroker([])
+    manager = make_manager(tmp_path, broker)
+    backfill = Backfill(manager)
+    start, end = datetime(2024, 1, 6), datetime(2024, 1, 8)
+
+    report = backfill.run(['RELIANCE'], interval='day', start=start, end=end)
+
+    assert report.complete and report.rows == 0
+    assert manager.get_cached_ranges('RELIANCE', 'NSE', 'day') == [(start, end)]
+    assert backfill.plan(['RELIANCE'], 'NSE', 'day', start, end) == []
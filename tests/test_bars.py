@@ -0,0 +1,52 @@
+"""
+Bars conversion keeps epoch-ns times whatever unit the source index uses
+"""
+import numpy as np
+import pandas as pd
+
+from algo_trader.data.bars import Bars, as_frame
+
+
+def _frame(index: pd.DatetimeIndex) -> pd.DataFrame:
+    n = len(index)
+    close = 100 + np.arange(n, dtype=float)
+    return pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1,
+                         'close': close, 'volume': np.full(n, 500)}, index=index)
+
+
+def test_from_frame_microsecond_index_is_stored_as_ns():
+    index = pd.date_range('2024-01-01 09:15', periods=5, freq='min').as_unit('us')
+    bars = Bars.from_frame(_frame(index))
+
+    expected = index.as_unit('ns').asi8
+    np.testing.assert_array_equal(bars.time, expected)
+    assert bars.index.equals(pd.DatetimeIndex(index.as_unit('ns'), name='datetime'))
+
+
+def test_from_frame_microsecond_tz_index_keeps_wall_clock():
+    index = pd.date_range('2024-01-01 09:15', periods=3, freq='min', tz='Asia/Kolkata').as_unit('us')
+    bars = Bars.from_frame(_frame(index))
+
+    assert bars.tz == 'Asia/Kolkata'
+    assert bars.time[0] == pd.Timestamp('2024-01-01 09:15').value
+    assert bars.index[0] == index[0]
+
+
+def test_as_frame_views_bars_without_upcasting():
+    index = pd.date_range('2024-01-01 09:15', periods=3, freq='min')
+    bars = Bars.from_frame(_frame(index))
+
+    df = as_frame(bars)
+    assert df['close'].dtype == np.float32
+    assert as_frame(bars, dtype=float)['close'].dtype == np.float64
+
+
+def test_volume_is_int32_unless_it_overflows():
+    index = pd.date_range('2024-01-01 09:15', periods=3, freq='min')
+    df = _frame(index)
+    assert Bars.from_frame(df).volume.dtype == np.int32
+
+    df['volume'] = [500, 3_000_000_000, 700]
+    bars = Bars.from_frame(df)
+    assert bars.volume.dtype == np.int64
+    assert bars.volume[1] == 3_000_000_000
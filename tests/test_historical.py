@@ -0,0 +1,46 @@
+"""
+Incremental history fetches through the range-aware cache
+"""
+from algo_trader.data.historical import HistoricalDataManager
+from algo_trader.data.rate_limit import RateLimiters
+
+
+class FakeBroker:
+    """Answers historical requests with a fixed result (None: the request failed)"""
+    broker_name = 'fake'
+
+    def __init__(self, candles):
+        self.candles = candles
+        self.calls = 0
+
+    def get_historical_data(self, symbol, exchange, interval, from_date, to_date):
+        self.calls += 1
+        return self.candles
+
+
+def make_manager(tmp_path, broker):
+    manager = HistoricalDataManager(cache_dir=tmp_path, rate_limiters=RateLimiters({'fake': (1000.0, 1000)}))
+    manager.register_broker('fake', broker)
+    return manager
+
+
+def test_confirmed_empty_gap_is_not_fetched_again(tmp_path):
+    broker = FakeBroker([])
+    manager = make_manager(tmp_path, broker)
+
+    manager.get_historical_data('RELIANCE', interval='day', days=3)
+    manager.get_historical_data('RELIANCE', interval='day', days=3)
+
+    assert broker.calls == 1
+    assert manager.get_cached_ranges('RELIANCE', 'NSE', 'day')
+
+
+def test_failed_gap_is_fetched_again(tmp_path):
+    broker = FakeBroker(None)
+    manager = make_manager(tmp_path, broker)
+
+    manager.get_historical_data('RELIANCE', interval='day', days=3)
+    manager.get_historical_data('RELIANCE', interval='day', days=3)
+
+    assert broker.calls == 2
+    assert manager.get_cached_ranges('RELIANCE', 'NSE', 'day') == []
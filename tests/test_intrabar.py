@@ -0,0 +1,76 @@
+"""
+Finer data decides which of SL and target a bar hit first
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from algo_trader.backtest.intrabar import IntrabarData
+from algo_trader.backtest.simulator import BacktestSimulator
+
+
+def _bars() -> pd.DataFrame:
+    """Bar 1 (09:30) reaches both the 1% stop loss and the 2% target of a long entered at 100"""
+    return pd.DataFrame({
+        'datetime': pd.date_range('2024-01-02 09:15', periods=3, freq='15min'),
+        'open': [100.0, 100.0, 101.0],
+        'high': [100.5, 103.0, 101.5],
+        'low': [99.5, 98.5, 100.5],
+        'close': [100.0, 101.0, 101.0],
+        'volume': [100, 100, 100],
+    })
+
+
+def _minutes() -> pd.DataFrame:
+    """1-minute bars of 09:30-09:45: down to 98.5 first, up to 103 later"""
+    close = np.array([99.0, 99.5, 100.0, 100.5, 101.0, 101.5, 102.0, 102.5,
+                      103.0, 102.5, 102.0, 101.5, 101.0, 101.0, 101.0])
+    open_ = np.concatenate(([100.0], close[:-1]))
+    return pd.DataFrame({
+        'datetime': pd.date_range('2024-01-02 09:30', periods=len(close), freq='min'),
+        'open': open_,
+        'high': np.maximum(open_, close) + np.where(np.arange(len(close)) == 0, 0.5, 0.0),
+        'low': np.minimum(open_, close) - np.where(np.arange(len(close)) == 0, 0.5, 0.0),
+        'close': close,
+        'volume': 10,
+    })
+
+
+def _simulator(intrabar: bool) -> BacktestSimulator:
+    simulator = BacktestSimulator(initial_capital=100000)
+    simulator.slippage_percent = 0.0
+    simulator.set_risk_params(stop_loss=1.0, target=2.0)
+    if intrabar:
+        source = IntrabarData()
+        source.add_symbol('RELIANCE', _minutes())
+        simulator.set_intrabar_data(source)
+    return simulator
+
+
+SIGNALS = np.array(['BUY', None, None], dtype=object)
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+def test_without_finer_data_the_high_is_checked_first(vectorized):
+    simulator = _simulator(intrabar=False)
+    if vectorized:
+        result = simulator.run_backtest(_bars(), signals=SIGNALS, symbol='RELIANCE')
+    else:
+        result = simulator.run_backtest(_bars(), lambda row, idx, full: SIGNALS[idx], symbol='RELIANCE')
+
+    assert result.trades[0].exit_reason == "Target"
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+def test_finer_data_puts_stop_loss_before_target(vectorized):
+    simulator = _simulator(intrabar=True)
+    if vectorized:
+        result = simulator.run_backtest(_bars(), signals=SIGNALS, symbol='RELIANCE')
+    else:
+        result = simulator.run_backtest(_bars(), lambda row, idx, full: SIGNALS[idx], symbol='RELIANCE')
+
+    trade = result.trades[0]
+    assert trade.exit_reason == "Stop Loss"
+    assert trade.exit_price == pytest.approx(98.5)
+    assert trade.exit_time == pd.Timestamp('2024-01-02 09:30')
+    assert simulator.intrabar_resolved == 1
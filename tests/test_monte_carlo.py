@@ -0,0 +1,57 @@
+"""
+Monte Carlo trade resampling
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from algo_trader.backtest.monte_carlo import run_monte_carlo
+from algo_trader.backtest.simulator import SimulatedTrade, TradeLog, TradeType
+
+
+def _log(pnls) -> TradeLog:
+    start = datetime(2024, 1, 2, 9, 15)
+    trades = []
+    for i, pnl in enumerate(pnls):
+        trades.append(SimulatedTrade(
+            trade_id=i + 1, symbol='RELIANCE', trade_type=TradeType.LONG,
+            entry_time=start + timedelta(hours=i), entry_price=100.0, quantity=10,
+            exit_time=start + timedelta(hours=i, minutes=30), exit_price=100.0 + pnl / 10, pnl=pnl,
+        ))
+    return TradeLog.from_trades(trades)
+
+
+def test_shuffle_keeps_final_equity_and_varies_drawdown():
+    pnls = [500.0, -300.0, 200.0, -400.0, 700.0, -100.0]
+    result = run_monte_carlo(_log(pnls), n_paths=500, method='shuffle', initial_capital=10000, seed=1)
+
+    final = 10000 + sum(pnls)
+    assert all(value == pytest.approx(final) for value in result.final_equity_percentiles.values())
+    assert result.drawdown_percentiles[5] < result.drawdown_percentiles[95]
+    assert result.probability_of_loss == 0.0
+
+
+def test_bootstrap_is_reproducible_and_ordered():
+    log = _log(np.random.default_rng(2).normal(20, 300, 80))
+
+    first = run_monte_carlo(log, n_paths=2000, initial_capital=100000, seed=7)
+    second = run_monte_carlo(log, n_paths=2000, initial_capital=100000, seed=7)
+
+    assert first.return_percentiles == second.return_percentiles
+    returns = [first.return_percentiles[p] for p in first.percentiles]
+    assert returns == sorted(returns)
+    assert 0.0 < first.probability_of_loss < 100.0
+
+
+def test_slippage_lowers_returns():
+    log = _log([100.0] * 20)
+
+    clean = run_monte_carlo(log, n_paths=200, initial_capital=10000, seed=3)
+    costly = run_monte_carlo(log, n_paths=200, initial_capital=10000, slippage_percent=0.5, seed=3)
+
+    assert costly.return_percentiles[50] < clean.return_percentiles[50]
+
+
+def test_no_trades_gives_no_result():
+    assert run_monte_carlo(_log([]), initial_capital=10000) is None
@@ -0,0 +1,51 @@
+"""
+A one-symbol portfolio backtest must reproduce BacktestSimulator
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from algo_trader.backtest.portfolio import PortfolioSimulator
+from algo_trader.backtest.simulator import BacktestSimulator
+
+
+def _bars(n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1.0, n))
+    return pd.DataFrame({
+        'datetime': pd.date_range('2024-01-02 09:15', periods=n, freq='15min'),
+        'open': close + rng.normal(0, 0.2, n),
+        'high': close + rng.uniform(0.1, 1.5, n),
+        'low': close - rng.uniform(0.1, 1.5, n),
+        'close': close,
+        'volume': rng.integers(100, 1000, n),
+    })
+
+
+def _signals(n: int) -> np.ndarray:
+    rng = np.random.default_rng(5)
+    return rng.choice(np.array(['BUY', 'SELL', 'EXIT', None], dtype=object), size=n, p=[0.05, 0.05, 0.03, 0.87])
+
+
+@pytest.mark.parametrize('risk', [(0, 0, 0), (1.0, 2.0, 0), (0, 0, 1.5)])
+def test_single_symbol_portfolio_matches_simulator(risk):
+    data = _bars()
+    signals = _signals(len(data))
+
+    simulator = BacktestSimulator(initial_capital=100000)
+    simulator.set_risk_params(*risk)
+    expected = simulator.run_backtest(data, lambda row, idx, full: signals[idx], symbol='RELIANCE')
+
+    portfolio = PortfolioSimulator(initial_capital=100000, position_size_percent=10.0)
+    portfolio.set_risk_params(*risk)
+    result = portfolio.run_portfolio_backtest({'RELIANCE': data}, {'RELIANCE': signals})
+
+    assert result.total_trades == expected.total_trades > 0
+    for ours, theirs in zip(result.trades, expected.trades):
+        assert (ours.trade_type, ours.entry_time, ours.exit_time, ours.quantity, ours.exit_reason) == \
+               (theirs.trade_type, theirs.entry_time, theirs.exit_time, theirs.quantity, theirs.exit_reason)
+        assert ours.entry_price == pytest.approx(theirs.entry_price)
+        assert ours.exit_price == pytest.approx(theirs.exit_price)
+        assert ours.pnl == pytest.approx(theirs.pnl)
+    assert result.total_pnl == pytest.approx(expected.total_pnl)
+    np.testing.assert_allclose(result.equity_curve.equity, expected.equity_curve.equity)
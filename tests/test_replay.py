@@ -0,0 +1,45 @@
+"""
+Market replay clock
+"""
+from datetime import date, datetime
+
+import pandas as pd
+
+from algo_trader.backtest.replay import MarketReplay
+from algo_trader.core.risk_manager import RiskManager
+
+
+def test_risk_manager_mtm_follows_replay_clock():
+    risk_manager = RiskManager()
+    risk_manager.now = lambda: datetime(2024, 1, 2, 9, 15)
+    risk_manager.add_position('RELIANCE', 10, 100.0)
+    risk_manager.now = datetime.now
+
+    summaries = []
+    risk_manager.register_mtm_callback(summaries.append)
+    candles = pd.DataFrame({
+        'datetime': pd.date_range('2024-01-02 09:15', periods=3, freq='1min'),
+        'open': [100.0, 101.0, 102.0], 'high': [101.0, 102.0, 103.0],
+        'low': [99.0, 100.0, 101.0], 'close': [101.0, 102.0, 103.0], 'volume': [10, 10, 10],
+    })
+    replay = MarketReplay(risk_manager=risk_manager)
+    replay.load_candles({'RELIANCE': candles})
+
+    stats = replay.run()
+
+    assert type(stats.events) is int and stats.events == 3
+    assert [summary.date for summary in summaries] == [date(2024, 1, 2)] * 3
+    assert summaries[-1].unrealized_pnl == 30.0
+    assert risk_manager.now == datetime.now
+
+
+def test_mtm_counts_trades_closed_on_the_replayed_day():
+    risk_manager = RiskManager()
+    risk_manager.now = lambda: datetime(2024, 1, 2, 10, 0)
+    risk_manager.add_position('RELIANCE', 10, 100.0)
+    risk_manager.close_position('RELIANCE', 105.0)
+
+    summary = risk_manager.get_mtm_summary()
+
+    assert summary.date == date(2024, 1, 2)
+    assert summary.total_trades == 1 and summary.realized_pnl == 50.0
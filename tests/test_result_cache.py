@@ -0,0 +1,71 @@
+"""
+Backtest result cache keys and eviction order
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from algo_trader.backtest.intrabar import IntrabarData
+from algo_trader.backtest.result_cache import BacktestResultCache
+from algo_trader.backtest.simulator import BacktestSimulator
+
+SCRIPT = "//@version=5\nstrategy('SMA')\nstrategy.entry('Long', strategy.long, when=close > ta.sma(close, 5))\n"
+
+
+def _bars(n: int = 50, start: str = '2024-01-02 09:15', freq: str = '15min') -> pd.DataFrame:
+    close = 100 + np.arange(n, dtype=float)
+    return pd.DataFrame({'datetime': pd.date_range(start, periods=n, freq=freq), 'open': close,
+                         'high': close + 1, 'low': close - 1, 'close': close, 'volume': 100})
+
+
+def test_key_changes_with_settings_and_intrabar_data(tmp_path):
+    cache = BacktestResultCache(tmp_path)
+    data = _bars()
+    simulator = BacktestSimulator()
+    base = cache.make_key(data, SCRIPT, settings=simulator, symbol='RELIANCE')
+
+    simulator.set_risk_params(stop_loss=1.0)
+    with_stop = cache.make_key(data, SCRIPT, settings=simulator, symbol='RELIANCE')
+
+    intrabar = IntrabarData()
+    intrabar.add_symbol('RELIANCE', _bars(200, freq='1min'))
+    simulator.set_intrabar_data(intrabar)
+    with_intrabar = cache.make_key(data, SCRIPT, settings=simulator, symbol='RELIANCE')
+
+    other = IntrabarData()
+    other.add_symbol('RELIANCE', _bars(200, freq='1min').assign(low=90.0))
+    simulator.set_intrabar_data(other)
+    with_other_intrabar = cache.make_key(data, SCRIPT, settings=simulator, symbol='RELIANCE')
+
+    assert len({base, with_stop, with_intrabar, with_other_intrabar}) == 4
+    simulator.set_intrabar_data(intrabar)
+    assert cache.make_key(data, SCRIPT, settings=simulator, symbol='RELIANCE') == with_intrabar
+
+
+def test_key_changes_with_closure_values_and_defaults(tmp_path):
+    cache = BacktestResultCache(tmp_path)
+    data = _bars()
+
+    def make_strategy(threshold):
+        def strategy(df, level=1.0):
+            return df['close'] > threshold * level
+        return strategy
+
+    low, high = make_strategy(100.0), make_strategy(120.0)
+    scaled = make_strategy(100.0)
+    scaled.__defaults__ = (2.0,)
+
+    keys = {cache.make_key(data, strategy) for strategy in (low, high, scaled)}
+    assert len(keys) == 3
+    assert cache.make_key(data, low) == cache.make_key(data, make_strategy(100.0))
+
+
+def test_memory_hit_refreshes_eviction_order(tmp_path):
+    cache = BacktestResultCache(tmp_path)
+    cache.put('hot', {'result': 1})
+    path = cache.version_dir / 'hot.pkl'
+    os.utime(path, (0, 0))
+
+    assert cache.get('hot') == {'result': 1}
+    assert path.stat().st_mtime > 0
@@ -0,0 +1,53 @@
+"""
+Throttled progress and batched trade callbacks of BacktestSimulator
+"""
+import numpy as np
+import pandas as pd
+
+from algo_trader.backtest.simulator import BacktestSimulator
+
+
+def _bars(n: int = 95) -> pd.DataFrame:
+    close = 100 + np.sin(np.arange(n) / 5) * 5
+    return pd.DataFrame({
+        'datetime': pd.date_range('2024-01-02 09:15', periods=n, freq='min'),
+        'open': close, 'high': close + 0.5, 'low': close - 0.5, 'close': close, 'volume': 100,
+    })
+
+
+def _signals(n: int) -> np.ndarray:
+    signals = np.full(n, None, dtype=object)
+    signals[::10] = 'BUY'
+    signals[5::10] = 'EXIT'
+    return signals
+
+
+def test_progress_every_n_bars_always_reports_the_last():
+    data = _bars()
+    signals = _signals(len(data))
+    simulator = BacktestSimulator()
+    seen = []
+    simulator.register_progress_callback(lambda idx, total, *rest: seen.append(idx))
+    simulator.set_progress_interval(every_bars=10)
+
+    simulator.run_backtest(data, lambda row, idx, full: signals[idx])
+
+    assert seen == list(range(9, 90, 10)) + [94]
+
+
+def test_trade_events_are_batched_and_all_delivered():
+    data = _bars()
+    signals = _signals(len(data))
+    simulator = BacktestSimulator()
+    simulator.set_progress_interval(every_bars=0)
+    simulator.set_trade_batching(4)
+    batches, events = [], []
+    simulator.register_trade_batch_callback(batches.append)
+    simulator.register_trade_callback(lambda trade, event: events.append(event))
+
+    result = simulator.run_backtest(data, lambda row, idx, full: signals[idx])
+
+    assert len(events) == 2 * result.total_trades
+    assert sum(len(batch) for batch in batches) == len(events)
+    assert all(len(batch) == 4 for batch in batches[:-1])
+    assert [event for batch in batches for _, event in batch] == events
@@ -0,0 +1,56 @@
+"""
+Market data store appends and reads across superseded partitions
+"""
+import numpy as np
+import pandas as pd
+
+from algo_trader.data.store import MANIFEST, MarketDataStore
+
+
+def _frame(start: str, periods: int, close: float) -> pd.DataFrame:
+    index = pd.date_range(start, periods=periods, freq='min', name='datetime')
+    values = np.full(periods, close)
+    return pd.DataFrame({'open': values, 'high': values + 1, 'low': values - 1,
+                         'close': values, 'volume': np.full(periods, 100)}, index=index)
+
+
+def test_append_supersedes_partition(tmp_path):
+    store = MarketDataStore(tmp_path)
+    store.append('NSE', 'RELIANCE', '1minute', _frame('2024-01-02 09:15', 10, 100.0))
+    store.append('NSE', 'RELIANCE', '1minute', _frame('2024-01-02 09:20', 10, 200.0))
+
+    bars = store.read('NSE', 'RELIANCE', '1minute')
+    series_dir = tmp_path / 'NSE' / 'RELIANCE' / '1minute'
+
+    assert len(bars) == 15
+    np.testing.assert_array_equal(bars.close, [100.0] * 5 + [200.0] * 10)
+    assert sorted(path.name for path in series_dir.iterdir() if path.name != MANIFEST) == ['2024-01.2']
+
+
+def test_read_with_stale_manifest_retries(tmp_path, monkeypatch):
+    store = MarketDataStore(tmp_path)
+    store.append('NSE', 'RELIANCE', '1minute', _frame('2024-01-02 09:15', 10, 100.0))
+    series_dir = tmp_path / 'NSE' / 'RELIANCE' / '1minute'
+    stale = store._load_manifest(series_dir)
+
+    # Another writer supersedes the partition between this reader's manifest load and its column reads
+    MarketDataStore(tmp_path).append('NSE', 'RELIANCE', '1minute', _frame('2024-01-02 09:20', 10, 200.0))
+    load_manifest = store._load_manifest
+    manifests = iter([stale])
+    monkeypatch.setattr(store, '_load_manifest', lambda path: next(manifests, None) or load_manifest(path))
+
+    bars = store.read('NSE', 'RELIANCE', '1minute')
+
+    assert len(bars) == 15
+    assert bars.close[-1] == 200.0
+
+
+def test_manifest_cache_sees_other_writers(tmp_path):
+    reader = MarketDataStore(tmp_path)
+    writer = MarketDataStore(tmp_path)
+    writer.append('NSE', 'RELIANCE', '1minute', _frame('2024-01-02 09:15', 5, 100.0), meta={'run': 1})
+    assert reader.get_meta('NSE', 'RELIANCE', '1minute') == {'run': 1}
+
+    writer.append('NSE', 'RELIANCE', '1minute', _frame('2024-01-02 09:15', 5, 100.0), meta={'run': 2})
+
+    assert reader.get_meta('NSE', 'RELIANCE', '1minute') == {'run': 2}
@@ -0,0 +1,46 @@
+"""
+Streaming indicators must match the batch Indicators bar-for-bar
+"""
+import numpy as np
+import pandas as pd
+
+from algo_trader.strategies.indicators import Indicators
+from algo_trader.strategies.streaming_indicators import StreamingMFI, StreamingRSI
+
+
+def _bars_with_flat_stretches(n: int = 400) -> pd.DataFrame:
+    """Random walk that goes flat (no price change at all) for two long stretches"""
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 1.0, n))
+    for start, stop in ((100, 160), (250, 330)):
+        close[start:stop] = close[start - 1]
+    spread = np.where(np.diff(close, prepend=close[0]) == 0, 0.0, 0.5)
+    return pd.DataFrame({
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(100, 1000, n).astype(float),
+    })
+
+
+def test_streaming_mfi_matches_batch_on_flat_stretches():
+    data = _bars_with_flat_stretches()
+    batch = Indicators.mfi(data['high'], data['low'], data['close'], data['volume'], 14).to_numpy()
+
+    mfi = StreamingMFI(14)
+    streaming = np.array([mfi.update(h, l, c, v) for h, l, c, v in
+                          data[['high', 'low', 'close', 'volume']].itertuples(index=False)])
+
+    np.testing.assert_allclose(streaming, batch, rtol=1e-9, equal_nan=True)
+    assert np.isnan(streaming[150]) and np.isnan(streaming[320])
+
+
+def test_streaming_rsi_matches_batch_on_flat_stretches():
+    data = _bars_with_flat_stretches()
+    batch = Indicators.rsi(data['close'], 14).to_numpy()
+
+    rsi = StreamingRSI(14)
+    streaming = np.array([rsi.update(c) for c in data['close']])
+
+    np.testing.assert_allclose(streaming, batch, rtol=1e-9, equal_nan=True)
+    assert np.isnan(streaming[150]) and np.isnan(streaming[320])
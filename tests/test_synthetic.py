@@ -0,0 +1,21 @@
+"""
+Synthetic sessions are anchored at the 09:15 open whatever unit pandas picks
+"""
+from datetime import datetime
+
+import pandas as pd
+
+from algo_trader.data.synthetic import SyntheticMarket
+
+
+def test_intraday_bars_start_at_session_open():
+    df = SyntheticMarket().intraday_bars('RELIANCE', days=2, end=datetime(2024, 1, 5, 12, 0))
+
+    assert df.index[0] == pd.Timestamp('2024-01-04 09:15')
+    assert df.index[-1] == pd.Timestamp('2024-01-05 15:29')
+
+
+def test_ticks_start_at_session_open():
+    ticks = SyntheticMarket().ticks('RELIANCE', days=1, end=datetime(2024, 1, 5, 12, 0))
+
+    assert pd.Timestamp(ticks['datetime'].iloc[0]) == pd.Timestamp('2024-01-05 09:15')